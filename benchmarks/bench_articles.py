@@ -0,0 +1,134 @@
+"""Memory and throughput of raw NewsAPI dicts versus the Article model at scale.
+
+Builds --count articles (100k by default) from the recorded NewsAPI response,
+varying URL, title and timestamp, then reports retained memory for both
+representations, the one-off conversion cost, and the per-article cost of the
+work the pipeline repeats on cached results: sorting newest first, rendering
+headline listings and deduplicating by URL.
+
+Usage (from the repository root):
+    python benchmarks/bench_articles.py [--count 100000] [--iterations 3]
+"""
+import argparse
+import copy
+import datetime
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+from models import Article  # noqa: E402
+from services import ResponseFormatter  # noqa: E402
+
+def build_dicts(count):
+    """count distinct article dicts decoded the way the SDK hands them over."""
+    with open(os.path.join(BENCH_DIR, 'fixtures', 'newsapi_everything.json'), encoding='utf-8') as f:
+        recorded = json.load(f)['articles']
+    start = datetime.datetime(2025, 10, 1, tzinfo=datetime.timezone.utc)
+    articles = []
+    for i in range(count):
+        article = copy.deepcopy(recorded[i % len(recorded)])
+        article['url'] = f"{article['url']}&n={i}"
+        article['title'] = f"{article['title']} #{i}"
+        article['publishedAt'] = (start + datetime.timedelta(minutes=7 * i)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        # Decoded JSON never shares strings between objects
+        article['source'] = {'id': None, 'name': ''.join(article['source']['name'])}
+        articles.append(article)
+    return articles
+
+def retained_kib(build):
+    """Memory still allocated after build() returns, with its result alive."""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = build()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return result, retained / 1024
+
+def timed(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+# The dict-based code the pipeline ran before the Article model
+def legacy_sort(articles):
+    return sorted(articles, key=lambda a: datetime.datetime.fromisoformat(
+        a.get('publishedAt', '').replace('Z', '+00:00')), reverse=True)
+
+def legacy_format_articles(articles, query=""):
+    """ResponseFormatter.format_articles as it was for dicts."""
+    if not articles:
+        return "No articles found."
+    today = datetime.date.today()
+    recent_threshold = today - datetime.timedelta(days=2)
+    older_articles = any(
+        datetime.datetime.fromisoformat(article.get('publishedAt', '').replace('Z', '+00:00')).date() < recent_threshold
+        for article in articles if article.get('publishedAt')
+    )
+    result = "🔍 Here are the latest headlines:\n"
+    result += "=" * 50 + "\n\n"
+    if older_articles and any(word in query.lower() for word in ['today', 'latest', 'recent', 'current']):
+        result += "💡 Note: No very recent articles found. Showing results from the past week/month.\n\n"
+    for i, article in enumerate(articles, 1):
+        title = article.get('title', 'No title')
+        description = article.get('description', 'No description available')
+        source = article.get('source', {}).get('name', 'Unknown')
+        published = article.get('publishedAt', 'Unknown')
+        if published != 'Unknown':
+            published = published.replace('T', ' at ').replace('Z', ' UTC')
+        result += f"📰 {i}. {title}\n"
+        result += f"   🔗 Source: {source} | 📅 {published}\n"
+        result += f"   📋 {description}\n"
+        result += "-" * 50 + "\n\n"
+    result += "💡 Type 'details [number]' to read the full article content.\n"
+    result += "   Example: 'details 1' for the first article"
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=100000)
+    parser.add_argument('--iterations', type=int, default=3)
+    args = parser.parse_args()
+
+    raw, dict_kib = retained_kib(lambda: build_dicts(args.count))
+    # Built from their own dicts, which are then freed, so the strings count too
+    models, article_kib = retained_kib(
+        lambda: [Article.from_newsapi_response(a) for a in build_dicts(args.count)])
+    convert_s = timed(lambda: [Article.from_newsapi_response(a) for a in raw], 1)
+
+    print(f"{args.count} articles")
+    print(f"{'representation':<16}{'retained MiB':>14}{'bytes/article':>15}")
+    print(f"{'dict':<16}{dict_kib / 1024:>14.1f}{dict_kib * 1024 / args.count:>15.0f}")
+    print(f"{'Article':<16}{article_kib / 1024:>14.1f}{article_kib * 1024 / args.count:>15.0f}")
+    print(f"conversion: {convert_s / args.count * 1e6:.2f} us/article (once, at ingestion)\n")
+
+    formatter = ResponseFormatter()
+    pages = [models[i:i + 5] for i in range(0, len(models), 5)]
+    raw_pages = [raw[i:i + 5] for i in range(0, len(raw), 5)]
+    operations = [
+        ('sort newest first',
+         lambda: legacy_sort(raw),
+         lambda: sorted(models, key=lambda a: a.published_ts, reverse=True)),
+        ('render listings',
+         lambda: [legacy_format_articles(page, 'latest') for page in raw_pages],
+         lambda: [formatter.format_articles(page, 'latest') for page in pages]),
+        ('dedup by url',
+         lambda: list({a.get('url'): a for a in raw}.values()),
+         lambda: list({a.url: a for a in models}.values())),
+    ]
+
+    print(f"{'operation':<20}{'dict us/article':>17}{'Article us/article':>20}")
+    for name, with_dicts, with_models in operations:
+        dict_s = timed(with_dicts, args.iterations)
+        model_s = timed(with_models, args.iterations)
+        print(f"{name:<20}{dict_s / args.count * 1e6:>17.3f}{model_s / args.count * 1e6:>20.3f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark scraped-content cleaning on large recorded pages.
+
+Each recorded Firecrawl page is inflated by repeating its article body, which
+is what long live blogs and paginated features look like, and then cleaned by
+the previous split-everything implementation and by ContentCleaner. Reports
+time per page, throughput and peak allocations, and checks that both give the
+same output under the BBC profile the old code hardcoded.
+
+Usage (from the repository root):
+    python benchmarks/bench_cleaner.py [--repeat 50] [--iterations 20]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+from parsers import ContentCleaner  # noqa: E402
+
+BBC_URL = 'https://www.bbc.co.uk/news/articles/bench'
+
+def legacy_clean(content):
+    """ScraperClient._clean_content before the streaming cleaner."""
+    lines = content.split('\n')
+    cleaned_lines = []
+    article_started = False
+    skip_at_start = ['Skip to content', 'Home', 'News', 'Sport', 'Business',
+                     'Watch Live', 'Newsletters', 'Innovation', 'Culture']
+    stop_patterns = ['Related Links', 'More on this story', 'Share', 'Save',
+                     'You can follow', 'BBC', 'Facebook', 'Twitter', 'Instagram']
+    for line in lines:
+        stripped = line.strip()
+        if not article_started:
+            if stripped.startswith('#') or len(stripped) > 50:
+                article_started = True
+        if not article_started and any(pattern in stripped for pattern in skip_at_start):
+            continue
+        if article_started and any(pattern in stripped for pattern in stop_patterns):
+            break
+        if stripped.startswith('![') or stripped.startswith('[**') or stripped == '* * *':
+            continue
+        if stripped:
+            cleaned_lines.append(line)
+    content = '\n'.join(cleaned_lines).strip()
+    if len(content) > 2500:
+        content = content[:2500] + "...\n\n[Content truncated for brevity]"
+    return content if content else None
+
+def inflate(markdown, repeat):
+    """Repeat the body between the title and the footer separator."""
+    head, sep, footer = markdown.partition('\n* * *')
+    title_end = head.find('\n', head.find('\n# ') + 1)
+    if title_end < 0:
+        return markdown * repeat
+    return head[:title_end] + head[title_end:] * repeat + sep + footer
+
+def load_pages(path, repeat):
+    with open(path, encoding='utf-8') as f:
+        recorded = json.load(f)
+    return [(url, inflate(page['markdown'], repeat)) for url, page in recorded.items()]
+
+def peak_kib(fn, pages):
+    tracemalloc.start()
+    for url, markdown in pages:
+        tracemalloc.reset_peak()
+        fn(url, markdown)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--fixture', default=os.path.join(BENCH_DIR, 'fixtures', 'firecrawl_scrape.json'))
+    parser.add_argument('--repeat', type=int, default=50, help='times to repeat each article body')
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+
+    pages = load_pages(args.fixture, args.repeat)
+    total_bytes = sum(len(markdown) for _, markdown in pages)
+    cleaner = ContentCleaner()
+
+    mismatches = sum(cleaner.clean(markdown, BBC_URL) != legacy_clean(markdown) for _, markdown in pages)
+
+    variants = [
+        ('legacy', lambda url, markdown: legacy_clean(markdown)),
+        ('cleaner (bbc profile)', lambda url, markdown: cleaner.clean(markdown, BBC_URL)),
+        ('cleaner (by domain)', lambda url, markdown: cleaner.clean(markdown, url)),
+    ]
+
+    print(f"{len(pages)} pages, {total_bytes / len(pages) / 1024:.0f} KiB average, "
+          f"{args.iterations} iterations; bbc-profile mismatches vs legacy: {mismatches}")
+    print(f"{'variant':<24}{'us/page':>12}{'MiB/s':>10}{'peak KiB':>11}")
+    for name, fn in variants:
+        def run():
+            for url, markdown in pages:
+                fn(url, markdown)
+        elapsed = timeit.timeit(run, number=args.iterations)
+        per_page = elapsed / (args.iterations * len(pages))
+        throughput = total_bytes * args.iterations / elapsed / (1024 * 1024)
+        print(f"{name:<24}{per_page * 1e6:>12.1f}{throughput:>10.0f}{peak_kib(fn, pages):>11.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""Benchmark response formatting on large result sets.
+
+Renders article listings and article details with the previous
+string-concatenation formatter and with the streaming ResponseFormatter, and
+checks that both give the same text. Reports the best total render time, the time until
+the first chunk is available to print, and peak allocations.
+
+Usage (from the repository root):
+    python benchmarks/bench_formatter.py [--count 10000] [--detail-kib 2048] [--iterations 20]
+"""
+import argparse
+import datetime
+import os
+import sys
+import timeit
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+from models import Article  # noqa: E402
+from services import ResponseFormatter  # noqa: E402
+from services.response_formatter import _published_label  # noqa: E402
+
+def legacy_format_articles(articles, query=""):
+    """ResponseFormatter.format_articles before streaming output."""
+    if not articles:
+        return "❌ No articles found for this query. Try a different search term or broader date range."
+    today = datetime.date.today()
+    recent_threshold = today - datetime.timedelta(days=2)
+    older_articles = any(
+        article.published_date < recent_threshold
+        for article in articles if article.published_at
+    )
+    result = "🔍 Here are the latest headlines:\n"
+    result += "=" * 50 + "\n\n"
+    if older_articles and any(word in query.lower() for word in ['today', 'latest', 'recent', 'current']):
+        result += "💡 Note: No very recent articles found. Showing results from the past week/month.\n\n"
+    for i, article in enumerate(articles, 1):
+        description = article.description or 'No description available'
+        result += f"📰 {i}. {article.title}\n"
+        result += f"   🔗 Source: {article.source} | 📅 {_published_label(article)}\n"
+        result += f"   📋 {description}\n"
+        result += "-" * 50 + "\n\n"
+    result += "💡 Type 'details [number]' to read the full article content.\n"
+    result += "   Example: 'details 1' for the first article"
+    return result
+
+def legacy_format_article_detail(article, scraped_content=None):
+    """ResponseFormatter.format_article_detail before streaming output (scraped path)."""
+    result = "=" * 60 + "\n"
+    result += f"📰 {article.title}\n"
+    result += "=" * 60 + "\n\n"
+    result += f"🔗 Source: {article.source}\n"
+    if article.author and article.author != 'Unknown':
+        result += f"✍️  Author: {article.author}\n"
+    result += f"📅 Published: {_published_label(article)}\n"
+    result += f"🌐 URL: {article.url}\n\n"
+    if article.description:
+        result += "📋 Summary:\n"
+        result += f"{article.description}\n\n"
+    result += "📖 Full Article Content:\n"
+    result += "-" * 40 + "\n"
+    result += scraped_content + "\n"
+    result += "\n" + "=" * 60
+    return result
+
+def build_articles(count):
+    published = datetime.datetime(2025, 10, 1, 8, 15, tzinfo=datetime.timezone.utc)
+    return [
+        Article(title=f"Headline number {i} about markets and policy",
+                description="Analysts say the development could reshape the landscape " * 3,
+                url=f"https://example.com/news/{i}", source=f"Source {i % 40}",
+                author=f"Reporter {i % 100}", published_at=published - datetime.timedelta(minutes=i))
+        for i in range(count)
+    ]
+
+def best_seconds(fn, iterations):
+    """Fastest of several runs; the minimum is the least disturbed by other load."""
+    return min(timeit.repeat(fn, number=1, repeat=iterations))
+
+def peak_kib(fn):
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=10000, help='articles per listing')
+    parser.add_argument('--detail-kib', type=int, default=2048, help='size of the scraped detail text')
+    parser.add_argument('--chunk-kib', type=int, default=16, help='size of each streamed detail chunk')
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+
+    formatter = ResponseFormatter()
+    articles = build_articles(args.count)
+    paragraph = "Officials said the work would begin next spring, with funding from the state.\n"
+    content = paragraph * (args.detail_kib * 1024 // len(paragraph))
+    chunk_chars = args.chunk_kib * 1024
+    chunks = [content[i:i + chunk_chars] for i in range(0, len(content), chunk_chars)]
+    detail_article = articles[0]
+
+    listing_match = legacy_format_articles(articles, 'latest') == formatter.format_articles(articles, 'latest')
+    detail_match = (legacy_format_article_detail(detail_article, content)
+                    == ''.join(formatter.iter_article_detail(detail_article, iter(chunks))))
+    print(f"{args.count} articles per listing, {args.detail_kib} KiB detail in {len(chunks)} chunks, "
+          f"{args.iterations} iterations; identical output: listing={listing_match} detail={detail_match}")
+
+    variants = [
+        ('listing, legacy +=',
+         lambda: legacy_format_articles(articles, 'latest'), None),
+        ('listing, joined',
+         lambda: formatter.format_articles(articles, 'latest'),
+         lambda: formatter.iter_articles(articles, 'latest')),
+        ('listing, lazy source',
+         lambda: ''.join(formatter.iter_articles((a for a in articles), 'latest')),
+         lambda: formatter.iter_articles((a for a in articles), 'latest')),
+        ('detail, legacy +=',
+         lambda: legacy_format_article_detail(detail_article, content), None),
+        ('detail, streamed',
+         lambda: ''.join(formatter.iter_article_detail(detail_article, iter(chunks))),
+         lambda: formatter.iter_article_detail(detail_article, iter(chunks))),
+    ]
+
+    print(f"{'variant':<24}{'total ms':>10}{'first chunk ms':>16}{'peak KiB':>11}")
+    for name, render, stream in variants:
+        total = best_seconds(render, args.iterations)
+        # Without streaming, nothing can be shown until the whole text is built
+        first = best_seconds(lambda: next(iter(stream())), args.iterations) if stream else total
+        print(f"{name:<24}{total * 1e3:>10.2f}{first * 1e3:>16.3f}{peak_kib(render):>11.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""Micro-benchmark for date parsing and query cleaning per-query cost.
+
+Compares the previous DateParser.parse_date_query + QueryCleaner
+(a chain of regex searches and substitutions, embedded below) with the
+single-pass grammar behind DateParser.parse, and lists the queries the two
+read differently: the date range and the cleaned query for each.
+
+Usage (from the repository root):
+    python benchmarks/bench_parsers.py [--iterations N]
+"""
+import argparse
+import datetime
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from parsers import DateParser  # noqa: E402
+
+QUERIES = [
+    "technology today",
+    "sports yesterday",
+    "climate change this week",
+    "politics last week",
+    "show me business news from last month",
+    "what happened 3 days ago in AI",
+    "general news 2025-10-01",
+    "elections on 10/01/2025",
+    "bitcoin",
+    "find the latest news on the war in ukraine",
+    "space exploration news in march",
+    "markets from 2025-09-01 to 2025-09-15",
+    "tech layoffs past 48 hours",
+    "football results last saturday",
+    # Names that contain a day or weekday: these must stay topics
+    "sunday times",
+    "super bowl sunday",
+    "jan 6 hearing",
+    "4th of july fireworks",
+    "fed news jan 6",
+]
+
+LEGACY_CLEAN_PATTERNS = [
+    r'\b(?:today|yesterday|this week|last week|this month|last month)\b',
+    r'\b\d+\s+days?\s+ago\b',
+    r'\b\d{4}-\d{2}-\d{2}\b',
+    r'\b\d{1,2}/\d{1,2}/\d{4}\b',
+    r'\b\d{1,2}-\d{1,2}-\d{4}\b',
+    r'\b(?:on|from|in|during)\s+',
+    r'\b(?:news|articles?)\s+(?:from|on|in)\b',
+]
+
+def legacy_parse_date_query(query, today):
+    """DateParser.parse_date_query before the single-pass grammar."""
+    from_date = to_date = None
+    query_lower = query.lower()
+    if 'today' in query_lower:
+        from_date = to_date = today
+    elif 'yesterday' in query_lower:
+        from_date = to_date = today - datetime.timedelta(days=1)
+    elif 'this week' in query_lower:
+        from_date = today - datetime.timedelta(days=today.weekday())
+        to_date = today
+    elif 'last week' in query_lower:
+        from_date = today - datetime.timedelta(days=today.weekday() + 7)
+        to_date = from_date + datetime.timedelta(days=6)
+    elif 'this month' in query_lower:
+        from_date = today.replace(day=1)
+        to_date = today
+    elif 'last month' in query_lower:
+        to_date = today.replace(day=1) - datetime.timedelta(days=1)
+        from_date = to_date.replace(day=1)
+    
+    days_ago_match = re.search(r'(\d+)\s+days?\s+ago', query_lower)
+    if days_ago_match:
+        from_date = to_date = today - datetime.timedelta(days=int(days_ago_match.group(1)))
+    
+    if from_date is None:
+        for pattern, fmt in ((r'(\d{4}-\d{2}-\d{2})', '%Y-%m-%d'), (r'(\d{1,2}/\d{1,2}/\d{4})', '%m/%d/%Y'),
+                             (r'(\d{1,2}-\d{1,2}-\d{4})', '%m-%d-%Y')):
+            match = re.search(pattern, query)
+            if match:
+                try:
+                    from_date = to_date = datetime.datetime.strptime(match.group(1), fmt).date()
+                    break
+                except ValueError:
+                    continue
+    
+    if from_date is None:
+        from_date, to_date = today - datetime.timedelta(days=7), today
+    return from_date, to_date
+
+def legacy_clean_query(query):
+    """QueryCleaner.clean_query_from_dates before the single-pass grammar."""
+    clean_query = query
+    for pattern in LEGACY_CLEAN_PATTERNS:
+        clean_query = re.sub(pattern, '', clean_query, flags=re.IGNORECASE)
+    clean_query = re.sub(r'\s+', ' ', clean_query).strip()
+    clean_query = re.sub(r'^(?:what|show|get|find|search)\s+', '', clean_query, flags=re.IGNORECASE)
+    return clean_query if clean_query else "general news"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+    
+    date_parser = DateParser()
+    today = date_parser.today
+    
+    def legacy():
+        for query in QUERIES:
+            legacy_parse_date_query(query, today)
+            legacy_clean_query(query)
+    
+    def combined():
+        for query in QUERIES:
+            date_parser.parse(query)
+    
+    benchmarks = [('legacy parse_date_query + clean_query', legacy),
+                  ('DateParser.parse (single scan)', combined)]
+    
+    print(f"{len(QUERIES)} queries x {args.iterations} iterations")
+    for name, func in benchmarks:
+        seconds = min(timeit.repeat(func, number=args.iterations // len(QUERIES) or 1, repeat=5))
+        per_query_us = seconds / ((args.iterations // len(QUERIES) or 1) * len(QUERIES)) * 1e6
+        print(f"  {name:<45} {per_query_us:8.2f} us/query")
+    
+    print("\nread differently (legacy -> single scan):")
+    for query in QUERIES:
+        old = (*legacy_parse_date_query(query, today), legacy_clean_query(query))
+        new = date_parser.parse(query)
+        if old != new:
+            print(f"  {query!r}")
+            print(f"      {old[0]}..{old[1]} {old[2]!r} -> {new[0]}..{new[1]} {new[2]!r}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""Time from launching the CLI to its first prompt, and where import time goes.
+
+Starts `python src/main.py` in a fresh interpreter --runs times, measures the
+time until "You: " is printed, and breaks `python -X importtime -c "import
+main"` down by top-level package. With --baseline REV the same is measured for
+the tree at that git revision (exported to a temporary directory), so the two
+can be compared on one machine. Last, it times importing each SDK on its own:
+that cost is now paid on the first call that needs the SDK, not at startup.
+
+Run it where the real SDKs from requirements.txt are installed; the numbers are
+only as meaningful as the packages imported.
+
+Usage (from the repository root):
+    python benchmarks/bench_startup.py [--runs 10] [--baseline HEAD~1]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.abspath(os.path.join(BENCH_DIR, '..'))
+
+# newsapi loads on the first search, firecrawl on the first scrape, the Cerebras
+# SDK on the first LLM call; httpx only with the async services (server mode)
+SDK_MODULES = ['newsapi', 'firecrawl', 'cerebras.cloud.sdk', 'httpx']
+
+IMPORT_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+def child_env():
+    env = dict(os.environ)
+    # Client constructors may check for keys; nothing is sent upstream
+    for key in ('CEREBRAS_API_KEY', 'NEWSAPIORG_KEY', 'FIRECRAWL_API_KEY'):
+        env.setdefault(key, 'bench-key')
+    return env
+
+def time_to_prompt(src_dir):
+    """Seconds from spawning the CLI until it asks for input."""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, '-u', os.path.join(src_dir, 'main.py')],
+                            cwd=src_dir, env=child_env(), stdin=subprocess.PIPE,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    seen = b''
+    while not seen.endswith(b'You: '):
+        byte = proc.stdout.read(1)
+        if not byte:
+            raise RuntimeError(f"CLI in {src_dir} exited before prompting")
+        seen += byte
+    elapsed = time.perf_counter() - start
+    proc.communicate(b'exit\n', timeout=30)
+    return elapsed
+
+def import_profile(src_dir):
+    """Self time of each module in `import main`, summed per top-level package (ms)."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import main'],
+                            cwd=src_dir, env=child_env(), capture_output=True, text=True, check=True)
+    packages = defaultdict(float)
+    total = 0.0
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        self_us, module = int(match.group(1)), match.group(4)
+        packages[module.split('.')[0]] += self_us / 1000
+        total += self_us / 1000
+    return total, packages
+
+def import_alone(module):
+    """Milliseconds to import one module in a fresh interpreter, None if not installed."""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    result = subprocess.run([sys.executable, '-c', code], env=child_env(), capture_output=True, text=True)
+    return float(result.stdout) * 1000 if result.returncode == 0 else None
+
+def export_tree(rev, target):
+    """Extract src/ at rev into target and return the path of that src/."""
+    archive = subprocess.run(['git', 'archive', rev, 'src'], cwd=REPO_DIR, capture_output=True, check=True)
+    subprocess.run(['tar', '-x', '-C', target], input=archive.stdout, check=True)
+    return os.path.join(target, 'src')
+
+def measure(label, src_dir, runs):
+    time_to_prompt(src_dir)  # compiles and caches the tree's bytecode
+    timings = sorted(time_to_prompt(src_dir) for _ in range(runs))
+    total, packages = import_profile(src_dir)
+    print(f"{label}: first prompt p50 {statistics.median(timings) * 1000:.0f} ms, "
+          f"min {timings[0] * 1000:.0f} ms; `import main` {total:.0f} ms")
+    for package, ms in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:8]:
+        print(f"    {package:<24}{ms:>8.1f} ms")
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--baseline', help="git revision to compare against, e.g. HEAD~1")
+    args = parser.parse_args()
+
+    current = measure('current', os.path.join(REPO_DIR, 'src'), args.runs)
+    if args.baseline:
+        with tempfile.TemporaryDirectory() as target:
+            baseline = measure(f'baseline {args.baseline}', export_tree(args.baseline, target), args.runs)
+        print(f"\ntime to first prompt: {baseline * 1000:.0f} ms -> {current * 1000:.0f} ms "
+              f"({(1 - current / baseline) * 100:.0f}% less)")
+
+    print("\ndeferred to first use (fresh interpreter, ms):")
+    for module in SDK_MODULES:
+        ms = import_alone(module)
+        print(f"    {module:<24}" + ('not installed' if ms is None else f"{ms:>8.1f} ms"))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,283 @@
+"""Replay a corpus of user turns through the full agent pipeline against local stand-ins.
+
+Runs ChatSession -> IntentRouter/LLMService -> NewsService -> ScraperService
+-> ResponseFormatter exactly as the chat loop does, with the Cerebras, NewsAPI
+and Firecrawl SDKs replaced by recorded fixtures (see stand_ins.py), and
+reports p50/p95/p99 latency per stage, throughput and allocations.
+
+--record saves every upstream call to a cassette; --cassette replays one
+through the transport layer instead of the stand-ins, with the latencies and
+--error-rate injected, so the retry and fallback paths run too.
+
+Usage (from the repository root):
+    python benchmarks/bench_turns.py --rounds 20 --llm-latency 0.05 \
+        --news-latency 0.1 --scrape-latency 0.3 --allocations
+    python benchmarks/bench_turns.py --rounds 1 --record /tmp/turns.jsonl
+    python benchmarks/bench_turns.py --rounds 20 --cassette /tmp/turns.jsonl --error-rate 0.05
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+# The services read API keys from config at construction; stand-ins ignore them
+for key in ('CEREBRAS_API_KEY', 'NEWSAPIORG_KEY', 'FIRECRAWL_API_KEY'):
+    os.environ.setdefault(key, 'bench-key')
+# Measure the pipeline, not the client-side upstream rate limits
+for key in ('NEWSAPI_RATE_LIMIT', 'FIRECRAWL_RATE_LIMIT'):
+    os.environ.setdefault(key, '0')
+# Scrapes go to the stand-in only; a hedge would fetch the real pages
+os.environ.setdefault('SCRAPE_HEDGE', 'false')
+
+from stand_ins import Latency, StandInCerebras, StandInNewsApi, StandInFirecrawl  # noqa: E402
+from agent.chat_session import ChatSession  # noqa: E402
+from agent.llm_service import LLMService  # noqa: E402
+from agent.news_service import NewsService  # noqa: E402
+from agent.scraper_service import ScraperService  # noqa: E402
+from agent.intent_router import IntentRouter  # noqa: E402
+from parsers import CommandStreamParser  # noqa: E402
+from transport import Cassette, FaultInjector, Transport  # noqa: E402
+
+STAGES = ['route', 'llm', 'search', 'format_headlines', 'scrape', 'format_detail', 'session', 'turn']
+
+def bench_transport(args):
+    """Live stand-ins, stand-ins recorded to --record, or --cassette replayed with injected faults."""
+    if args.record:
+        return Transport('record', Cassette(args.record))
+    if args.cassette:
+        if not os.path.exists(args.cassette):
+            sys.exit(f"cassette {args.cassette} not found (record one with --record)")
+        faults = {
+            'cerebras': FaultInjector(args.llm_latency, args.jitter, args.error_rate, seed=1),
+            'newsapi': FaultInjector(args.news_latency, args.jitter, args.error_rate, seed=2),
+            'firecrawl': FaultInjector(args.scrape_latency, args.jitter, args.error_rate, seed=3),
+        }
+        return Transport('replay', Cassette(args.cassette), faults)
+    return Transport()
+
+def upstream_calls(transport, news_api, firecrawl):
+    """NewsAPI and Firecrawl calls made, whether the stand-ins or the cassette answered them."""
+    if transport.mode == 'replay':
+        return {service: transport.faults_for(service).calls for service in ('newsapi', 'firecrawl')}
+    return {'newsapi': news_api.calls, 'firecrawl': firecrawl.calls}
+
+def add_transport_args(parser):
+    parser.add_argument('--record', help='also record every upstream call to this cassette')
+    parser.add_argument('--cassette', help='replay upstream calls from this cassette instead')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='share of replayed calls failing with HTTP 503 (with --cassette)')
+
+def load_utterances(path):
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+class TurnRunner:
+    """Drives one conversation through the same steps as main.main()."""
+
+    def __init__(self, args):
+        self.session = ChatSession()
+        self.llm = LLMService()
+        self.news = NewsService()
+        self.scraper = ScraperService()
+        self.router = None if args.no_router else IntentRouter()
+        self.cold = args.cold
+
+        self.transport = bench_transport(args)
+        self.cerebras = StandInCerebras(Latency(args.llm_latency, args.jitter, seed=1))
+        self.llm.llm_client.client = self.transport.connect('cerebras', lambda _: self.cerebras)
+        self.news_api = StandInNewsApi(Latency(args.news_latency, args.jitter, seed=2))
+        self.news.news_client.client = self.transport.connect('newsapi', lambda _: self.news_api)
+        self.firecrawl = StandInFirecrawl(Latency(args.scrape_latency, args.jitter, seed=3))
+        self.scraper.scraper_client.client = self.transport.connect('firecrawl', lambda _: self.firecrawl)
+
+        self.timings = defaultdict(list)
+        self.allocations = defaultdict(list) if args.allocations else None
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        # Stages nest inside 'turn', and resetting the peak is global, so only
+        # leaf stages get allocation numbers
+        track_allocations = self.allocations is not None and name != 'turn'
+        if track_allocations:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name].append(time.perf_counter() - start)
+            if track_allocations:
+                self.allocations[name].append(tracemalloc.get_traced_memory()[1] - baseline)
+
+    def run_turn(self, user_input):
+        if self.cold:
+            self.news.cache.clear()
+            if self.news.store is not None:
+                self.news.store.clear()
+            if self.scraper.cache is not None:
+                self.scraper.cache = None
+                self.scraper.scraper_client.cache = None
+
+        with self.stage('turn'):
+            with self.stage('session'):
+                self.session.add_message("user", user_input)
+
+            with self.stage('route'):
+                command = self.router.route(user_input) if self.router else None
+
+            reply = CommandStreamParser()
+            if command:
+                reply.feed(command)
+            else:
+                with self.stage('llm'):
+                    stream = self.llm.stream_response(self.session.get_messages(), self.session.prompt_hints())
+                    for delta in stream:
+                        reply.feed(delta)
+                        if reply.is_complete:
+                            break
+                    stream.close()
+            reply.finish()
+
+            if reply.command == "SEARCH":
+                with self.stage('search'):
+                    articles = self.news.fetch_headlines(reply.argument)
+                with self.stage('format_headlines'):
+                    display = self.news.format_articles(articles, reply.argument)
+                with self.stage('session'):
+                    self.session.store_articles(articles)
+                    self.session.add_headlines(reply.argument, articles)
+
+            elif reply.command == "DETAIL":
+                index = int(reply.argument) - 1 if reply.argument.isdigit() else -1
+                article = self.session.get_article(index)
+                if article:
+                    with self.stage('scrape'):
+                        content = self.scraper.scrape_article(article.url, fallback_article=article)
+                    with self.stage('format_detail'):
+                        detail = self.news.format_article_detail(article, content)
+                    with self.stage('session'):
+                        self.session.add_article_detail(index, article)
+
+            else:
+                with self.stage('session'):
+                    self.session.add_message("assistant", reply.text.strip())
+
+def report(runner, turns, elapsed, args):
+    calls = upstream_calls(runner.transport, runner.news_api, runner.firecrawl)
+    results = {'turns': turns, 'elapsed_s': elapsed, 'throughput_turns_per_s': turns / elapsed,
+               'upstream_calls': calls, 'stages': {}}
+
+    print(f"\n{turns} turns in {elapsed:.2f}s -> {turns / elapsed:.1f} turns/s")
+    print(f"upstream calls: newsapi={calls['newsapi']} firecrawl={calls['firecrawl']}")
+    if runner.transport.mode != 'live':
+        results['transport'] = runner.transport.stats()
+        cassette = results['transport']['cassette']
+        print(f"transport: {runner.transport.mode} {cassette['path']}, {cassette['exact_hits']} exact "
+              f"and {cassette['loose_hits']} loose hits, {cassette['misses']} misses, "
+              f"{cassette['recorded']} recorded, "
+              f"{sum(f['injected_errors'] for f in results['transport']['faults'].values())} injected errors")
+    prompts = runner.cerebras.prompt_chars
+    if prompts:
+        # ~4 characters per token, system prompt included
+        results['llm_prompt_tokens'] = {'mean': sum(prompts) / len(prompts) / 4, 'max': max(prompts) / 4}
+        print(f"llm prompts: {len(prompts)} calls, ~{results['llm_prompt_tokens']['mean']:.0f} tokens mean, "
+              f"~{results['llm_prompt_tokens']['max']:.0f} max")
+    llm_stats = runner.llm.stats()
+    results['llm'] = llm_stats
+    print(f"llm: {llm_stats['llm_calls']} calls, {llm_stats['memo_hits']} memo hits, "
+          f"~{llm_stats['prompt_tokens_saved']} prompt tokens saved, "
+          f"{llm_stats['static_prefix_share']:.0%} of sent prompt tokens are the static prefix")
+    if runner.news.store is not None:
+        results['article_index'] = runner.news.index_stats()
+        print(f"article index: {results['article_index']['answered_locally']} of "
+              f"{results['article_index']['plans']} searches answered locally, "
+              f"{results['article_index']['narrowed']} narrowed")
+    if runner.news.dedup is not None:
+        results['dedup'] = runner.news.dedup_stats()
+        print(f"dedup: {results['dedup']['collapsed']} of {results['dedup']['checked']} results "
+              f"collapsed as near-duplicates")
+    results['providers'] = runner.news.provider_stats()
+    print("providers: " + ", ".join(
+        f"{name} {stats['calls']} calls ({stats['mean_ms']:.1f} ms mean, {stats['deadline_misses']} late)"
+        for name, stats in results['providers'].items()))
+    results['scrape'] = runner.scraper.scrape_stats()
+    latency = results['scrape']['latency']
+    print(f"scrape deadlines: {latency['domains_tracked']} domains tracked, "
+          f"p95 {latency['overall_p95_s']:.2f}s, open circuits: {len(results['scrape']['circuits']['open'])}")
+    if runner.router:
+        print(f"intent router: {runner.router.stats()['llm_avoided_ratio']:.0%} of turns skipped the LLM")
+
+    header = f"{'stage':<18}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    if runner.allocations is not None:
+        header += f"{'peak KiB':>11}"
+    print(header)
+    print('-' * len(header))
+
+    for name in STAGES:
+        values = sorted(runner.timings.get(name, []))
+        if not values:
+            continue
+        row = {'count': len(values),
+               'p50_ms': percentile(values, 50) * 1e3,
+               'p95_ms': percentile(values, 95) * 1e3,
+               'p99_ms': percentile(values, 99) * 1e3}
+        line = f"{name:<18}{row['count']:>7}{row['p50_ms']:>10.3f}{row['p95_ms']:>10.3f}{row['p99_ms']:>10.3f}"
+        if runner.allocations is not None and runner.allocations.get(name):
+            row['peak_alloc_kib'] = max(runner.allocations[name]) / 1024
+            line += f"{row['peak_alloc_kib']:>11.1f}"
+        results['stages'][name] = row
+        print(line)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nresults written to {args.json}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', default=os.path.join(BENCH_DIR, 'fixtures', 'utterances.txt'))
+    parser.add_argument('--rounds', type=int, default=10, help='times to replay the corpus')
+    parser.add_argument('--llm-latency', type=float, default=0.0, help='seconds per LLM call')
+    parser.add_argument('--news-latency', type=float, default=0.0, help='seconds per NewsAPI call')
+    parser.add_argument('--scrape-latency', type=float, default=0.0, help='seconds per Firecrawl call')
+    parser.add_argument('--jitter', type=float, default=0.0, help='max extra random latency (seconds)')
+    parser.add_argument('--cold', action='store_true', help='clear caches before every turn')
+    parser.add_argument('--no-router', action='store_true', help='send every turn to the LLM')
+    parser.add_argument('--allocations', action='store_true', help='track peak allocations per stage')
+    add_transport_args(parser)
+    parser.add_argument('--json', help='also write results to this JSON file')
+    parser.add_argument('--verbose', action='store_true', help='show service debug output')
+    args = parser.parse_args()
+
+    utterances = load_utterances(args.corpus)
+    runner = TurnRunner(args)
+    if args.allocations:
+        tracemalloc.start()
+
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    start = time.perf_counter()
+    with output:
+        for _ in range(args.rounds):
+            for user_input in utterances:
+                runner.run_turn(user_input)
+    elapsed = time.perf_counter() - start
+
+    report(runner, args.rounds * len(utterances), elapsed, args)
+
+if __name__ == '__main__':
+    main()
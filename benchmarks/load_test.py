@@ -0,0 +1,240 @@
+"""Load-test the multi-session server with many concurrent simulated users.
+
+By default the server runs in-process with the Cerebras, NewsAPI and Firecrawl
+SDKs replaced by the async stand-ins, so the numbers measure the server,
+session handling and pipeline rather than the upstreams. Each simulated user
+opens a session and replays the utterance corpus over a WebSocket (or SSE),
+and the script reports per-turn latency percentiles, time to first event and
+throughput.
+
+--record and --cassette work as in bench_turns.py. With --stub the cassette
+is served over HTTP by the stub server and the real SDKs are pointed at it,
+so their request and response handling is measured as well.
+
+Usage (from the repository root):
+    python benchmarks/load_test.py --users 200 --rounds 2 --llm-latency 0.05 \
+        --news-latency 0.1 --scrape-latency 0.3
+    python benchmarks/load_test.py --users 500 --cassette /tmp/turns.jsonl --error-rate 0.02
+    python benchmarks/load_test.py --users 100 --cassette /tmp/turns.jsonl --stub
+    python benchmarks/load_test.py --url http://127.0.0.1:8080 --users 50
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+# The services read API keys from config at construction; stand-ins ignore them
+for key in ('CEREBRAS_API_KEY', 'NEWSAPIORG_KEY', 'FIRECRAWL_API_KEY'):
+    os.environ.setdefault(key, 'bench-key')
+# Measure the pipeline, not the client-side upstream rate limits
+for key in ('NEWSAPI_RATE_LIMIT', 'FIRECRAWL_RATE_LIMIT'):
+    os.environ.setdefault(key, '0')
+# Scrapes go to the stand-in only; a hedge would fetch the real pages
+os.environ.setdefault('SCRAPE_HEDGE', 'false')
+
+import aiohttp  # noqa: E402
+from aiohttp import web  # noqa: E402
+from stand_ins import (Latency, AsyncStandInCerebras, StandInNewsApiHttp,  # noqa: E402
+                       AsyncStandInFirecrawl)
+from bench_turns import (load_utterances, percentile, bench_transport, upstream_calls,  # noqa: E402
+                         add_transport_args)
+from server import build_handler, create_app  # noqa: E402
+from transport import Cassette, FaultInjector, Transport  # noqa: E402
+from transport.stub_server import create_stub_app  # noqa: E402
+
+def build_stand_in_handler(args):
+    """The server's shared services with every upstream SDK swapped for a stand-in or replayer."""
+    handler = build_handler()
+    handler.transport = bench_transport(args)
+    handler.stub_faults = None
+    cerebras = AsyncStandInCerebras(Latency(args.llm_latency, args.jitter, seed=1))
+    handler.llm.llm_client.client = handler.transport.connect('cerebras', lambda _: cerebras, is_async=True)
+    handler.news_api = StandInNewsApiHttp(Latency(args.news_latency, args.jitter, seed=2))
+    handler.news.news_client.http_client = handler.transport.connect('newsapi', lambda _: handler.news_api,
+                                                                     is_async=True)
+    handler.firecrawl = AsyncStandInFirecrawl(Latency(args.scrape_latency, args.jitter, seed=3))
+    handler.scraper.scraper_client.client = handler.transport.connect('firecrawl', lambda _: handler.firecrawl,
+                                                                      is_async=True)
+    return handler
+
+async def start_stub(args):
+    """The stub server replaying --cassette, and a live transport pointing the real SDKs at it."""
+    if not args.cassette or not os.path.exists(args.cassette):
+        sys.exit("--stub needs an existing --cassette")
+    faults = {
+        'cerebras': FaultInjector(args.llm_latency, args.jitter, args.error_rate, seed=1),
+        'newsapi': FaultInjector(args.news_latency, args.jitter, args.error_rate, seed=2),
+        'firecrawl': FaultInjector(args.scrape_latency, args.jitter, args.error_rate, seed=3),
+    }
+    runner = web.AppRunner(create_stub_app(Cassette(args.cassette), faults))
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    base_url = f"http://{host}:{port}"
+    transport = Transport(base_urls={'cerebras': base_url, 'newsapi': base_url, 'firecrawl': base_url})
+    return runner, transport, faults
+
+def build_stub_handler(transport, faults):
+    """The server's shared services with the real SDKs talking to the stub server."""
+    handler = build_handler()
+    handler.transport = transport
+    handler.stub_faults = faults
+    # The SDK clients are built on first use, so they pick up the stub's base URLs
+    for client in (handler.llm.llm_client, handler.news.news_client, handler.scraper.scraper_client):
+        client.transport = transport
+    return handler
+
+def handler_calls(handler):
+    if handler.stub_faults is not None:
+        return {service: handler.stub_faults[service].calls for service in ('newsapi', 'firecrawl')}
+    return upstream_calls(handler.transport, handler.news_api, handler.firecrawl)
+
+class Results:
+    def __init__(self):
+        self.turns = []
+        self.first_event = []
+        self.errors = 0
+
+async def run_user_ws(http, base_url, utterances, rounds, results):
+    async with http.post(f"{base_url}/sessions") as response:
+        session_id = (await response.json())['session_id']
+
+    async with http.ws_connect(f"{base_url}/sessions/{session_id}/ws") as ws:
+        for _ in range(rounds):
+            for user_input in utterances:
+                start = time.perf_counter()
+                first = None
+                await ws.send_str(user_input)
+                while True:
+                    event = await ws.receive_json()
+                    if first is None:
+                        first = time.perf_counter() - start
+                    if event['type'] == 'done':
+                        break
+                results.first_event.append(first)
+                results.turns.append(time.perf_counter() - start)
+
+async def run_user_sse(http, base_url, utterances, rounds, results):
+    async with http.post(f"{base_url}/sessions") as response:
+        session_id = (await response.json())['session_id']
+
+    url = f"{base_url}/sessions/{session_id}/messages"
+    for _ in range(rounds):
+        for user_input in utterances:
+            start = time.perf_counter()
+            first = None
+            async with http.post(url, json={'message': user_input}) as response:
+                async for line in response.content:
+                    if first is None and line.startswith(b'data:'):
+                        first = time.perf_counter() - start
+            results.first_event.append(first or 0.0)
+            results.turns.append(time.perf_counter() - start)
+
+async def run_load(args, base_url, utterances):
+    results = Results()
+    run_user = run_user_sse if args.transport == 'sse' else run_user_ws
+    connector = aiohttp.TCPConnector(limit=0)
+
+    async def user(i):
+        # Stagger arrivals over the ramp-up window
+        await asyncio.sleep(args.ramp_up * i / max(1, args.users))
+        try:
+            await run_user(http, base_url, utterances, args.rounds, results)
+        except Exception as e:
+            results.errors += 1
+            print(f"[ERROR] user {i}: {e}", file=sys.stderr)
+
+    async with aiohttp.ClientSession(connector=connector) as http:
+        start = time.perf_counter()
+        await asyncio.gather(*(user(i) for i in range(args.users)))
+        elapsed = time.perf_counter() - start
+    return results, elapsed
+
+async def main_async(args):
+    utterances = load_utterances(args.corpus)
+    if args.url:
+        return await run_load(args, args.url.rstrip('/'), utterances), None
+
+    stub = None
+    if args.stub:
+        stub, transport, faults = await start_stub(args)
+        handler = build_stub_handler(transport, faults)
+    else:
+        handler = build_stand_in_handler(args)
+    runner = web.AppRunner(create_app(handler=handler))
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    try:
+        return await run_load(args, f"http://{host}:{port}", utterances), handler
+    finally:
+        await runner.cleanup()
+        if stub is not None:
+            await stub.cleanup()
+
+def report(results, elapsed, handler, args):
+    turns = sorted(results.turns)
+    first = sorted(results.first_event)
+    summary = {
+        'users': args.users,
+        'transport': args.transport,
+        'turns': len(turns),
+        'errors': results.errors,
+        'elapsed_s': elapsed,
+        'throughput_turns_per_s': len(turns) / elapsed if elapsed else 0.0,
+        'turn_ms': {f'p{p}': percentile(turns, p) * 1e3 for p in (50, 95, 99)},
+        'first_event_ms': {f'p{p}': percentile(first, p) * 1e3 for p in (50, 95, 99)},
+    }
+    if handler is not None:
+        summary['upstream_calls'] = handler_calls(handler)
+
+    print(f"\n{args.users} users over {args.transport}: {len(turns)} turns in {elapsed:.2f}s "
+          f"-> {summary['throughput_turns_per_s']:.1f} turns/s ({results.errors} errors)")
+    if handler is not None:
+        calls = summary['upstream_calls']
+        print(f"upstream calls: newsapi={calls['newsapi']} firecrawl={calls['firecrawl']}")
+    print(f"{'metric':<14}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name in ('turn_ms', 'first_event_ms'):
+        row = summary[name]
+        print(f"{name:<14}{row['p50']:>10.2f}{row['p95']:>10.2f}{row['p99']:>10.2f}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        print(f"\nresults written to {args.json}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='target an already running server instead of an in-process one')
+    parser.add_argument('--users', type=int, default=50, help='concurrent simulated users')
+    parser.add_argument('--rounds', type=int, default=1, help='times each user replays the corpus')
+    parser.add_argument('--transport', choices=('ws', 'sse'), default='ws')
+    parser.add_argument('--ramp-up', type=float, default=0.0, help='seconds over which users arrive')
+    parser.add_argument('--corpus', default=os.path.join(BENCH_DIR, 'fixtures', 'utterances.txt'))
+    parser.add_argument('--llm-latency', type=float, default=0.0, help='seconds per LLM call')
+    parser.add_argument('--news-latency', type=float, default=0.0, help='seconds per NewsAPI call')
+    parser.add_argument('--scrape-latency', type=float, default=0.0, help='seconds per Firecrawl call')
+    parser.add_argument('--jitter', type=float, default=0.0, help='max extra random latency (seconds)')
+    add_transport_args(parser)
+    parser.add_argument('--stub', action='store_true',
+                        help='serve --cassette from the stub server to the real SDKs')
+    parser.add_argument('--json', help='also write results to this JSON file')
+    parser.add_argument('--verbose', action='store_true', help='show service debug output')
+    args = parser.parse_args()
+
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with output:
+        (results, elapsed), handler = asyncio.run(main_async(args))
+    report(results, elapsed, handler, args)
+
+if __name__ == '__main__':
+    main()
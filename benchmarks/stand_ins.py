@@ -0,0 +1,145 @@
+"""Deterministic local stand-ins for the Cerebras, NewsAPI and Firecrawl SDKs.
+
+They replace the SDK object each client wraps (``client.client``), so the
+repo's own wrapper code -- caching, cleaning, fallbacks -- still runs.
+"""
+import asyncio
+import json
+import os
+import random
+import time
+from types import SimpleNamespace
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+        return json.load(f)
+
+class Latency:
+    """Injected upstream latency: a fixed base plus seeded uniform jitter."""
+    
+    def __init__(self, base: float = 0.0, jitter: float = 0.0, seed: int = 0):
+        self.base = base
+        self.jitter = jitter
+        self._random = random.Random(seed)
+    
+    def delay(self) -> float:
+        return self.base + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+    
+    def wait(self):
+        delay = self.delay()
+        if delay > 0:
+            time.sleep(delay)
+    
+    async def wait_async(self):
+        delay = self.delay()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+class StandInCerebras:
+    """Replays recorded Cerebras replies keyed by the last user message."""
+    
+    def __init__(self, latency: Latency, fixture: str = 'cerebras_replies.json'):
+        data = load_fixture(fixture)
+        self.replies = {k.lower(): v for k, v in data['replies'].items()}
+        self.default = data['default']
+        self.latency = latency
+        self.prompt_chars = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+    
+    def _reply_for(self, messages):
+        self.prompt_chars.append(sum(len(m['content']) for m in messages))
+        user_messages = [m['content'] for m in messages if m['role'] == 'user']
+        last = user_messages[-1].strip().lower() if user_messages else ''
+        return self.replies.get(last, self.default)
+    
+    def _create(self, messages, stream=False, **kwargs):
+        self.latency.wait()
+        reply = self._reply_for(messages)
+        if not stream:
+            message = SimpleNamespace(content=reply)
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+        return _StandInStream(reply)
+
+class _StandInStream:
+    """Iterates a reply as small deltas, like a streamed completion."""
+    
+    def __init__(self, reply: str, chunk_size: int = 4):
+        self._chunks = [reply[i:i + chunk_size] for i in range(0, len(reply), chunk_size)]
+    
+    def __iter__(self):
+        for chunk in self._chunks:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=chunk))])
+    
+    def close(self):
+        pass
+
+class StandInNewsApi:
+    """Returns a deterministic query-dependent slice of a recorded /everything response."""
+    
+    def __init__(self, latency: Latency, fixture: str = 'newsapi_everything.json'):
+        self.articles = load_fixture(fixture)['articles']
+        self.latency = latency
+        self.calls = 0
+    
+    def get_everything(self, q, from_param=None, to=None, language='en',
+                       sort_by='publishedAt', page_size=20, **kwargs):
+        self.latency.wait()
+        return self._respond(q, page_size)
+    
+    def _respond(self, q, page_size):
+        self.calls += 1
+        # Rotate the recorded list by a stable hash of the query
+        offset = sum(map(ord, q)) % len(self.articles)
+        rotated = self.articles[offset:] + self.articles[:offset]
+        return {'status': 'ok', 'totalResults': len(rotated), 'articles': rotated[:page_size]}
+
+class StandInFirecrawl:
+    """Serves recorded Firecrawl scrape results by URL."""
+    
+    def __init__(self, latency: Latency, fixture: str = 'firecrawl_scrape.json'):
+        self.pages = load_fixture(fixture)
+        self.latency = latency
+        self.calls = 0
+    
+    def scrape(self, url, **kwargs):
+        self.latency.wait()
+        self.calls += 1
+        return self.pages.get(url)
+
+class AsyncStandInCerebras(StandInCerebras):
+    """AsyncCerebras counterpart of StandInCerebras."""
+    
+    async def _create(self, messages, stream=False, **kwargs):
+        await self.latency.wait_async()
+        reply = self._reply_for(messages)
+        if not stream:
+            message = SimpleNamespace(content=reply)
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+        return _AsyncStandInStream(reply)
+
+class _AsyncStandInStream(_StandInStream):
+    
+    async def __aiter__(self):
+        for chunk in self._chunks:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=chunk))])
+    
+    async def close(self):
+        pass
+
+class StandInNewsApiHttp(StandInNewsApi):
+    """Stands in for the pooled httpx client used by AsyncNewsAPIClient."""
+    
+    async def get(self, url, params=None, headers=None, **kwargs):
+        await self.latency.wait_async()
+        data = self._respond(params['q'], params.get('pageSize', 20))
+        return SimpleNamespace(status_code=200, json=lambda: data)
+
+class AsyncStandInFirecrawl(StandInFirecrawl):
+    """AsyncFirecrawl counterpart of StandInFirecrawl."""
+    
+    async def scrape(self, url, **kwargs):
+        await self.latency.wait_async()
+        self.calls += 1
+        return self.pages.get(url)
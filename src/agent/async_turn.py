@@ -0,0 +1,96 @@
+from typing import AsyncIterator, Dict
+from agent.chat_session import ChatSession
+from parsers import CommandStreamParser
+from telemetry import tracer
+
+class AsyncTurnHandler:
+    """Runs conversation turns on the event loop, yielding display events.
+    
+    Events are dicts with a 'type' of 'delta' (streamed reply text),
+    'status' (progress notes), 'message' (a complete reply) or 'done'.
+    """
+    
+    def __init__(self, llm, news, scraper, router=None):
+        self.llm = llm
+        self.news = news
+        self.scraper = scraper
+        self.router = router
+    
+    async def handle(self, session: ChatSession, user_input: str) -> AsyncIterator[Dict]:
+        """Process one user message for session."""
+        with tracer.span('turn', input_chars=len(user_input)):
+            session.add_message("user", user_input)
+            
+            with tracer.span('route'):
+                command = self.router.route(user_input) if self.router else None
+            
+            reply = CommandStreamParser()
+            if command:
+                reply.feed(command)
+                reply.finish()
+            else:
+                async for text in self._stream_reply(session, reply):
+                    yield {'type': 'delta', 'text': text}
+            
+            if reply.command == "SEARCH":
+                yield {'type': 'status', 'text': f"Searching for '{reply.argument}'..."}
+                articles = await self.news.fetch_headlines(reply.argument)
+                session.store_articles(articles)
+                self.scraper.prefetch(articles)
+                session.add_headlines(reply.argument, articles)
+                yield {'type': 'message', 'text': self.news.format_articles(articles, reply.argument)}
+            
+            elif reply.command == "DETAIL":
+                async for event in self._detail(session, reply.argument):
+                    yield event
+            
+            else:
+                session.add_message("assistant", reply.text.strip())
+        
+        yield {'type': 'done'}
+    
+    async def _stream_reply(self, session: ChatSession, reply: CommandStreamParser) -> AsyncIterator[str]:
+        """Stream the LLM reply, stopping early once a command is complete."""
+        with tracer.span('llm.stream') as span:
+            stream = self.llm.stream_response(session.get_messages(), session.prompt_hints())
+            try:
+                async for delta in stream:
+                    text = reply.feed(delta)
+                    if text:
+                        yield text
+                    if reply.is_complete:
+                        break
+            finally:
+                await stream.aclose()
+            
+            text = reply.finish()
+            if text:
+                yield text
+            span.set('command', reply.command or 'text')
+    
+    async def _detail(self, session: ChatSession, argument: str) -> AsyncIterator[Dict]:
+        """Scrape and format the requested article, recording the reply in session.
+        
+        A slow scrape yields the article summary first and the full text once
+        it arrives.
+        """
+        try:
+            index = int(argument) - 1
+            article = session.get_article(index)
+            if article:
+                async for content, loading in self.scraper.iter_article(article.url,
+                                                                        fallback_article=article):
+                    if content is None:
+                        yield {'type': 'status', 'text': "Couldn't load the full article."}
+                        continue
+                    yield {'type': 'message', 'text': self.news.format_article_detail(article, content)}
+                    if loading:
+                        yield {'type': 'status', 'text': "Loading the full article..."}
+                session.add_article_detail(index, article)
+                return
+            message = "Sorry, I couldn't find that article. Please specify a valid number."
+        except Exception as e:
+            message = f"Error fetching article details: {str(e)}"
+        
+        session.add_message("assistant", message)
+        yield {'type': 'message', 'text': message}
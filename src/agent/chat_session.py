@@ -1,19 +1,83 @@
+from config import HISTORY_MAX_MESSAGES, HISTORY_TOKEN_BUDGET, HISTORY_SUMMARY_TOKENS
+
+def estimate_tokens(text):
+    """Rough token count: about four characters per token plus per-message overhead."""
+    return len(text) // 4 + 4
+
+def summarize_locally(summary, dropped, max_tokens):
+    """Fold dropped messages into a running one-line summary without an LLM call."""
+    notes = [summary] if summary else []
+    for message in dropped:
+        first_line = message["content"].strip().split("\n", 1)[0][:80]
+        if message["role"] == "user":
+            notes.append(f"user asked '{first_line}'")
+        elif first_line.startswith("["):
+            notes.append(first_line.strip("[]"))
+    
+    text = "; ".join(notes)
+    # Keep the most recent part when the summary outgrows its budget
+    max_chars = max_tokens * 4
+    if len(text) > max_chars:
+        text = "..." + text[-(max_chars - 3):]
+    return text
+
 class ChatSession:
-    def __init__(self, max_history=6):
+    """Conversation memory kept within a token budget.
+    
+    Rendered headline listings and article pages are stored as compact notes
+    (titles and sources), older messages are trimmed once the estimated token
+    count exceeds token_budget, and trimmed turns are folded into a short
+    summary by summarizer(summary, dropped, summary_tokens).
+    """
+    
+    def __init__(self, max_history=HISTORY_MAX_MESSAGES, token_budget=HISTORY_TOKEN_BUDGET,
+                 summary_tokens=HISTORY_SUMMARY_TOKENS, summarizer=summarize_locally):
         self.messages = []
         self.max_history = max_history
+        self.token_budget = token_budget
+        self.summary_tokens = summary_tokens
+        self.summarizer = summarizer
+        self.summary = ""
         self.last_articles = []
+        self._tokens = 0
     
     def add_message(self, role, content):
         """Add a message to conversation history."""
         self.messages.append({"role": role, "content": content})
-        if len(self.messages) > self.max_history:
-            self.messages = self.messages[-self.max_history:]
+        self._tokens += estimate_tokens(content)
+        self._trim()
+    
+    def add_headlines(self, query, articles):
+        """Record a headline listing as titles and sources instead of the rendered text."""
+        if not articles:
+            self.add_message("assistant", f"[No articles found for '{query}']")
+            return
+        lines = [f"[Showed {len(articles)} headlines for '{query}']"]
+        for i, article in enumerate(articles, 1):
+            lines.append(f"{i}. {article.title} ({article.source})")
+        self.add_message("assistant", "\n".join(lines))
+    
+    def add_article_detail(self, index, article):
+        """Record that the full text of an article was shown."""
+        self.add_message("assistant", f"[Showed full article {index + 1}: {article.title} ({article.source})]")
     
     def get_messages(self):
         """Get all messages for LLM context."""
+        if self.summary:
+            note = {"role": "system", "content": f"Earlier in this conversation: {self.summary}"}
+            return [note] + self.messages
         return self.messages
     
+    def prompt_hints(self):
+        """Short facts about the session for the dynamic part of the system prompt."""
+        if self.last_articles:
+            return [f"Articles 1-{len(self.last_articles)} from the last search can be opened with DETAIL:<number>"]
+        return []
+    
+    def token_estimate(self):
+        """Estimated prompt tokens of the history returned by get_messages."""
+        return self._tokens + (estimate_tokens(self.summary) if self.summary else 0)
+    
     def store_articles(self, articles):
         """Store fetched articles for reference."""
         self.last_articles = articles
@@ -22,4 +86,16 @@ class ChatSession:
         """Get article by index."""
         if 0 <= index < len(self.last_articles):
             return self.last_articles[index]
-        return None
\ No newline at end of file
+        return None
+    
+    def _trim(self):
+        """Drop the oldest messages until both the count and token limits hold."""
+        dropped = []
+        while len(self.messages) > 1 and (len(self.messages) > self.max_history
+                                          or self._tokens > self.token_budget):
+            message = self.messages.pop(0)
+            self._tokens -= estimate_tokens(message["content"])
+            dropped.append(message)
+        
+        if dropped and self.summary_tokens > 0 and self.summarizer is not None:
+            self.summary = self.summarizer(self.summary, dropped, self.summary_tokens)
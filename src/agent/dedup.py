@@ -0,0 +1,99 @@
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from cache import normalize_url
+from models import Article
+from utils.simhash import simhash, hamming_distance, bands
+
+# "Headline - Reuters", "Headline | BBC News": the outlet is not part of the story
+OUTLET_SUFFIX = re.compile(r'\s+[-|–—]\s+[^-|–—]{1,40}$')
+
+class NearDuplicateFilter:
+    """Collapses syndicated copies of a story in search results.
+
+    Articles whose title+description SimHash signatures differ in at most
+    max_distance bits form one cluster, represented by its first member.
+    Signatures are cached by normalized URL, so an article is hashed once no
+    matter how many result lists it shows up in.
+    """
+
+    def __init__(self, max_distance: int = 10, cache_size: int = 10000):
+        self.max_distance = max_distance
+        self.band_count = max_distance + 1
+        self.cache_size = cache_size
+        self._signatures: 'OrderedDict[str, int]' = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters for monitoring
+        self.checked = 0
+        self.collapsed = 0
+        self.signature_hits = 0
+        self.signature_misses = 0
+
+    def signature(self, article: Article) -> int:
+        """Cached SimHash of the article's title (weighted double) and description."""
+        key = normalize_url(article.url) if article.url else f"{article.title}\n{article.description}"
+        with self._lock:
+            signature = self._signatures.get(key)
+            if signature is not None:
+                self._signatures.move_to_end(key)
+                self.signature_hits += 1
+                return signature
+            self.signature_misses += 1
+
+        title = OUTLET_SUFFIX.sub('', article.title)
+        signature = simhash([(title, 2), (article.description, 1)])
+        with self._lock:
+            self._signatures[key] = signature
+            while len(self._signatures) > self.cache_size:
+                self._signatures.popitem(last=False)
+        return signature
+
+    def cluster(self, articles: List[Article]) -> List[List[Article]]:
+        """Group near-duplicates, keeping the input order of first appearances."""
+        clusters: List[List[Article]] = []
+        leaders: List[int] = []
+        index: Dict[tuple, List[int]] = {}  # signature band -> clusters with that band
+
+        for article in articles:
+            signature = self.signature(article)
+            pieces = bands(signature, self.band_count)
+            match = self._find(signature, pieces, index, leaders)
+            if match is None:
+                match = len(clusters)
+                clusters.append([])
+                leaders.append(signature)
+                for piece in pieces:
+                    index.setdefault(piece, []).append(match)
+            clusters[match].append(article)
+
+        with self._lock:
+            self.checked += len(articles)
+            self.collapsed += len(articles) - len(clusters)
+        return clusters
+
+    def distinct(self, articles: List[Article], limit: Optional[int] = None) -> List[Article]:
+        """One article per story, at most limit of them."""
+        leaders = [members[0] for members in self.cluster(articles)]
+        return leaders[:limit] if limit is not None else leaders
+
+    def stats(self) -> Dict:
+        """Return how many results were checked and collapsed."""
+        with self._lock:
+            return {
+                'checked': self.checked,
+                'collapsed': self.collapsed,
+                'cached_signatures': len(self._signatures),
+                'signature_hits': self.signature_hits,
+                'signature_misses': self.signature_misses,
+            }
+
+    def _find(self, signature: int, pieces: List[tuple], index: Dict[tuple, List[int]],
+              leaders: List[int]) -> Optional[int]:
+        """The first cluster whose leader is within max_distance bits, via shared bands."""
+        candidates = sorted({cluster for piece in pieces for cluster in index.get(piece, ())})
+        for cluster in candidates:
+            if hamming_distance(signature, leaders[cluster]) <= self.max_distance:
+                return cluster
+        return None
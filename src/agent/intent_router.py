@@ -0,0 +1,119 @@
+import re
+import threading
+from typing import Dict, Optional
+from parsers import DateParser
+
+ORDINALS = {
+    'first': 1, 'second': 2, 'third': 3, 'fourth': 4, 'fifth': 5,
+    'sixth': 6, 'seventh': 7, 'eighth': 8, 'ninth': 9, 'tenth': 10,
+    '1st': 1, '2nd': 2, '3rd': 3, '4th': 4, '5th': 5,
+}
+
+# "details 2", "more on #3", "read article 4", "tell me more about the second one"
+DETAIL_PATTERN = re.compile(
+    r'^(?:please\s+)?(?:show\s+(?:me\s+)?|give\s+me\s+|read\s+|open\s+|tell\s+me\s+)?'
+    r'(?:the\s+)?(?:full\s+)?(?:details?|more|article|story|number|no\.?|#)\s*'
+    r'(?:(?:on|about|for|of)\s+)?(?:the\s+)?(?:number\s+|no\.?\s*|#|article\s+|story\s+)?'
+    r'(?P<index>\d{1,2}|' + '|'.join(ORDINALS) + r')'
+    r'(?:\s+(?:one|article|story|headline))?\s*[.!?]*\s*$',
+    re.IGNORECASE
+)
+
+NEWS_CUES = re.compile(r'\b(?:news|headlines?|updates?|stories|articles?|latest)\b', re.IGNORECASE)
+FILLER = re.compile(
+    r"\b(?:please|show\s+me|give\s+me|get\s+me|find\s+me|tell\s+me|what'?s|whats|"
+    r"any|some|the|latest|top|news|headlines?|updates?|stories|articles?|about|on|for|me)\b",
+    re.IGNORECASE
+)
+# A topic to search is a noun phrase; any of these left over after the filler
+# means the turn is a sentence (a pronoun, question word, negation, verb or a
+# bare number) and the LLM should read it
+NOT_TOPIC = re.compile(
+    r"\b(?:\d+(?:st|nd|rd|th)?|i|me|my|mine|we|us|our|you|your|he|him|his|she|her|its|their|"
+    r"what|when|where|which|whom?|whose|no|nor|never|none|nothing|more|less|enough|stop|"
+    r"am|is|are|was|were|be|been|being|do|does|did|can|will|may|might|must|shall|have|has|had|"
+    r"want|need|like|love|hate|enjoy|think|know|see|look|find|search|show|showing|get|give|"
+    r"tell|read|reading|keep|let|up|just|really|again|too|also|only|ever)\b",
+    re.IGNORECASE
+)
+# Signals that the turn needs conversational context or reasoning
+AMBIGUOUS = re.compile(
+    r"\b(?:why|how|who|should|could|would|explain|summari[sz]e|compare|opinion|"
+    r"it|that|this one|those|them|they|not|don'?t|hi|hello|hey|thanks?|thank\s+you|"
+    r"tomorrow|next)\b|\?.*\?",
+    re.IGNORECASE
+)
+
+class IntentRouter:
+    """Resolves obvious DETAIL/SEARCH turns locally so they skip the LLM round-trip."""
+    
+    def __init__(self, threshold: float = 0.7, max_topic_words: int = 4):
+        self.threshold = threshold
+        self.max_topic_words = max_topic_words
+        self.date_parser = DateParser()
+        self._lock = threading.Lock()
+        self.turns = 0
+        self.local_searches = 0
+        self.local_details = 0
+    
+    def route(self, user_input: str) -> Optional[str]:
+        """Return a SEARCH:/DETAIL: command, or None when the LLM should decide."""
+        text = ' '.join(user_input.split())
+        command = self._route_detail(text) or self._route_search(text)
+        
+        with self._lock:
+            self.turns += 1
+            if command and command.startswith('DETAIL:'):
+                self.local_details += 1
+            elif command:
+                self.local_searches += 1
+        return command
+    
+    def stats(self) -> Dict:
+        """Return counters on how many turns avoided an LLM call."""
+        with self._lock:
+            local = self.local_searches + self.local_details
+            return {
+                'turns': self.turns,
+                'local_searches': self.local_searches,
+                'local_details': self.local_details,
+                'llm_calls': self.turns - local,
+                'llm_avoided_ratio': local / self.turns if self.turns else 0.0,
+            }
+    
+    def _route_detail(self, text: str) -> Optional[str]:
+        match = DETAIL_PATTERN.match(text)
+        if not match:
+            return None
+        index = match.group('index').lower()
+        number = ORDINALS.get(index) or int(index)
+        return f"DETAIL:{number}" if number > 0 else None
+    
+    def _route_search(self, text: str) -> Optional[str]:
+        if AMBIGUOUS.search(text):
+            return None
+        
+        # Drop filler words, keep topic and date terms for NewsService to parse
+        query = ' '.join(FILLER.sub(' ', text.rstrip('?.!')).split())
+        if not query:
+            return None
+        _, to_date, topic = self.date_parser.parse(query)
+        if topic == 'general news' or to_date > self.date_parser.today:
+            return None
+        
+        if NOT_TOPIC.search(topic):
+            return None
+        
+        has_date = topic.lower() != query.lower()
+        
+        score = 0.0
+        if NEWS_CUES.search(text):
+            score += 0.5
+        if has_date:
+            score += 0.3
+        if len(topic.split()) <= self.max_topic_words:
+            score += 0.2
+        
+        if score < self.threshold:
+            return None
+        return f"SEARCH:{query}"
@@ -1,13 +1,188 @@
-from typing import List, Dict
-from config import CEREBRAS_API_KEY, SYSTEM_PROMPT
-from clients import LLMClient
+import datetime
+import threading
+from typing import List, Dict, Iterator, AsyncIterator, Optional
+from config import (CEREBRAS_API_KEY, SYSTEM_PROMPT, LLM_TEMPERATURE,
+                    LLM_MEMO_SIZE, LLM_MEMO_TTL)
+from clients import LLMClient, AsyncLLMClient, get_async_http_client
+from clients.llm_client import MODEL
+from cache import LLMResponseMemo
+from parsers import CommandStreamParser
+from agent.chat_session import estimate_tokens
+from agent.upstream import build_transport
+
+SYSTEM_PROMPT_TOKENS = estimate_tokens(SYSTEM_PROMPT)
+
+def prompt_context(hints: Optional[List[str]] = None) -> str:
+    """The small dynamic tail sent after the static system prompt."""
+    today = datetime.date.today()
+    lines = ["CURRENT CONTEXT:", f"- Current date: {today:%A, %B %d, %Y} ({today.isoformat()})"]
+    lines.extend(f"- {hint}" for hint in hints or [])
+    return "\n".join(lines)
+
+def build_llm_memo() -> Optional[LLMResponseMemo]:
+    if LLM_MEMO_SIZE <= 0:
+        return None
+    return LLMResponseMemo(LLM_MEMO_SIZE, LLM_MEMO_TTL)
+
+class PromptMetrics:
+    """Estimated prompt tokens sent, how much of it is the cacheable prefix, and memo savings."""
+    
+    def __init__(self):
+        self.calls = 0
+        self.memo_hits = 0
+        self.prompt_tokens = 0
+        self.prefix_tokens = 0
+        self.tokens_saved = 0
+    
+    def record(self, messages: List[Dict], context: str, memo_hit: bool) -> None:
+        tokens = (SYSTEM_PROMPT_TOKENS + estimate_tokens(context)
+                  + sum(estimate_tokens(m['content']) for m in messages))
+        if memo_hit:
+            self.memo_hits += 1
+            self.tokens_saved += tokens
+        else:
+            self.calls += 1
+            self.prompt_tokens += tokens
+            self.prefix_tokens += SYSTEM_PROMPT_TOKENS
+    
+    def stats(self) -> Dict:
+        return {
+            'llm_calls': self.calls,
+            'memo_hits': self.memo_hits,
+            'prompt_tokens_sent': self.prompt_tokens,
+            'static_prefix_share': self.prefix_tokens / self.prompt_tokens if self.prompt_tokens else 0.0,
+            'prompt_tokens_saved': self.tokens_saved,
+        }
 
 class LLMService:
     """Service for LLM interactions."""
     
-    def __init__(self):
-        self.llm_client = LLMClient(CEREBRAS_API_KEY)
+    def __init__(self, memo: Optional[LLMResponseMemo] = None):
+        self.llm_client = self._build_client()
+        self.memo = memo or build_llm_memo()
+        self.metrics = PromptMetrics()
+    
+    def _build_client(self) -> LLMClient:
+        return LLMClient(CEREBRAS_API_KEY, temperature=LLM_TEMPERATURE, transport=build_transport())
+    
+    def get_response(self, messages: List[Dict], hints: Optional[List[str]] = None) -> str:
+        """Get response from LLM."""
+        context = prompt_context(hints)
+        key, cached = _lookup(self.memo, messages, context)
+        self.metrics.record(messages, context, cached is not None)
+        if cached is not None:
+            return cached
+        
+        response = self.llm_client.get_response(messages, SYSTEM_PROMPT, context)
+        _remember(self.memo, key, response, finished=True)
+        return response
     
-    def get_response(self, messages: List[Dict]) -> str:
+    def stream_response(self, messages: List[Dict], hints: Optional[List[str]] = None) -> Iterator[str]:
+        """Stream response deltas from LLM."""
+        context = prompt_context(hints)
+        key, cached = _lookup(self.memo, messages, context)
+        self.metrics.record(messages, context, cached is not None)
+        if cached is not None:
+            return _replay(cached)
+        
+        stream = self.llm_client.stream_response(messages, SYSTEM_PROMPT, context)
+        return self._memoizing(key, stream) if key else stream
+    
+    def stats(self) -> Dict:
+        stats = self.metrics.stats()
+        if self.memo is not None:
+            stats['memo'] = self.memo.stats()
+        return stats
+    
+    def warm_up(self) -> None:
+        """Build the LLM client in the background, e.g. while the user types.
+        
+        Building it imports the SDK and opens a warm-up connection; a call that
+        comes first waits for that instead of building a second client.
+        """
+        threading.Thread(target=lambda: self.llm_client.client, daemon=True).start()
+    
+    def _memoizing(self, key: str, stream: Iterator[str]) -> Iterator[str]:
+        parts = []
+        finished = False
+        try:
+            for delta in stream:
+                parts.append(delta)
+                yield delta
+            finished = True
+        finally:
+            stream.close()
+            _remember(self.memo, key, ''.join(parts), finished)
+
+class AsyncLLMService(LLMService):
+    """Asyncio service for LLM interactions."""
+    
+    def _build_client(self) -> AsyncLLMClient:
+        return AsyncLLMClient(CEREBRAS_API_KEY, http_client=get_async_http_client(),
+                              temperature=LLM_TEMPERATURE, transport=build_transport())
+    
+    async def get_response(self, messages: List[Dict], hints: Optional[List[str]] = None) -> str:
         """Get response from LLM."""
-        return self.llm_client.get_response(messages, SYSTEM_PROMPT)
\ No newline at end of file
+        context = prompt_context(hints)
+        key, cached = _lookup(self.memo, messages, context)
+        self.metrics.record(messages, context, cached is not None)
+        if cached is not None:
+            return cached
+        
+        response = await self.llm_client.get_response(messages, SYSTEM_PROMPT, context)
+        _remember(self.memo, key, response, finished=True)
+        return response
+    
+    def stream_response(self, messages: List[Dict], hints: Optional[List[str]] = None) -> AsyncIterator[str]:
+        """Stream response deltas from LLM."""
+        context = prompt_context(hints)
+        key, cached = _lookup(self.memo, messages, context)
+        self.metrics.record(messages, context, cached is not None)
+        if cached is not None:
+            return _areplay(cached)
+        
+        stream = self.llm_client.stream_response(messages, SYSTEM_PROMPT, context)
+        return self._memoizing(key, stream) if key else stream
+    
+    async def _memoizing(self, key: str, stream: AsyncIterator[str]) -> AsyncIterator[str]:
+        parts = []
+        finished = False
+        try:
+            async for delta in stream:
+                parts.append(delta)
+                yield delta
+            finished = True
+        finally:
+            await stream.aclose()
+            _remember(self.memo, key, ''.join(parts), finished)
+
+def _lookup(memo: Optional[LLMResponseMemo], messages: List[Dict], context: str):
+    """Return (memo key, memoized reply); both None when memoization is off."""
+    if memo is None:
+        return None, None
+    key = memo.make_key(MODEL, SYSTEM_PROMPT, context, messages)
+    return key, memo.get(key)
+
+def _remember(memo: Optional[LLMResponseMemo], key: Optional[str], reply: str, finished: bool) -> None:
+    """Memoize a SEARCH:/DETAIL: command reply, or any finished reply at temperature 0."""
+    if key is None or not reply or reply.startswith("Error:"):
+        return
+    # Readers stop as soon as a command is complete, so that prefix is the
+    # whole answer. Conversational text is sampled (LLM_TEMPERATURE) and only
+    # kept when it is reproducible; anything else cut short is not kept.
+    parser = CommandStreamParser()
+    parser.feed(reply)
+    if finished:
+        parser.finish()
+    if parser.command is None:
+        if not finished or LLM_TEMPERATURE != 0:
+            return
+    elif not parser.is_complete:
+        return
+    memo.set(key, reply)
+
+def _replay(reply: str) -> Iterator[str]:
+    yield reply
+
+async def _areplay(reply: str) -> AsyncIterator[str]:
+    yield reply
@@ -1,70 +1,632 @@
-from typing import List, Dict, Optional
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import asyncio
+import contextvars
 import datetime
-from config import NEWSAPI_KEY
-from parsers import DateParser, QueryCleaner
-from clients import NewsAPIClient
+import functools
+import math
+import time
+from config import (NEWSAPI_KEY, NEWS_CACHE_SIZE, NEWS_CACHE_TTL,
+                    NEWS_CACHE_TODAY_TTL, NEWS_CACHE_DB, NEWS_CACHE_STALE_TTL,
+                    SEARCH_STRATEGY, NEWSAPI_RATE_LIMIT, NEWSAPI_DAILY_QUOTA,
+                    QUOTA_INTERACTIVE_RESERVE, RETRY_ATTEMPTS, RETRY_BASE_DELAY,
+                    BATCH_GROUP_SIZE, BATCH_CONCURRENCY, ARTICLE_STORE_SIZE,
+                    ARTICLE_STORE_TTL, DEDUP_MAX_DISTANCE, DEDUP_OVERFETCH,
+                    DEDUP_CACHE_SIZE, NEWS_PROVIDERS, NEWSAPI_DEADLINE, RSS_FEEDS,
+                    RSS_TTL, RSS_DEADLINE, NEWS_ARCHIVE_DB, ARCHIVE_DEADLINE)
+from parsers import DateParser
+from clients import NewsAPIClient, AsyncNewsAPIClient, get_async_http_client
 from services import ResponseFormatter
+from cache import SearchCache, ArticleStore, get_article_store, normalize_url
+from models import Article
+from telemetry import tracer
+from agent.dedup import NearDuplicateFilter
+from agent.upstream import build_transport
+from providers import NewsProvider, FanOut, NewsAPIProvider, RSSProvider, ArchiveProvider
+from providers.base import matches
+from utils import RateLimiter, get_limiter, request_priority, BACKGROUND
+
+# NewsAPI rejects longer q values
+MAX_QUERY_LENGTH = 500
+
+Topic = Tuple[str, datetime.date, datetime.date]
+
+def build_search_cache() -> SearchCache:
+    """Create the search cache configured in the environment."""
+    return SearchCache(
+        max_size=NEWS_CACHE_SIZE,
+        ttl=NEWS_CACHE_TTL,
+        today_ttl=NEWS_CACHE_TODAY_TTL,
+        db_path=NEWS_CACHE_DB,
+        stale_ttl=NEWS_CACHE_STALE_TTL
+    )
+
+def build_article_store() -> Optional[ArticleStore]:
+    """The process-wide local article index, if enabled."""
+    return get_article_store(ARTICLE_STORE_SIZE, ARTICLE_STORE_TTL, NEWS_CACHE_TODAY_TTL)
+
+def build_dedup_filter() -> Optional[NearDuplicateFilter]:
+    """The near-duplicate filter for search results, if enabled."""
+    if DEDUP_MAX_DISTANCE < 0:
+        return None
+    return NearDuplicateFilter(DEDUP_MAX_DISTANCE, DEDUP_CACHE_SIZE)
+
+def build_news_limiter() -> Optional[RateLimiter]:
+    """The process-wide NewsAPI rate limiter and quota governor, if configured."""
+    return get_limiter(
+        'newsapi',
+        rate=NEWSAPI_RATE_LIMIT,
+        burst=max(1, int(NEWSAPI_RATE_LIMIT)),
+        daily_quota=NEWSAPI_DAILY_QUOTA,
+        interactive_reserve=QUOTA_INTERACTIVE_RESERVE
+    )
+
+def build_providers(news_client: NewsAPIClient) -> List[NewsProvider]:
+    """The providers named in NEWS_PROVIDERS, in that order; NewsAPI alone by default."""
+    providers = []
+    for name in (name.strip() for name in NEWS_PROVIDERS.split(',')):
+        if name == 'newsapi':
+            providers.append(NewsAPIProvider(news_client, NEWSAPI_DEADLINE))
+        elif name == 'rss':
+            feeds = [feed.strip() for feed in RSS_FEEDS.split(',') if feed.strip()]
+            if feeds:
+                providers.append(RSSProvider(feeds, RSS_DEADLINE, RSS_TTL))
+            else:
+                print("[PROVIDER] rss is enabled but RSS_FEEDS is empty; skipping it")
+        elif name == 'archive':
+            providers.append(ArchiveProvider(NEWS_ARCHIVE_DB, ARCHIVE_DEADLINE))
+        elif name:
+            print(f"[PROVIDER] Unknown news provider '{name}' ignored")
+    return providers or [NewsAPIProvider(news_client, NEWSAPI_DEADLINE)]
+
+def plan_batch(topics: List[Topic], group_size: int) -> Tuple[List[List[Topic]], List[Topic]]:
+    """Split topics into combinable OR-groups (same date range) and ones searched alone."""
+    by_range: Dict[Tuple, List[Topic]] = {}
+    singles = []
+    for topic in topics:
+        if group_size > 1 and _combinable(topic[0]):
+            by_range.setdefault(topic[1:], []).append(topic)
+        else:
+            singles.append(topic)
+    
+    groups = []
+    for members in by_range.values():
+        group, length = [], 0
+        for topic in members:
+            added = len(topic[0]) + len(' OR ()')
+            if group and (len(group) == group_size or length + added > MAX_QUERY_LENGTH):
+                groups.append(group)
+                group, length = [], 0
+            group.append(topic)
+            length += added
+        groups.append(group)
+    
+    # A group of one is just an ordinary search
+    singles.extend(group[0] for group in groups if len(group) == 1)
+    return [group for group in groups if len(group) > 1], singles
+
+def _combinable(clean_query: str) -> bool:
+    """Plain keyword topics only; quoted phrases, operators and the catch-all stay alone."""
+    if clean_query == 'general news' or any(c in clean_query for c in '"()+-'):
+        return False
+    return not any(word in ('AND', 'OR', 'NOT') for word in clean_query.split())
+
+def _merge(*results: List[Article]) -> List[Article]:
+    """Result lists without duplicate pages, newest first like NewsAPI; earlier lists win ties."""
+    merged = {}
+    for article in (article for articles in results for article in articles):
+        merged.setdefault(normalize_url(article.url) if article.url else id(article), article)
+    return sorted(merged.values(), key=lambda article: article.published_ts, reverse=True)
+
+def _search_one(provider: NewsProvider, clean_query: str, gap: Tuple, page_size: int) -> List[Article]:
+    """A lone provider is called directly: no thread hop, and no deadline to miss."""
+    start = time.monotonic()
+    articles = provider.search(clean_query, gap[0], gap[1], page_size)
+    provider.record(time.monotonic() - start, articles)
+    return articles
+
+async def _search_one_async(provider: NewsProvider, clean_query: str, gap: Tuple,
+                            page_size: int) -> List[Article]:
+    start = time.monotonic()
+    articles = await provider.search_async(clean_query, gap[0], gap[1], page_size)
+    provider.record(time.monotonic() - start, articles)
+    return articles
+
+def _or_query(group: List[Topic]) -> str:
+    return ' OR '.join(f"({clean_query})" for clean_query, _, _ in group)
+
+def _group_page_size(group: List[Topic], limit: int) -> int:
+    return min(100, limit * len(group) * 4)
 
 class NewsService:
     """Main news service orchestrating all operations."""
     
-    def __init__(self):
-        self.news_client = NewsAPIClient(NEWSAPI_KEY)
+    def __init__(self, cache: Optional[SearchCache] = None, store: Optional[ArticleStore] = None):
+        self.cache = cache or build_search_cache()
+        self.store = store or build_article_store()
+        self.dedup = build_dedup_filter()
+        self.news_client = self._build_news_client()
+        self.providers = build_providers(self.news_client)
+        self.archive = next((p for p in self.providers if isinstance(p, ArchiveProvider)), None)
         self.date_parser = DateParser()
-        self.query_cleaner = QueryCleaner()
         self.formatter = ResponseFormatter()
+        self.search_strategy = SEARCH_STRATEGY
+        self._start_executors()
+    
+    def _build_news_client(self) -> NewsAPIClient:
+        return NewsAPIClient(NEWSAPI_KEY, cache=self.cache, limiter=build_news_limiter(),
+                             retry_attempts=RETRY_ATTEMPTS, retry_base_delay=RETRY_BASE_DELAY,
+                             transport=build_transport())
+    
+    def _start_executors(self) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix='news-search')
+        # Separate from the tier pool: tier tasks block on provider tasks
+        self._provider_executor = ThreadPoolExecutor(max_workers=3 * len(self.providers),
+                                                     thread_name_prefix='news-provider')
     
     def fetch_headlines(self, query: str, limit: int = 5, 
                        from_date: Optional[datetime.date] = None, 
-                       to_date: Optional[datetime.date] = None) -> List[Dict]:
+                       to_date: Optional[datetime.date] = None) -> List[Article]:
         """Fetch news articles for a given query with progressive fallback."""
-        try:
-            # Parse dates from query if not provided
-            if from_date is None or to_date is None:
-                parsed_from, parsed_to = self.date_parser.parse_date_query(query)
-                from_date = from_date or parsed_from
-                to_date = to_date or parsed_to
+        with tracer.span('news.fetch_headlines', query=query, strategy=self.search_strategy) as span:
+            try:
+                with tracer.span('news.parse_query'):
+                    clean_query, from_date, to_date = self._prepare_query(query, from_date, to_date)
+                
+                # Original range first, then wider fallbacks for very recent searches
+                tiers = self._search_tiers(from_date, to_date)
+                
+                if self.search_strategy == 'parallel' and len(tiers) > 1:
+                    articles = self._search_parallel(clean_query, tiers, limit)
+                else:
+                    articles = self._search_serial(clean_query, tiers, limit)
+                
+                span.set('results', len(articles))
+                return articles
+                
+            except Exception as e:
+                print(f"News Service Error: {e}")
+                span.set('error', str(e))
+                return []
+    
+    def _prepare_query(self, query: str, from_date: Optional[datetime.date],
+                       to_date: Optional[datetime.date]) -> Tuple[str, datetime.date, datetime.date]:
+        """Resolve the date range and strip date terms from the query."""
+        # One scan yields both the date range and the query without date terms
+        parsed_from, parsed_to, clean_query = self.date_parser.parse(query)
+        return clean_query, from_date or parsed_from, to_date or parsed_to
+    
+    def _search_tiers(self, from_date: datetime.date,
+                      to_date: datetime.date) -> List[Tuple[str, datetime.date, datetime.date]]:
+        """Build the progressive search ladder, narrowest range first."""
+        tiers = [('original range', from_date, to_date)]
+        today = datetime.date.today()
+        
+        # Only fall back when searching for very recent dates (today or yesterday)
+        if from_date >= (today - datetime.timedelta(days=2)):
+            tiers.append(('past week', today - datetime.timedelta(days=7), today))
+            tiers.append(('past month', today - datetime.timedelta(days=30), today))
+        return tiers
+    
+    def _search_serial(self, clean_query: str, tiers: List[Tuple], limit: int) -> List[Article]:
+        """Quota-saving strategy: try each tier only if the previous one was empty."""
+        for i, (label, _, _) in enumerate(tiers):
+            if i > 0:
+                print(f"[FALLBACK] No articles found. Searching {label}...")
             
-            # Clean the query to remove date-related terms
-            clean_query = self.query_cleaner.clean_query_from_dates(query)
+            articles = self._search_tier(clean_query, tiers[i], limit)
+            if articles:
+                if i > 0:
+                    print(f"[SUCCESS] Found {len(articles)} articles from the {label}")
+                return articles
+        return []
+    
+    def _search_tier(self, clean_query: str, tier: Tuple, limit: int) -> List[Article]:
+        """Run one fallback tier: local index first, the providers only for the days it lacks."""
+        label, tier_from, tier_to = tier
+        with tracer.span('news.tier', tier=label) as span:
+            gap, local = self._plan_local(clean_query, tier, limit, span)
+            if gap is None:
+                return local
+            fresh, complete = self._search_providers(clean_query, gap, self._page_size(limit))
+            return self._merge_fresh(clean_query, gap, fresh, local, limit, span, complete)
+    
+    def _search_providers(self, clean_query: str, gap: Tuple,
+                          page_size: int) -> Tuple[List[Article], bool]:
+        """Search every provider at once; returns the merged results and whether all answered.
+        
+        Returns when every provider has answered or missed its deadline, or as
+        soon as the answers hold page_size distinct articles.
+        """
+        if len(self.providers) == 1:
+            return _search_one(self.providers[0], clean_query, gap, page_size), True
+        
+        with tracer.span('news.providers', providers=len(self.providers)) as span:
+            fan_out = FanOut(self.providers, page_size)
+            futures = {
+                self._provider_executor.submit(contextvars.copy_context().run, provider.search,
+                                               clean_query, gap[0], gap[1], page_size): provider
+                for provider in self.providers
+            }
+            pending = list(futures)
+            while True:
+                waiting = fan_out.expire([futures[future] for future in pending])
+                pending = [future for future in pending if futures[future] in waiting]
+                if fan_out.done(waiting):
+                    break
+                done, _ = wait(pending, timeout=fan_out.timeout(waiting), return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    if future.exception() is not None:
+                        fan_out.fail(futures[future], future.exception())
+                    else:
+                        fan_out.collect(futures[future], future.result())
             
-            # First attempt: Search with original date range
-            articles = self.news_client.search_articles(clean_query, from_date, to_date, limit)
+            # Answers that come later still reach the index and archive for next time
+            for future, provider in futures.items():
+                if fan_out.unanswered(provider):
+                    future.add_done_callback(functools.partial(self._index_late, fan_out, provider))
+            return self._fanned_in(fan_out, span)
+    
+    def _fanned_in(self, fan_out: FanOut, span) -> Tuple[List[Article], bool]:
+        span.set('answered', len(fan_out.results))
+        span.set('missed', ','.join(provider.name for provider in fan_out.missed))
+        span.set('complete', fan_out.complete)
+        self._archive(fan_out.results)
+        return _merge(fan_out.articles()), fan_out.complete
+    
+    def _archive(self, results: Dict[NewsProvider, List[Article]]) -> None:
+        """Keep what the other providers found in the local archive."""
+        if self.archive is None:
+            return
+        for provider, articles in results.items():
+            if provider is not self.archive:
+                self.archive.save(articles)
+    
+    def _index_late(self, fan_out: FanOut, provider: NewsProvider, future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        articles = future.result()
+        fan_out.late(provider, articles)
+        if articles and self.store is not None:
+            self.store.add(articles)
+        self._archive({provider: articles})
+    
+    def _page_size(self, limit: int) -> int:
+        """Results to request so collapsing syndicated copies still leaves limit stories."""
+        if self.dedup is None:
+            return limit
+        return min(100, max(limit, math.ceil(limit * DEDUP_OVERFETCH)))
+    
+    def _distinct(self, articles: List[Article], limit: int, span=None) -> List[Article]:
+        """Keep one article per story, up to limit."""
+        if self.dedup is None:
+            return articles[:limit]
+        distinct = self.dedup.distinct(articles)
+        if span is not None:
+            span.set('near_duplicates', len(articles) - len(distinct))
+        if len(distinct) < len(articles):
+            print(f"[DEDUP] Collapsed {len(articles) - len(distinct)} near-duplicate articles")
+        return distinct[:limit]
+    
+    def _plan_local(self, clean_query: str, tier: Tuple, limit: int,
+                    span) -> Tuple[Optional[Tuple], List[Article]]:
+        """Local results for a tier and the date range still to search upstream (None if none)."""
+        _, tier_from, tier_to = tier
+        # Operators and the catch-all query go straight to NewsAPI
+        if self.store is None or not _combinable(clean_query):
+            return (tier_from, tier_to), []
+        
+        collapse = self.dedup.distinct if self.dedup is not None else None
+        local, gap = self.store.plan(clean_query, tier_from, tier_to, limit, collapse)
+        span.set('local_results', len(local))
+        span.set('upstream', gap is not None)
+        if gap is not None and gap != (tier_from, tier_to):
+            print(f"[INDEX] {len(local)} local results; searching only {gap[0]} to {gap[1]}")
+        elif gap is None:
+            print(f"[INDEX] Answered '{clean_query}' from {len(local)} indexed articles")
+        return gap, local
+    
+    def _merge_fresh(self, clean_query: str, gap: Tuple, fresh: List[Article], local: List[Article],
+                     limit: int, span=None, complete: bool = True) -> List[Article]:
+        """Index fresh upstream results and combine them with the local ones, one per story."""
+        if self.store is None or not _combinable(clean_query):
+            return self._distinct(fresh, limit, span)
+        if fresh:
+            self.store.add(fresh)
+            # Empty results may be a failed call, and a provider that did not answer
+            # may have had more, so neither marks days as searched
+            if complete:
+                self.store.cover(clean_query, gap[0], gap[1], fresh, self._page_size(limit))
+        return self._distinct(_merge(fresh, local), limit, span)
+    
+    def _search_parallel(self, clean_query: str, tiers: List[Tuple], limit: int) -> List[Article]:
+        """Latency-first strategy: query all tiers at once, keep the narrowest hit."""
+        # Copy the context per task so tier spans nest under the caller's span
+        futures = [
+            self._executor.submit(contextvars.copy_context().run, self._search_tier,
+                                  clean_query, tier, limit)
+            for tier in tiers
+        ]
+        
+        try:
+            # Wait in ladder order so a wider tier never wins over a narrower one
+            for i, future in enumerate(futures):
+                articles = future.result()
+                if articles:
+                    if i > 0:
+                        print(f"[SUCCESS] Found {len(articles)} articles from the {tiers[i][0]}")
+                    return articles
+            return []
+        finally:
+            # Drop tiers we no longer need; ones already in flight are discarded
+            for future in futures:
+                future.cancel()
+    
+    def fetch_headlines_batch(self, queries: List[str], limit: int = 5) -> Dict[str, List[Article]]:
+        """Fetch headlines for many topics in one pass, keyed by the original query.
+        
+        Queries are parsed once and deduplicated after cleaning. Plain topics
+        sharing a date range are combined into NewsAPI OR-queries and the results
+        split back by topic; topics a combined search did not cover, and those
+        that cannot be combined, get an ordinary search with its fallback ladder.
+        All searches run concurrently under the client's rate limiter.
+        """
+        # Batch work yields to interactive searches for rate and daily quota
+        with tracer.span('news.fetch_batch', queries=len(queries)) as span, request_priority(BACKGROUND):
+            queries_by_topic = self._batch_topics(queries)
+            groups, singles = plan_batch(list(queries_by_topic), BATCH_GROUP_SIZE)
+            span.set('topics', len(queries_by_topic))
+            span.set('combined_searches', len(groups))
             
-            # If no articles found and searching for recent dates, try progressive fallback
-            if not articles:
-                today = datetime.date.today()
+            found: Dict[Topic, List[Article]] = {}
+            with ThreadPoolExecutor(max_workers=BATCH_CONCURRENCY, thread_name_prefix='news-batch') as pool:
+                for covered in self._map(pool, self._search_group, groups, limit):
+                    found.update(covered)
                 
-                # Check if we were searching for very recent dates (today or yesterday)
-                if from_date >= (today - datetime.timedelta(days=2)):
-                    print(f"[FALLBACK] No recent articles found. Searching past week...")
-                    
-                    # Fallback 1: Search past week
-                    week_ago = today - datetime.timedelta(days=7)
-                    articles = self.news_client.search_articles(clean_query, week_ago, today, limit)
-                    
-                    if articles:
-                        print(f"[SUCCESS] Found {len(articles)} articles from the past week")
-                    else:
-                        print(f"[FALLBACK] No articles in past week. Searching past month...")
-                        
-                        # Fallback 2: Search past month
-                        month_ago = today - datetime.timedelta(days=30)
-                        articles = self.news_client.search_articles(clean_query, month_ago, today, limit)
-                        
-                        if articles:
-                            print(f"[SUCCESS] Found {len(articles)} articles from the past month")
-            
-            return articles
+                missing = [topic for topic in queries_by_topic if topic not in found]
+                span.set('single_searches', len(missing))
+                for topic, articles in zip(missing, self._map(pool, self._search_topic, missing, limit)):
+                    found[topic] = articles
             
-        except Exception as e:
-            print(f"News Service Error: {e}")
-            return []
+            return {query: found[topic]
+                    for topic, originals in queries_by_topic.items()
+                    for query in originals}
+    
+    def _batch_topics(self, queries: List[str]) -> Dict[Topic, List[str]]:
+        """Parse each query once and group the originals by cleaned topic and date range."""
+        queries_by_topic: Dict[Topic, List[str]] = {}
+        for query in queries:
+            clean_query, from_date, to_date = self._prepare_query(query, None, None)
+            topic = (' '.join(clean_query.lower().split()), from_date, to_date)
+            queries_by_topic.setdefault(topic, []).append(query)
+        return queries_by_topic
+    
+    def _map(self, pool: ThreadPoolExecutor, fn, items: List, limit: int) -> List:
+        """Run fn(item, limit) for every item on pool, keeping the caller's trace context."""
+        futures = [pool.submit(contextvars.copy_context().run, fn, item, limit) for item in items]
+        return [future.result() for future in futures]
+    
+    def _search_group(self, group: List[Topic], limit: int) -> Dict[Topic, List[Article]]:
+        """One OR-query for several topics; returns the topics it fully covered."""
+        _, from_date, to_date = group[0]
+        articles = self.news_client.search_articles(_or_query(group), from_date, to_date,
+                                                    _group_page_size(group, limit))
+        return self._split_group(group, articles, limit)
+    
+    def _split_group(self, group: List[Topic], articles: List[Article], limit: int) -> Dict[Topic, List[Article]]:
+        """Keep a combined search's articles and share them out to the topics they mention."""
+        if self.store is not None:
+            self.store.add(articles)
+        if self.archive is not None:
+            self.archive.save(articles)
+        
+        covered = {}
+        for topic in group:
+            # Whole words, so a short topic like 'ai' does not claim articles that say 'said'
+            mentioned = [article for article in articles if matches(topic[0], article)]
+            matched = self._distinct(mentioned, limit)
+            if len(matched) == limit:
+                covered[topic] = matched
+        return covered
+    
+    def _search_topic(self, topic: Topic, limit: int) -> List[Article]:
+        clean_query, from_date, to_date = topic
+        return self.fetch_headlines(clean_query, limit, from_date, to_date)
+    
+    def cache_stats(self) -> Dict:
+        """Return search cache counters for monitoring."""
+        return self.cache.stats()
+    
+    def dedup_stats(self) -> Optional[Dict]:
+        """Return near-duplicate filter counters, if enabled."""
+        return self.dedup.stats() if self.dedup is not None else None
     
-    def format_articles(self, articles: List[Dict], query: str = "") -> str:
+    def provider_stats(self) -> Dict:
+        """Return per-provider calls, results, errors, deadline misses and latency."""
+        return {provider.name: provider.stats() for provider in self.providers}
+    
+    def index_stats(self) -> Optional[Dict]:
+        """Return local article index counters, if the index is enabled."""
+        return self.store.stats() if self.store is not None else None
+    
+    def quota_stats(self) -> Optional[Dict]:
+        """Return NewsAPI rate limiter and daily quota counters, if limited."""
+        limiter = self.news_client.limiter
+        return limiter.stats() if limiter is not None else None
+    
+    def format_articles(self, articles: List[Article], query: str = "") -> str:
         """Format articles for display."""
-        return self.formatter.format_articles(articles, query)
+        with tracer.span('format.headlines', articles=len(articles)):
+            return self.formatter.format_articles(articles, query)
     
-    def format_article_detail(self, article: Dict, scraped_content: Optional[str] = None) -> str:
+    def format_article_detail(self, article: Article, scraped_content: Optional[str] = None) -> str:
         """Format single article with full details."""
-        return self.formatter.format_article_detail(article, scraped_content)
\ No newline at end of file
+        with tracer.span('format.detail'):
+            return self.formatter.format_article_detail(article, scraped_content)
+    
+    def iter_articles(self, articles: Iterable[Article], query: str = "") -> Iterator[str]:
+        """Yield the formatted article list in display-ready chunks."""
+        return self.formatter.iter_articles(articles, query)
+    
+    def iter_article_detail(self, article: Article,
+                            scraped_content: Union[str, Iterable[str], None] = None) -> Iterator[str]:
+        """Yield the formatted article detail in display-ready chunks."""
+        return self.formatter.iter_article_detail(article, scraped_content)
+
+class AsyncNewsService(NewsService):
+    """Asyncio news service; shares parsing, tiers and formatting with NewsService."""
+    
+    def _build_news_client(self) -> AsyncNewsAPIClient:
+        return AsyncNewsAPIClient(NEWSAPI_KEY, get_async_http_client(), cache=self.cache,
+                                  limiter=build_news_limiter(), retry_attempts=RETRY_ATTEMPTS,
+                                  retry_base_delay=RETRY_BASE_DELAY, transport=build_transport())
+    
+    def _start_executors(self) -> None:
+        # Tiers and providers run as tasks on the event loop
+        pass
+    
+    async def fetch_headlines(self, query: str, limit: int = 5,
+                              from_date: Optional[datetime.date] = None,
+                              to_date: Optional[datetime.date] = None) -> List[Article]:
+        """Fetch news articles for a given query with progressive fallback."""
+        with tracer.span('news.fetch_headlines', query=query, strategy=self.search_strategy) as span:
+            try:
+                with tracer.span('news.parse_query'):
+                    clean_query, from_date, to_date = self._prepare_query(query, from_date, to_date)
+                tiers = self._search_tiers(from_date, to_date)
+                
+                if self.search_strategy == 'parallel' and len(tiers) > 1:
+                    articles = await self._search_parallel(clean_query, tiers, limit)
+                else:
+                    articles = await self._search_serial(clean_query, tiers, limit)
+                
+                span.set('results', len(articles))
+                return articles
+                
+            except Exception as e:
+                print(f"News Service Error: {e}")
+                span.set('error', str(e))
+                return []
+    
+    async def _search_serial(self, clean_query: str, tiers: List[Tuple], limit: int) -> List[Article]:
+        """Quota-saving strategy: try each tier only if the previous one was empty."""
+        for i, (label, _, _) in enumerate(tiers):
+            if i > 0:
+                print(f"[FALLBACK] No articles found. Searching {label}...")
+            
+            articles = await self._search_tier(clean_query, tiers[i], limit)
+            if articles:
+                if i > 0:
+                    print(f"[SUCCESS] Found {len(articles)} articles from the {label}")
+                return articles
+        return []
+    
+    async def _search_tier(self, clean_query: str, tier: Tuple, limit: int) -> List[Article]:
+        """Run one fallback tier: local index first, the providers only for the days it lacks."""
+        label, tier_from, tier_to = tier
+        with tracer.span('news.tier', tier=label) as span:
+            gap, local = self._plan_local(clean_query, tier, limit, span)
+            if gap is None:
+                return local
+            fresh, complete = await self._search_providers(clean_query, gap, self._page_size(limit))
+            return self._merge_fresh(clean_query, gap, fresh, local, limit, span, complete)
+    
+    async def _search_providers(self, clean_query: str, gap: Tuple,
+                                page_size: int) -> Tuple[List[Article], bool]:
+        """Search every provider at once; returns the merged results and whether all answered."""
+        if len(self.providers) == 1:
+            return await _search_one_async(self.providers[0], clean_query, gap, page_size), True
+        
+        with tracer.span('news.providers', providers=len(self.providers)) as span:
+            fan_out = FanOut(self.providers, page_size)
+            tasks = {
+                asyncio.ensure_future(provider.search_async(clean_query, gap[0], gap[1], page_size)): provider
+                for provider in self.providers
+            }
+            pending = list(tasks)
+            while True:
+                waiting = fan_out.expire([tasks[task] for task in pending])
+                pending = [task for task in pending if tasks[task] in waiting]
+                if fan_out.done(waiting):
+                    break
+                done, _ = await asyncio.wait(pending, timeout=fan_out.timeout(waiting),
+                                             return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    pending.remove(task)
+                    if task.exception() is not None:
+                        fan_out.fail(tasks[task], task.exception())
+                    else:
+                        fan_out.collect(tasks[task], task.result())
+            
+            # Not cancelled: answers that come later still reach the index and archive
+            for task, provider in tasks.items():
+                if fan_out.unanswered(provider):
+                    task.add_done_callback(functools.partial(self._index_late, fan_out, provider))
+            return self._fanned_in(fan_out, span)
+    
+    async def _search_parallel(self, clean_query: str, tiers: List[Tuple], limit: int) -> List[Article]:
+        """Latency-first strategy: query all tiers at once, keep the narrowest hit."""
+        tasks = [
+            asyncio.ensure_future(self._search_tier(clean_query, tier, limit))
+            for tier in tiers
+        ]
+        
+        try:
+            for i, task in enumerate(tasks):
+                articles = await task
+                if articles:
+                    if i > 0:
+                        print(f"[SUCCESS] Found {len(articles)} articles from the {tiers[i][0]}")
+                    return articles
+            return []
+        finally:
+            # Unlike threads, in-flight requests can really be cancelled here
+            for task in tasks:
+                task.cancel()
+    
+    async def fetch_headlines_batch(self, queries: List[str], limit: int = 5) -> Dict[str, List[Article]]:
+        """Fetch headlines for many topics in one pass, keyed by the original query.
+        
+        Same plan as NewsService.fetch_headlines_batch; the searches run as
+        tasks, at most BATCH_CONCURRENCY at a time.
+        """
+        with tracer.span('news.fetch_batch', queries=len(queries)) as span, request_priority(BACKGROUND):
+            queries_by_topic = self._batch_topics(queries)
+            groups, singles = plan_batch(list(queries_by_topic), BATCH_GROUP_SIZE)
+            span.set('topics', len(queries_by_topic))
+            span.set('combined_searches', len(groups))
+            
+            found: Dict[Topic, List[Article]] = {}
+            for covered in await self._map(self._search_group, groups, limit):
+                found.update(covered)
+            
+            missing = [topic for topic in queries_by_topic if topic not in found]
+            span.set('single_searches', len(missing))
+            for topic, articles in zip(missing, await self._map(self._search_topic, missing, limit)):
+                found[topic] = articles
+            
+            return {query: found[topic]
+                    for topic, originals in queries_by_topic.items()
+                    for query in originals}
+    
+    async def _map(self, fn, items: List, limit: int) -> List:
+        """Await fn(item, limit) for every item, at most BATCH_CONCURRENCY at once."""
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+        
+        async def run(item):
+            async with semaphore:
+                return await fn(item, limit)
+        
+        return await asyncio.gather(*(run(item) for item in items))
+    
+    async def _search_group(self, group: List[Topic], limit: int) -> Dict[Topic, List[Article]]:
+        """One OR-query for several topics; returns the topics it fully covered."""
+        _, from_date, to_date = group[0]
+        articles = await self.news_client.search_articles(_or_query(group), from_date, to_date,
+                                                          _group_page_size(group, limit))
+        return self._split_group(group, articles, limit)
+    
+    async def _search_topic(self, topic: Topic, limit: int) -> List[Article]:
+        clean_query, from_date, to_date = topic
+        return await self.fetch_headlines(clean_query, limit, from_date, to_date)
@@ -0,0 +1,153 @@
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future, CancelledError
+from typing import Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+from models import Article
+
+class ArticlePrefetcher:
+    """Scrapes top search results in the background so details are served instantly."""
+    
+    def __init__(self, scrape_fn: Callable[[str], Optional[str]], max_workers: int = 4,
+                 per_domain_limit: int = 2, max_entries: int = 50):
+        self.scrape_fn = scrape_fn
+        self.per_domain_limit = per_domain_limit
+        self.max_entries = max_entries
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='prefetch')
+        self._lock = threading.Lock()
+        self._domain_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._content = OrderedDict()  # url -> cleaned markdown
+        self._pending: Dict[str, Future] = {}
+        self._generation = 0
+    
+    def prefetch(self, articles: List[Article], top_k: int = 3) -> None:
+        """Start scraping the top-K article URLs, cancelling any previous batch."""
+        self.cancel()
+        with self._lock:
+            generation = self._generation
+            for article in articles[:top_k]:
+                url = article.url
+                if not url or url in self._content or url in self._pending:
+                    continue
+                self._pending[url] = self._executor.submit(self._fetch, url, generation)
+    
+    def get(self, url: str) -> Optional[str]:
+        """Return prefetched content, waiting for an in-flight scrape of the same URL."""
+        with self._lock:
+            if url in self._content:
+                self._content.move_to_end(url)
+                return self._content[url]
+            future = self._pending.get(url)
+        
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except CancelledError:
+            return None
+    
+    def cancel(self) -> None:
+        """Abandon the current batch, e.g. when the user starts a new search."""
+        with self._lock:
+            self._generation += 1
+            for future in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+    
+    def shutdown(self) -> None:
+        """Stop background workers without waiting for running scrapes."""
+        self.cancel()
+        self._executor.shutdown(wait=False)
+    
+    def _fetch(self, url: str, generation: int) -> Optional[str]:
+        """Worker: scrape one URL under its domain's concurrency limit."""
+        with self._domain_slot(url):
+            # The batch may have been cancelled while we waited for a slot
+            if generation != self._generation:
+                return None
+            content = self.scrape_fn(url)
+        
+        with self._lock:
+            if self._pending.get(url) is not None and generation == self._generation:
+                del self._pending[url]
+            if content:
+                self._content[url] = content
+                self._content.move_to_end(url)
+                while len(self._content) > self.max_entries:
+                    self._content.popitem(last=False)
+        return content
+    
+    def _domain_slot(self, url: str) -> threading.BoundedSemaphore:
+        domain = urlparse(url).netloc.lower()
+        with self._lock:
+            slot = self._domain_slots.get(domain)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.per_domain_limit)
+                self._domain_slots[domain] = slot
+            return slot
+
+class AsyncArticlePrefetcher:
+    """ArticlePrefetcher for the event loop, with the scrapes run as tasks.
+    
+    The server shares one prefetcher between many sessions, so a new batch
+    does not cancel earlier ones; max_workers bounds the scrapes in flight
+    across all of them.
+    """
+    
+    def __init__(self, scrape_fn: Callable[[str], Awaitable[Optional[str]]], max_workers: int = 4,
+                 per_domain_limit: int = 2, max_entries: int = 50):
+        self.scrape_fn = scrape_fn
+        self.per_domain_limit = per_domain_limit
+        self.max_entries = max_entries
+        self._slots = asyncio.Semaphore(max_workers)
+        self._domain_slots: Dict[str, asyncio.Semaphore] = {}
+        self._content = OrderedDict()  # url -> cleaned markdown
+        self._pending: Dict[str, asyncio.Task] = {}
+    
+    def prefetch(self, articles: List[Article], top_k: int = 3) -> None:
+        """Start scraping the top-K article URLs in the background."""
+        for article in articles[:top_k]:
+            url = article.url
+            if not url or url in self._content or url in self._pending:
+                continue
+            self._pending[url] = asyncio.create_task(self._fetch(url))
+    
+    async def get(self, url: str) -> Optional[str]:
+        """Return prefetched content, waiting for an in-flight scrape of the same URL."""
+        if url in self._content:
+            self._content.move_to_end(url)
+            return self._content[url]
+        task = self._pending.get(url)
+        if task is None:
+            return None
+        try:
+            # Shielded so a caller giving up does not abandon the prefetch
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if task.cancelled():
+                return None
+            raise
+    
+    def cancel(self) -> None:
+        """Abandon every prefetch in flight."""
+        for task in self._pending.values():
+            task.cancel()
+        self._pending.clear()
+    
+    def shutdown(self) -> None:
+        self.cancel()
+    
+    async def _fetch(self, url: str) -> Optional[str]:
+        domain = urlparse(url).netloc.lower()
+        slot = self._domain_slots.setdefault(domain, asyncio.Semaphore(self.per_domain_limit))
+        async with self._slots, slot:
+            content = await self.scrape_fn(url)
+        
+        self._pending.pop(url, None)
+        if content:
+            self._content[url] = content
+            self._content.move_to_end(url)
+            while len(self._content) > self.max_entries:
+                self._content.popitem(last=False)
+        return content
@@ -1,23 +1,219 @@
-from typing import Optional, Dict
-from config import FIRECRAWL_API_KEY
-from clients import ScraperClient
+import asyncio
+import atexit
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeout
+from typing import AsyncIterator, Dict, Iterator, Optional, List, Tuple
+from config import (FIRECRAWL_API_KEY, PREFETCH_ENABLED, PREFETCH_TOP_K,
+                    PREFETCH_WORKERS, PREFETCH_PER_DOMAIN, SCRAPE_CACHE_DB,
+                    SCRAPE_CACHE_MAX_MB, SCRAPE_CACHE_MAX_AGE, FIRECRAWL_RATE_LIMIT,
+                    FIRECRAWL_DAILY_QUOTA, QUOTA_INTERACTIVE_RESERVE, RETRY_ATTEMPTS,
+                    RETRY_BASE_DELAY, CLEANER_PROFILES, ARTICLE_STORE_SIZE,
+                    ARTICLE_STORE_TTL, NEWS_CACHE_TODAY_TTL, SCRAPE_TIMEOUT,
+                    SCRAPE_TIMEOUT_MIN, SCRAPE_TIMEOUT_MAX, SCRAPE_HEDGE,
+                    SCRAPE_BREAKER_FAILURES, SCRAPE_BREAKER_RESET, SCRAPE_FALLBACK_AFTER)
+from clients import ScraperClient, AsyncScraperClient, DirectScraper
 from services import ResponseFormatter
+from cache import ScrapeCache, get_article_store
+from models import Article
+from parsers import ContentCleaner
+from agent.prefetcher import ArticlePrefetcher, AsyncArticlePrefetcher
+from agent.upstream import build_transport
+from telemetry import tracer
+from utils import (RateLimiter, get_limiter, request_priority, BACKGROUND, AdaptiveTimeouts,
+                   CircuitBreaker)
+
+def build_scrape_cache() -> Optional[ScrapeCache]:
+    """Create the on-disk scrape cache if one is configured."""
+    if not SCRAPE_CACHE_DB:
+        return None
+    cache = ScrapeCache(
+        SCRAPE_CACHE_DB,
+        max_bytes=SCRAPE_CACHE_MAX_MB * 1024 * 1024,
+        max_age=SCRAPE_CACHE_MAX_AGE
+    )
+    # Reads batch their last-access updates; write what is left on exit
+    atexit.register(cache.flush)
+    return cache
+
+def build_scrape_limiter() -> Optional[RateLimiter]:
+    """The process-wide Firecrawl rate limiter and quota governor, if configured."""
+    return get_limiter(
+        'firecrawl',
+        rate=FIRECRAWL_RATE_LIMIT,
+        burst=max(1, int(FIRECRAWL_RATE_LIMIT)),
+        daily_quota=FIRECRAWL_DAILY_QUOTA,
+        interactive_reserve=QUOTA_INTERACTIVE_RESERVE
+    )
+
+def build_content_cleaner() -> ContentCleaner:
+    """The content cleaner with any configured per-domain profiles added."""
+    cleaner = ContentCleaner()
+    if CLEANER_PROFILES:
+        try:
+            cleaner.load_profiles(CLEANER_PROFILES)
+        except (OSError, ValueError, TypeError) as e:
+            print(f"[ERROR] Could not load cleaning profiles: {e}")
+    return cleaner
+
+def build_scrape_controls() -> Dict:
+    """Adaptive deadlines, circuit breaker, hedger and transport keyword arguments for a scraper client."""
+    transport = build_transport()
+    # A replayed run must stay offline, and the direct fetch bypasses the transport
+    hedge = SCRAPE_HEDGE and transport.mode != 'replay'
+    return {
+        'timeouts': AdaptiveTimeouts(default=SCRAPE_TIMEOUT, minimum=SCRAPE_TIMEOUT_MIN,
+                                     maximum=SCRAPE_TIMEOUT_MAX),
+        'breaker': CircuitBreaker(failure_threshold=SCRAPE_BREAKER_FAILURES,
+                                  reset_timeout=SCRAPE_BREAKER_RESET),
+        'hedger': DirectScraper() if hedge else None,
+        'transport': transport,
+    }
 
 class ScraperService:
     """Service for web scraping operations."""
     
-    def __init__(self):
-        self.scraper_client = ScraperClient(FIRECRAWL_API_KEY)
+    def __init__(self, cache: Optional[ScrapeCache] = None):
+        self.cache = cache or build_scrape_cache()
+        self.scraper_client = self._build_scraper_client()
         self.formatter = ResponseFormatter()
+        # Scraped text makes indexed articles findable by their full content
+        self.store = get_article_store(ARTICLE_STORE_SIZE, ARTICLE_STORE_TTL, NEWS_CACHE_TODAY_TTL)
+        self.prefetcher = self._build_prefetcher() if PREFETCH_ENABLED else None
+        self._start_executors()
+    
+    def _build_scraper_client(self) -> ScraperClient:
+        return ScraperClient(FIRECRAWL_API_KEY, cache=self.cache, limiter=build_scrape_limiter(),
+                             retry_attempts=RETRY_ATTEMPTS, retry_base_delay=RETRY_BASE_DELAY,
+                             cleaner=build_content_cleaner(), **build_scrape_controls())
+    
+    def _build_prefetcher(self) -> ArticlePrefetcher:
+        return ArticlePrefetcher(self._prefetch_scrape, max_workers=PREFETCH_WORKERS,
+                                 per_domain_limit=PREFETCH_PER_DOMAIN)
+    
+    def _start_executors(self) -> None:
+        # Runs the scrape behind iter_article while the fallback is on screen
+        self._detail_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='scrape-detail')
+    
+    def prefetch(self, articles: List[Article]) -> None:
+        """Start scraping the top search results in the background, if enabled."""
+        if self.prefetcher is not None:
+            self.prefetcher.prefetch(articles, top_k=PREFETCH_TOP_K)
     
-    def scrape_article(self, url: str, fallback_article: Optional[Dict] = None) -> str:
+    def _prefetch_scrape(self, url: str) -> Optional[str]:
+        """Speculative scrapes yield to interactive ones for rate and daily quota."""
+        with request_priority(BACKGROUND):
+            return self.scraper_client.scrape_url(url)
+    
+    def cancel_prefetch(self) -> None:
+        """Abandon background scrapes from the previous search."""
+        if self.prefetcher is not None:
+            self.prefetcher.cancel()
+    
+    def scrape_article(self, url: str, fallback_article: Optional[Article] = None) -> str:
         """Scrape full article content from URL with fallback."""
-        # Try to scrape content
-        scraped_content = self.scraper_client.scrape_url(url)
-        
+        scraped_content = self._scrape(url, fallback_article)
         if scraped_content:
             return scraped_content
         else:
             # Return fallback content if scraping fails
             print(f"[FALLBACK] Using article details instead of scraped content")
-            return self.formatter.get_fallback_content(fallback_article)
\ No newline at end of file
+            return self.formatter.get_fallback_content(fallback_article)
+    
+    def iter_article(self, url: str, fallback_article: Optional[Article] = None,
+                     fallback_after: float = SCRAPE_FALLBACK_AFTER) -> Iterator[Tuple[Optional[str], bool]]:
+        """Yield (content, loading) pairs for an article, showing something quickly.
+        
+        A scrape done within fallback_after seconds yields its content (or the
+        fallback) once with loading False. A slower one first yields the
+        fallback with loading True, then the scraped content, or None if the
+        scrape failed and the fallback is all there is.
+        """
+        future = self._detail_executor.submit(contextvars.copy_context().run, self._scrape,
+                                              url, fallback_article)
+        try:
+            scraped_content = future.result(timeout=fallback_after)
+        except FuturesTimeout:
+            print(f"[FALLBACK] Showing article details while the scrape finishes")
+            yield self.formatter.get_fallback_content(fallback_article), True
+            yield future.result(), False
+            return
+        yield scraped_content or self.formatter.get_fallback_content(fallback_article), False
+    
+    def _scrape(self, url: str, fallback_article: Optional[Article]) -> Optional[str]:
+        """Prefetched or freshly scraped content for url, indexed for search; None on failure."""
+        scraped_content = None
+        if self.prefetcher is not None:
+            with tracer.span('scrape.prefetch_lookup') as span:
+                scraped_content = self.prefetcher.get(url)
+                span.set('hit', bool(scraped_content))
+        
+        # Try to scrape content
+        if not scraped_content:
+            published_at = fallback_article.published_iso if fallback_article else None
+            scraped_content = self.scraper_client.scrape_url(url, published_at=published_at)
+        
+        if scraped_content and self.store is not None:
+            self.store.add_content(url, scraped_content)
+        return scraped_content
+    
+    def scrape_stats(self) -> Dict:
+        return self.scraper_client.scrape_stats()
+
+class AsyncScraperService(ScraperService):
+    """Asyncio service for web scraping operations; shares setup and formatting with ScraperService."""
+    
+    def _build_scraper_client(self) -> AsyncScraperClient:
+        return AsyncScraperClient(FIRECRAWL_API_KEY, cache=self.cache, limiter=build_scrape_limiter(),
+                                  retry_attempts=RETRY_ATTEMPTS, retry_base_delay=RETRY_BASE_DELAY,
+                                  cleaner=build_content_cleaner(), **build_scrape_controls())
+    
+    def _build_prefetcher(self) -> AsyncArticlePrefetcher:
+        return AsyncArticlePrefetcher(self._prefetch_scrape, max_workers=PREFETCH_WORKERS,
+                                      per_domain_limit=PREFETCH_PER_DOMAIN)
+    
+    def _start_executors(self) -> None:
+        # iter_article runs the scrape as a task on the event loop
+        pass
+    
+    async def _prefetch_scrape(self, url: str) -> Optional[str]:
+        """Speculative scrapes yield to interactive ones for rate and daily quota."""
+        with request_priority(BACKGROUND):
+            return await self.scraper_client.scrape_url(url)
+    
+    async def scrape_article(self, url: str, fallback_article: Optional[Article] = None) -> str:
+        """Scrape full article content from URL with fallback."""
+        scraped_content = await self._scrape(url, fallback_article)
+        if scraped_content:
+            return scraped_content
+        print(f"[FALLBACK] Using article details instead of scraped content")
+        return self.formatter.get_fallback_content(fallback_article)
+    
+    async def iter_article(self, url: str, fallback_article: Optional[Article] = None,
+                           fallback_after: float = SCRAPE_FALLBACK_AFTER
+                           ) -> AsyncIterator[Tuple[Optional[str], bool]]:
+        """Yield (content, loading) pairs as ScraperService.iter_article does."""
+        task = asyncio.ensure_future(self._scrape(url, fallback_article))
+        done, _ = await asyncio.wait({task}, timeout=fallback_after)
+        if not done:
+            print(f"[FALLBACK] Showing article details while the scrape finishes")
+            yield self.formatter.get_fallback_content(fallback_article), True
+            yield await task, False
+            return
+        yield task.result() or self.formatter.get_fallback_content(fallback_article), False
+    
+    async def _scrape(self, url: str, fallback_article: Optional[Article]) -> Optional[str]:
+        """Prefetched or freshly scraped content for url, indexed for search; None on failure."""
+        scraped_content = None
+        if self.prefetcher is not None:
+            with tracer.span('scrape.prefetch_lookup') as span:
+                scraped_content = await self.prefetcher.get(url)
+                span.set('hit', bool(scraped_content))
+        
+        if not scraped_content:
+            published_at = fallback_article.published_iso if fallback_article else None
+            scraped_content = await self.scraper_client.scrape_url(url, published_at=published_at)
+        
+        if scraped_content and self.store is not None:
+            self.store.add_content(url, scraped_content)
+        return scraped_content
@@ -0,0 +1,64 @@
+import asyncio
+import time
+import uuid
+from typing import Dict, Optional, Tuple
+from agent.chat_session import ChatSession
+
+class SessionManager:
+    """Holds many ChatSession instances keyed by session id and evicts idle ones."""
+    
+    def __init__(self, idle_timeout: float = 1800, max_sessions: int = 10000, id_prefix: str = ''):
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        # Lets a multi-worker server tell from an id which worker holds the session
+        self.id_prefix = id_prefix
+        self._sessions: Dict[str, Tuple[ChatSession, asyncio.Lock]] = {}
+        self._last_seen: Dict[str, float] = {}
+        self.created = 0
+        self.evicted = 0
+    
+    def create(self) -> str:
+        """Start a new session and return its id."""
+        if len(self._sessions) >= self.max_sessions:
+            self._evict_oldest()
+        session_id = self.id_prefix + uuid.uuid4().hex
+        self._sessions[session_id] = (ChatSession(), asyncio.Lock())
+        self._last_seen[session_id] = time.monotonic()
+        self.created += 1
+        return session_id
+    
+    def get(self, session_id: str) -> Optional[Tuple[ChatSession, asyncio.Lock]]:
+        """Return the session and its turn lock, or None if unknown or evicted."""
+        entry = self._sessions.get(session_id)
+        if entry is not None:
+            self._last_seen[session_id] = time.monotonic()
+        return entry
+    
+    def remove(self, session_id: str) -> Optional[ChatSession]:
+        """Drop a session explicitly, e.g. when the client says goodbye."""
+        self._last_seen.pop(session_id, None)
+        entry = self._sessions.pop(session_id, None)
+        return entry[0] if entry else None
+    
+    def evict_idle(self) -> int:
+        """Remove sessions idle for longer than idle_timeout; returns how many."""
+        cutoff = time.monotonic() - self.idle_timeout
+        idle = [sid for sid, seen in self._last_seen.items()
+                if seen < cutoff and not self._sessions[sid][1].locked()]
+        for session_id in idle:
+            self.remove(session_id)
+        self.evicted += len(idle)
+        return len(idle)
+    
+    def stats(self) -> Dict:
+        return {
+            'active': len(self._sessions),
+            'created': self.created,
+            'evicted': self.evicted,
+            'max_sessions': self.max_sessions,
+        }
+    
+    def _evict_oldest(self) -> None:
+        oldest = min(self._last_seen, key=self._last_seen.get)
+        self.remove(oldest)
+        self.evicted += 1
@@ -0,0 +1,23 @@
+import os
+from config import (UPSTREAM_MODE, UPSTREAM_CASSETTE, UPSTREAM_LATENCY, UPSTREAM_JITTER,
+                    UPSTREAM_ERROR_RATE, UPSTREAM_SEED, CEREBRAS_BASE_URL, NEWSAPI_BASE_URL,
+                    FIRECRAWL_API_URL)
+from transport import FaultInjector, Transport, get_transport
+from transport.transport import MODES
+from transport.wire import SERVICES
+
+def build_transport() -> Transport:
+    """The process-wide upstream transport configured in the environment."""
+    mode = UPSTREAM_MODE
+    if mode not in MODES:
+        print(f"[ERROR] Unknown UPSTREAM_MODE '{mode}', using live upstreams")
+        mode = 'live'
+    if mode == 'replay' and not os.path.exists(UPSTREAM_CASSETTE):
+        print(f"[ERROR] Cassette {UPSTREAM_CASSETTE} not found; every upstream call will miss")
+    # Seeded separately so one service's call count does not shift another's faults
+    faults = {service: FaultInjector(UPSTREAM_LATENCY, UPSTREAM_JITTER, UPSTREAM_ERROR_RATE,
+                                     seed=UPSTREAM_SEED + i)
+              for i, service in enumerate(SERVICES)}
+    base_urls = {'cerebras': CEREBRAS_BASE_URL, 'newsapi': NEWSAPI_BASE_URL,
+                 'firecrawl': FIRECRAWL_API_URL}
+    return get_transport(mode, UPSTREAM_CASSETTE, faults, base_urls)
@@ -0,0 +1,7 @@
+from .search_cache import SearchCache
+from .scrape_cache import ScrapeCache, normalize_url
+from .llm_memo import LLMResponseMemo
+from .article_store import ArticleStore, get_article_store
+
+__all__ = ['SearchCache', 'ScrapeCache', 'normalize_url', 'LLMResponseMemo',
+           'ArticleStore', 'get_article_store']
@@ -0,0 +1,293 @@
+import datetime
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from models import Article
+from .scrape_cache import normalize_url
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+STOP_WORDS = frozenset(['a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has',
+                        'in', 'is', 'it', 'its', 'of', 'on', 'or', 'that', 'the', 'to', 'was',
+                        'were', 'will', 'with'])
+
+# BM25 parameters; titles count twice so headline matches rank first
+K1 = 1.2
+B = 0.75
+TITLE_WEIGHT = 2
+
+DateRange = Tuple[datetime.date, datetime.date]
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase word tokens without stop words."""
+    if not text:
+        return []
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+class _Entry:
+    __slots__ = ('article', 'published', 'terms', 'length', 'fetched_at')
+    
+    def __init__(self, article: Article, fetched_at: float):
+        self.article = article
+        self.published = article.published_date
+        self.terms: Dict[str, int] = {}
+        for token in tokenize(article.title) * TITLE_WEIGHT + tokenize(article.description) \
+                + tokenize(article.content):
+            self.terms[token] = self.terms.get(token, 0) + 1
+        self.length = sum(self.terms.values())
+        self.fetched_at = fetched_at
+
+class ArticleStore:
+    """In-process BM25 index over recently fetched articles, deduplicated by normalized URL.
+
+    Articles are indexed on title, description and any scraped content, and
+    drop out ttl seconds after they were last fetched. The store also remembers
+    which date ranges each query has already been searched upstream, so a
+    search only needs NewsAPI for the days nobody has asked about yet.
+    """
+    
+    def __init__(self, max_size: int = 5000, ttl: int = 3600, today_ttl: int = 300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.today_ttl = today_ttl
+        self._entries: 'OrderedDict[str, _Entry]' = OrderedDict()  # oldest fetch first
+        self._postings: Dict[str, Dict[str, int]] = {}  # term -> {url key: term frequency}
+        self._total_length = 0
+        self._coverage: Dict[str, List[Tuple]] = {}  # query -> [(from, to, expires_at, url keys)]
+        self._lock = threading.Lock()
+        
+        # Counters for monitoring
+        self.plans = 0
+        self.answered_locally = 0
+        self.narrowed = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        return ' '.join(query.lower().split())
+    
+    def add(self, articles: Iterable[Article]) -> None:
+        """Index articles, replacing earlier copies of the same page."""
+        now = time.time()
+        with self._lock:
+            for article in articles:
+                if not article.url:
+                    continue
+                key = normalize_url(article.url)
+                previous = self._entries.get(key)
+                if previous is not None and previous.article.content and not article.content:
+                    article = article.with_content(previous.article.content)
+                self._put(key, _Entry(article, now))
+            self._evict(now)
+    
+    def add_content(self, url: str, content: str) -> None:
+        """Index scraped content for an article already in the store."""
+        key = normalize_url(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not content:
+                return
+            article = entry.article.with_content(content)
+            self._put(key, _Entry(article, entry.fetched_at), refresh=False)
+    
+    def search(self, query: str, from_date: datetime.date, to_date: datetime.date,
+               limit: int) -> List[Article]:
+        """Best BM25 matches containing every query term, published within the range."""
+        with self._lock:
+            found = self._search(query, from_date, to_date, limit, time.time())
+            return [entry.article for entry in found]
+    
+    def plan(self, query: str, from_date: datetime.date, to_date: datetime.date, limit: int,
+             collapse: Optional[Callable[[List[Article]], List[Article]]] = None
+             ) -> Tuple[List[Article], Optional[DateRange]]:
+        """Local matches for a search, plus the date range NewsAPI still has to cover.
+
+        Local matches are the articles earlier upstream searches for the same
+        query returned, then BM25 matches. The range is None when they are
+        enough: either there are limit of them, or every day in the range was
+        already searched upstream. Otherwise it spans the days not yet searched.
+        collapse, if given, removes near-duplicates before the matches are counted.
+        """
+        now = time.time()
+        with self._lock:
+            self.plans += 1
+            spans = self._live_coverage(query, now)
+            found = {}
+            for entry in self._covered(spans, from_date, to_date, now):
+                found.setdefault(normalize_url(entry.article.url), entry)
+            candidates = 2 * limit if collapse is not None else limit
+            for entry in self._search(query, from_date, to_date, candidates, now):
+                found.setdefault(normalize_url(entry.article.url), entry)
+            local = [entry.article for entry in found.values()]
+            local = (collapse(local) if collapse is not None else local)[:limit]
+            
+            gaps = [] if len(local) >= limit else self._gaps(spans, from_date, to_date)
+            if not gaps:
+                self.answered_locally += 1
+                return local, None
+            
+            # One upstream call over the outermost gap days, never several
+            gap = (gaps[0][0], gaps[-1][1])
+            if gap != (from_date, to_date):
+                self.narrowed += 1
+            return local, gap
+    
+    def cover(self, query: str, from_date: datetime.date, to_date: datetime.date,
+              articles: List[Article], page_size: int) -> None:
+        """Record an upstream search (after add()) so its days are not searched again for a while."""
+        keys = tuple(normalize_url(article.url) for article in articles if article.url)
+        if len(articles) >= page_size:
+            # A full page sorted by publishedAt may have missed older articles,
+            # so only the days after the oldest result are known to be complete
+            oldest = min((a.published_date for a in articles if a.published_at), default=to_date)
+            from_date = max(from_date, oldest + datetime.timedelta(days=1))
+        if from_date > to_date:
+            return
+        
+        now = time.time()
+        expires_at = now + (self.today_ttl if to_date >= datetime.date.today() else self.ttl)
+        key = self.normalize_query(query)
+        with self._lock:
+            spans = self._live_coverage(query, now)
+            spans.append((from_date, to_date, expires_at, keys))
+            self._coverage[key] = spans
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._postings.clear()
+            self._coverage.clear()
+            self._total_length = 0
+    
+    def stats(self) -> Dict:
+        """Return index size and how often searches were answered or narrowed locally."""
+        with self._lock:
+            return {
+                'articles': len(self._entries),
+                'max_size': self.max_size,
+                'terms': len(self._postings),
+                'covered_queries': len(self._coverage),
+                'plans': self.plans,
+                'answered_locally': self.answered_locally,
+                'narrowed': self.narrowed,
+                'evictions': self.evictions,
+            }
+    
+    def _search(self, query: str, from_date: datetime.date, to_date: datetime.date,
+                limit: int, now: float) -> List[_Entry]:
+        """Top BM25 entries that contain every query term and were published in range."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self._entries:
+            return []
+        postings = [self._postings.get(term) for term in terms]
+        if not all(postings):
+            return []
+        
+        # Walk the rarest term's postings; every other term must appear too
+        order = sorted(range(len(terms)), key=lambda i: len(postings[i]))
+        count = len(self._entries)
+        average_length = self._total_length / count
+        idf = [math.log(1 + (count - len(p) + 0.5) / (len(p) + 0.5)) for p in postings]
+        
+        scored = []
+        for key in postings[order[0]]:
+            entry = self._entries[key]
+            if not self._live(entry, from_date, to_date, now):
+                continue
+            if not all(key in postings[i] for i in order[1:]):
+                continue
+            norm = K1 * (1 - B + B * entry.length / average_length)
+            score = sum(idf[i] * postings[i][key] * (K1 + 1) / (postings[i][key] + norm)
+                        for i in range(len(terms)))
+            scored.append((score, entry.article.published_ts, entry))
+        
+        scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        return [entry for _, _, entry in scored[:limit]]
+    
+    def _live(self, entry: _Entry, from_date: datetime.date, to_date: datetime.date,
+              now: float) -> bool:
+        return (entry.fetched_at + self.ttl > now and entry.published is not None
+                and from_date <= entry.published <= to_date)
+    
+    def _live_coverage(self, query: str, now: float) -> List[Tuple]:
+        return [span for span in self._coverage.get(self.normalize_query(query), []) if span[2] > now]
+    
+    def _covered(self, spans: List[Tuple], from_date: datetime.date, to_date: datetime.date,
+                 now: float) -> List[_Entry]:
+        """Articles earlier upstream searches returned for the query, newest first."""
+        entries = {}
+        for start, end, _, keys in spans:
+            # Results of a search inside the range belong to it whatever their timestamps say
+            inside = from_date <= start and end <= to_date
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None or entry.fetched_at + self.ttl <= now:
+                    continue
+                if inside or self._live(entry, from_date, to_date, now):
+                    entries[key] = entry
+        return sorted(entries.values(), key=lambda entry: entry.article.published_ts, reverse=True)
+    
+    def _gaps(self, spans: List[Tuple], from_date: datetime.date,
+              to_date: datetime.date) -> List[DateRange]:
+        """Sub-ranges of the requested days no live coverage record spans."""
+        day = datetime.timedelta(days=1)
+        gaps, cursor = [], from_date
+        for start, end, _, _ in sorted(spans, key=lambda span: span[:2]):
+            if cursor > to_date or start > to_date:
+                break
+            if end < cursor:
+                continue
+            if start > cursor:
+                gaps.append((cursor, start - day))
+            cursor = max(cursor, end + day)
+        if cursor <= to_date:
+            gaps.append((cursor, to_date))
+        return gaps
+    
+    def _put(self, key: str, entry: _Entry, refresh: bool = True) -> None:
+        """Index entry under key; refresh moves it to the newest end of the eviction order."""
+        self._unindex(key)
+        self._entries[key] = entry
+        if refresh:
+            self._entries.move_to_end(key)
+        for term, frequency in entry.terms.items():
+            self._postings.setdefault(term, {})[key] = frequency
+        self._total_length += entry.length
+    
+    def _unindex(self, key: str) -> None:
+        """Remove key's postings; the entry itself stays until replaced or popped."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        for term in entry.terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= entry.length
+    
+    def _evict(self, now: float) -> None:
+        """Drop articles past their TTL and the oldest ones over capacity."""
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if len(self._entries) <= self.max_size and entry.fetched_at + self.ttl > now:
+                break
+            self._unindex(key)
+            del self._entries[key]
+            self.evictions += 1
+
+_shared: Optional[ArticleStore] = None
+_shared_lock = threading.Lock()
+
+def get_article_store(max_size: int, ttl: int, today_ttl: int) -> Optional[ArticleStore]:
+    """The process-wide store shared by news search and scraping; None when disabled."""
+    global _shared
+    if max_size <= 0:
+        return None
+    with _shared_lock:
+        if _shared is None:
+            _shared = ArticleStore(max_size, ttl, today_ttl)
+        return _shared
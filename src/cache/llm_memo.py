@@ -0,0 +1,66 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Optional
+
+class LLMResponseMemo:
+    """Bounded LRU memo of LLM replies that are safe to reuse for an identical prompt."""
+    
+    def __init__(self, max_size: int = 512, ttl: int = 3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, reply)
+        self._lock = threading.Lock()
+        
+        # Counters for monitoring
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def make_key(model: str, system_prompt: str, context: Optional[str],
+                 messages: List[Dict]) -> str:
+        """Key on the normalized latest prompt plus a hash of everything before it."""
+        prompt = ''
+        history = messages
+        if messages and messages[-1]['role'] == 'user':
+            prompt = ' '.join(messages[-1]['content'].lower().split())
+            history = messages[:-1]
+        
+        digest = hashlib.sha256()
+        for part in (model, system_prompt, context or ''):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        digest.update(json.dumps([(m['role'], m['content']) for m in history]).encode('utf-8'))
+        return f"{prompt}|{digest.hexdigest()}"
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the memoized reply for key, or None on miss/expiry."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def set(self, key: str, reply: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, reply)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
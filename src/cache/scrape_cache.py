@@ -0,0 +1,183 @@
+import hashlib
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Last-access times are kept in memory and written in batches of this many reads
+TOUCH_BATCH = 64
+
+# Query parameters that only track the visitor and never change the page
+TRACKING_PARAMS = {'fbclid', 'gclid', 'dclid', 'msclkid', 'igshid', 'mc_cid', 'mc_eid',
+                   'ocid', 'cmpid', 'ref', 'ref_src', 'smid', 'at_medium', 'at_campaign', '_ga'}
+
+def normalize_url(url: str) -> str:
+    """Canonicalize a URL so tracking variants of the same page share a key."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.endswith(':80') and parts.scheme == 'http':
+        host = host[:-3]
+    elif host.endswith(':443') and parts.scheme == 'https':
+        host = host[:-4]
+    
+    params = [
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith('utm_') and name.lower() not in TRACKING_PARAMS
+    ]
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), host, path, urlencode(sorted(params)), ''))
+
+class ScrapeCache:
+    """Disk-backed, content-addressed cache of cleaned scrape results.
+    
+    Pages map a normalized URL to the hash of their body; bodies are stored
+    once per hash, zlib-compressed, so syndicated copies share storage. Reads
+    do not write: last-access times are batched and flushed with the next
+    write, so the LRU order may lag by up to TOUCH_BATCH reads after a crash.
+    """
+    
+    def __init__(self, db_path: str, max_bytes: int = 200 * 1024 * 1024,
+                 max_age: int = 7 * 24 * 3600):
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " url_key TEXT PRIMARY KEY, body_hash TEXT NOT NULL,"
+            " published_at TEXT, fetched_at REAL NOT NULL, last_access REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS bodies ("
+            " body_hash TEXT PRIMARY KEY, body BLOB NOT NULL, size INTEGER NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS pages_last_access ON pages (last_access);"
+            "CREATE INDEX IF NOT EXISTS pages_body_hash ON pages (body_hash);"
+        )
+        # Running total of body bytes, so writes need not sum the table
+        self._total, = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM bodies").fetchone()
+        self._touched: Dict[str, float] = {}  # url_key -> last access not yet written
+        
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def make_key(url: str) -> str:
+        """Hash the normalized URL into a fixed-size key."""
+        return hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+    
+    def get(self, url: str, published_at: Optional[str] = None) -> Optional[str]:
+        """Return cached content unless it is stale for the given article version."""
+        url_key = self.make_key(url)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT p.body_hash, p.published_at, p.fetched_at, b.body FROM pages p"
+                " JOIN bodies b ON b.body_hash = p.body_hash WHERE p.url_key = ?",
+                (url_key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            
+            body_hash, cached_published, fetched_at, body = row
+            stale = (
+                time.time() - fetched_at > self.max_age
+                or (published_at and cached_published and published_at != cached_published)
+            )
+            if stale:
+                self._delete_page(url_key, body_hash)
+                self._db.commit()
+                self.invalidations += 1
+                self.misses += 1
+                return None
+            
+            self._touched[url_key] = time.time()
+            if len(self._touched) >= TOUCH_BATCH:
+                self._flush_touched()
+                self._db.commit()
+            self.hits += 1
+            return zlib.decompress(body).decode('utf-8')
+    
+    def set(self, url: str, content: str, published_at: Optional[str] = None) -> None:
+        """Store cleaned content for url, evicting old pages over the size budget."""
+        raw = content.encode('utf-8')
+        body_hash = hashlib.sha256(raw).hexdigest()
+        body = zlib.compress(raw)
+        url_key = self.make_key(url)
+        now = time.time()
+        with self._lock:
+            if self._db.execute(
+                "INSERT OR IGNORE INTO bodies (body_hash, body, size) VALUES (?, ?, ?)",
+                (body_hash, body, len(body))
+            ).rowcount:
+                self._total += len(body)
+            previous = self._db.execute(
+                "SELECT body_hash FROM pages WHERE url_key = ?", (url_key,)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages"
+                " (url_key, body_hash, published_at, fetched_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (url_key, body_hash, published_at, now, now)
+            )
+            self._touched.pop(url_key, None)
+            if previous is not None and previous[0] != body_hash:
+                self._release_body(previous[0])
+            self._evict()
+            self._db.commit()
+    
+    def flush(self) -> None:
+        """Write pending last-access times, e.g. before shutting down."""
+        with self._lock:
+            self._flush_touched()
+            self._db.commit()
+    
+    def stats(self) -> Dict:
+        """Return cache counters and on-disk body size."""
+        with self._lock:
+            pages, = self._db.execute("SELECT COUNT(*) FROM pages").fetchone()
+            return {
+                'pages': pages,
+                'bytes': self._total,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'evictions': self.evictions,
+            }
+    
+    def _evict(self) -> None:
+        """Drop least recently used pages until bodies fit in max_bytes."""
+        if self._total <= self.max_bytes:
+            return
+        # Eviction picks by last_access, so pending reads must be on disk first
+        self._flush_touched()
+        while self._total > self.max_bytes:
+            row = self._db.execute(
+                "SELECT url_key, body_hash FROM pages ORDER BY last_access LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            self._delete_page(*row)
+            self.evictions += 1
+    
+    def _delete_page(self, url_key: str, body_hash: str) -> None:
+        self._db.execute("DELETE FROM pages WHERE url_key = ?", (url_key,))
+        self._touched.pop(url_key, None)
+        self._release_body(body_hash)
+    
+    def _release_body(self, body_hash: str) -> None:
+        """Delete a body no page refers to any more, keeping the running total."""
+        if self._db.execute("SELECT 1 FROM pages WHERE body_hash = ? LIMIT 1", (body_hash,)).fetchone():
+            return
+        row = self._db.execute("SELECT size FROM bodies WHERE body_hash = ?", (body_hash,)).fetchone()
+        if row is not None:
+            self._db.execute("DELETE FROM bodies WHERE body_hash = ?", (body_hash,))
+            self._total -= row[0]
+    
+    def _flush_touched(self) -> None:
+        if self._touched:
+            self._db.executemany("UPDATE pages SET last_access = ? WHERE url_key = ?",
+                                 [(seen, url_key) for url_key, seen in self._touched.items()])
+            self._touched.clear()
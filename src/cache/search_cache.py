@@ -0,0 +1,153 @@
+import datetime
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Optional
+from models import Article
+
+class SearchCache:
+    """Bounded LRU cache with per-entry TTL for news search results."""
+    
+    def __init__(self, max_size: int = 256, ttl: int = 3600, today_ttl: int = 300,
+                 db_path: Optional[str] = None, stale_ttl: int = 0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.today_ttl = today_ttl
+        self.stale_ttl = stale_ttl
+        self._entries = OrderedDict()  # key -> (expires_at, articles)
+        self._lock = threading.Lock()
+        self._db = None
+        
+        # Counters for monitoring
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.stale_hits = 0
+        
+        if db_path:
+            self._open_db(db_path)
+    
+    @staticmethod
+    def make_key(query: str, from_date: datetime.date, to_date: datetime.date,
+                 limit: int, language: str, sort_by: str) -> str:
+        """Build a normalized cache key for a search request."""
+        normalized_query = ' '.join(query.lower().split())
+        return '|'.join([normalized_query, from_date.isoformat(), to_date.isoformat(),
+                         str(limit), language, sort_by])
+    
+    def ttl_for(self, to_date: datetime.date) -> int:
+        """Ranges touching today change quickly, so they expire sooner."""
+        if to_date >= datetime.date.today():
+            return self.today_ttl
+        return self.ttl
+    
+    def get(self, key: str) -> Optional[List[Article]]:
+        """Return cached articles for key, or None on miss/expiry."""
+        now = time.time()
+        with self._lock:
+            entry = self._lookup(key, now)
+            if entry is None or entry[0] <= now:
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def get_stale(self, key: str) -> Optional[List[Article]]:
+        """Return articles for key even if expired (within stale_ttl), for degraded mode."""
+        with self._lock:
+            entry = self._lookup(key, time.time())
+            if entry is None:
+                return None
+            self.stale_hits += 1
+            return entry[1]
+    
+    def set(self, key: str, articles: List[Article], to_date: datetime.date) -> None:
+        """Cache articles for key with a TTL based on the searched range."""
+        expires_at = time.time() + self.ttl_for(to_date)
+        with self._lock:
+            self._store(key, (expires_at, articles))
+            self._save_to_db(key, expires_at, articles)
+    
+    def clear(self) -> None:
+        """Drop all cached entries, including persisted ones."""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM search_cache")
+                self._db.commit()
+    
+    def stats(self) -> Dict:
+        """Return hit/miss/eviction counters for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'stale_hits': self.stale_hits,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+    
+    def _lookup(self, key: str, now: float) -> Optional[tuple]:
+        """Find an entry in memory or on disk, dropping it once past its stale window."""
+        entry = self._entries.get(key)
+        if entry is None and self._db is not None:
+            entry = self._load_from_db(key)
+            if entry is not None:
+                self._store(key, entry)
+        
+        if entry is not None and entry[0] + self.stale_ttl <= now:
+            self._entries.pop(key, None)
+            self._delete_from_db(key)
+            self.expirations += 1
+            return None
+        return entry
+    
+    def _store(self, key: str, entry: tuple) -> None:
+        """Insert entry and evict least recently used ones over capacity."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def _open_db(self, db_path: str) -> None:
+        """Open the SQLite store and drop entries that went stale while offline."""
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS search_cache ("
+            "key TEXT PRIMARY KEY, expires_at REAL NOT NULL, articles TEXT NOT NULL)"
+        )
+        self._db.execute("DELETE FROM search_cache WHERE expires_at <= ?", (time.time() - self.stale_ttl,))
+        self._db.commit()
+    
+    def _load_from_db(self, key: str) -> Optional[tuple]:
+        row = self._db.execute(
+            "SELECT expires_at, articles FROM search_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], [Article.from_newsapi_response(a) for a in json.loads(row[1])]
+    
+    def _save_to_db(self, key: str, expires_at: float, articles: List[Article]) -> None:
+        if self._db is None:
+            return
+        self._db.execute(
+            "INSERT OR REPLACE INTO search_cache (key, expires_at, articles) VALUES (?, ?, ?)",
+            (key, expires_at, json.dumps([a.to_newsapi_dict() for a in articles]))
+        )
+        self._db.commit()
+    
+    def _delete_from_db(self, key: str) -> None:
+        if self._db is None:
+            return
+        self._db.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+        self._db.commit()
@@ -1,5 +1,9 @@
-from .news_client import NewsAPIClient
-from .llm_client import LLMClient
-from .scraper_client import ScraperClient
+from .news_client import NewsAPIClient, AsyncNewsAPIClient
+from .llm_client import LLMClient, AsyncLLMClient
+from .scraper_client import ScraperClient, AsyncScraperClient
+from .direct_scraper import DirectScraper
+from .http_pool import get_async_http_client, close_async_http_client
 
-__all__ = ['NewsAPIClient', 'LLMClient', 'ScraperClient']
\ No newline at end of file
+__all__ = ['NewsAPIClient', 'LLMClient', 'ScraperClient',
+           'AsyncNewsAPIClient', 'AsyncLLMClient', 'AsyncScraperClient', 'DirectScraper',
+           'get_async_http_client', 'close_async_http_client']
\ No newline at end of file
@@ -0,0 +1,28 @@
+from typing import Optional
+
+# One pooled async HTTP client shared by every async upstream client.
+# httpx binds connections to the running event loop, so all async services
+# are expected to run on a single loop. httpx is imported when it is first
+# needed, so the CLI never loads it.
+_async_client: Optional['httpx.AsyncClient'] = None
+
+def get_async_http_client(max_connections: int = 100) -> 'httpx.AsyncClient':
+    """Return the shared pooled async HTTP client, creating it on first use."""
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        import httpx
+        _async_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            ),
+            timeout=httpx.Timeout(30.0)
+        )
+    return _async_client
+
+async def close_async_http_client() -> None:
+    """Close the shared async HTTP client and release its connections."""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
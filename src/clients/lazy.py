@@ -0,0 +1,32 @@
+import threading
+from typing import Any, Callable
+
+class LazyClient:
+    """Class attribute that builds the wrapped SDK client on first access.
+
+    The SDKs (and the pydantic/requests/httpx stacks behind them) are imported
+    by the factory, so they load on the first call that needs them instead of
+    at startup. Assigning the attribute replaces the client, e.g. with a stand-in.
+    """
+    
+    def __init__(self, factory: Callable[[Any], Any]):
+        self.factory = factory
+        self._lock = threading.Lock()
+    
+    def __set_name__(self, owner, name):
+        self.attr = '_' + name
+    
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        client = instance.__dict__.get(self.attr)
+        if client is None:
+            with self._lock:
+                client = instance.__dict__.get(self.attr)
+                if client is None:
+                    client = self.factory(instance)
+                    instance.__dict__[self.attr] = client
+        return client
+    
+    def __set__(self, instance, value):
+        instance.__dict__[self.attr] = value
@@ -1,23 +1,137 @@
-from cerebras.cloud.sdk import Cerebras
-from typing import List, Dict
+from typing import List, Dict, Iterator, AsyncIterator, Optional
+from telemetry import tracer
+from clients.lazy import LazyClient
+from transport import LIVE
+
+MODEL = "llama-4-maverick-17b-128e-instruct"
+TEMPERATURE = 0.2
+MAX_TOKENS = 300
+
+def build_messages(messages: List[Dict], system_prompt: str, context: Optional[str] = None) -> List[Dict]:
+    """Static system prompt first so providers can cache it, then the per-call context."""
+    full_messages = [{"role": "system", "content": system_prompt}]
+    if context:
+        full_messages.append({"role": "system", "content": context})
+    return full_messages + messages
+
+def _cerebras(owner: 'LLMClient'):
+    def build(base_url):
+        from cerebras.cloud.sdk import Cerebras
+        return Cerebras(api_key=owner.api_key, base_url=base_url)
+    return owner.transport.connect('cerebras', build)
+
+def _async_cerebras(owner: 'AsyncLLMClient'):
+    def build(base_url):
+        from cerebras.cloud.sdk import AsyncCerebras
+        # The SDK's warm-up is a blocking request on a throwaway sync client: it
+        # would stall the event loop and leave the shared pool cold anyway
+        if owner.http_client is not None:
+            return AsyncCerebras(api_key=owner.api_key, base_url=base_url,
+                                 http_client=owner.http_client, warm_tcp_connection=False)
+        return AsyncCerebras(api_key=owner.api_key, base_url=base_url, warm_tcp_connection=False)
+    return owner.transport.connect('cerebras', build, is_async=True)
 
 class LLMClient:
     """Simple wrapper for Cerebras LLM API."""
     
-    def __init__(self, api_key: str):
-        self.client = Cerebras(api_key=api_key)
+    client = LazyClient(_cerebras)
     
-    def get_response(self, messages: List[Dict], system_prompt: str) -> str:
+    def __init__(self, api_key: str, temperature: float = TEMPERATURE, transport=None):
+        self.api_key = api_key
+        self.temperature = temperature
+        self.transport = transport or LIVE
+    
+    def get_response(self, messages: List[Dict], system_prompt: str,
+                     context: Optional[str] = None) -> str:
         """Get response from LLM."""
+        with tracer.span('llm.completion', model=MODEL, messages=len(messages)) as span:
+            try:
+                full_messages = build_messages(messages, system_prompt, context)
+                
+                response = self.client.chat.completions.create(
+                    messages=full_messages,
+                    model=MODEL,
+                    temperature=self.temperature,
+                    max_tokens=MAX_TOKENS
+                )
+                return response.choices[0].message.content.strip()
+            except Exception as e:
+                span.set('error', str(e))
+                return f"Error: {e}"
+    
+    def stream_response(self, messages: List[Dict], system_prompt: str,
+                        context: Optional[str] = None) -> Iterator[str]:
+        """Yield response text deltas from the LLM as they are generated."""
+        try:
+            full_messages = build_messages(messages, system_prompt, context)
+            
+            stream = self.client.chat.completions.create(
+                messages=full_messages,
+                model=MODEL,
+                temperature=self.temperature,
+                max_tokens=MAX_TOKENS,
+                stream=True
+            )
+            try:
+                for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        yield delta
+            finally:
+                # Release the connection if the caller stopped reading early
+                stream.close()
+        except Exception as e:
+            yield f"Error: {e}"
+
+class AsyncLLMClient:
+    """Asyncio wrapper for Cerebras LLM API."""
+    
+    client = LazyClient(_async_cerebras)
+    
+    def __init__(self, api_key: str, http_client: 'httpx.AsyncClient' = None,
+                 temperature: float = TEMPERATURE, transport=None):
+        self.api_key = api_key
+        self.http_client = http_client
+        self.temperature = temperature
+        self.transport = transport or LIVE
+    
+    async def get_response(self, messages: List[Dict], system_prompt: str,
+                           context: Optional[str] = None) -> str:
+        """Get response from LLM without blocking the event loop."""
+        with tracer.span('llm.completion', model=MODEL, messages=len(messages)) as span:
+            try:
+                full_messages = build_messages(messages, system_prompt, context)
+                
+                response = await self.client.chat.completions.create(
+                    messages=full_messages,
+                    model=MODEL,
+                    temperature=self.temperature,
+                    max_tokens=MAX_TOKENS
+                )
+                return response.choices[0].message.content.strip()
+            except Exception as e:
+                span.set('error', str(e))
+                return f"Error: {e}"
+    
+    async def stream_response(self, messages: List[Dict], system_prompt: str,
+                              context: Optional[str] = None) -> AsyncIterator[str]:
+        """Yield response text deltas from the LLM as they are generated."""
         try:
-            full_messages = [{"role": "system", "content": system_prompt}] + messages
+            full_messages = build_messages(messages, system_prompt, context)
             
-            response = self.client.chat.completions.create(
+            stream = await self.client.chat.completions.create(
                 messages=full_messages,
-                model="llama-4-maverick-17b-128e-instruct",
-                temperature=0.2,
-                max_tokens=300
+                model=MODEL,
+                temperature=self.temperature,
+                max_tokens=MAX_TOKENS,
+                stream=True
             )
-            return response.choices[0].message.content.strip()
+            try:
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        yield delta
+            finally:
+                await stream.close()
         except Exception as e:
-            return f"Error: {e}"
\ No newline at end of file
+            yield f"Error: {e}"
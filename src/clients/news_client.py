@@ -1,32 +1,193 @@
-from newsapi import NewsApiClient
-from typing import List, Dict
+from typing import List, Optional
 import datetime
+from telemetry import tracer
+from cache import SearchCache
+from models import Article
+from utils import (SingleFlight, AsyncSingleFlight, QuotaExceeded, UpstreamError,
+                   call_upstream, call_upstream_async)
+from utils.retry import RETRY_STATUSES
+from clients.lazy import LazyClient
+from transport import LIVE
+
+NEWSAPI_BASE_URL = "https://newsapi.org"
+NEWSAPI_EVERYTHING_PATH = "/v2/everything"
+
+def _newsapi(owner: 'NewsAPIClient'):
+    def build(base_url):
+        from newsapi import NewsApiClient
+        if base_url is None:
+            return NewsApiClient(api_key=owner.api_key)
+        return NewsApiClient(api_key=owner.api_key, session=_rebased_session(base_url))
+    return owner.transport.connect('newsapi', build)
+
+def _rebased_session(base_url: str) -> 'requests.Session':
+    """A requests session sending the SDK's hardcoded newsapi.org URLs to base_url instead."""
+    import requests
+    
+    class RebasedSession(requests.Session):
+        def request(self, method, url, *args, **kwargs):
+            if url.startswith(NEWSAPI_BASE_URL):
+                url = base_url.rstrip('/') + url[len(NEWSAPI_BASE_URL):]
+            return super().request(method, url, *args, **kwargs)
+    
+    return RebasedSession()
 
 class NewsAPIClient:
     """Simple wrapper for NewsAPI.org."""
     
-    def __init__(self, api_key: str):
-        self.client = NewsApiClient(api_key=api_key)
+    client = LazyClient(_newsapi)
+    
+    def __init__(self, api_key: str, cache=None, limiter=None, retry_attempts: int = 3,
+                 retry_base_delay: float = 0.5, transport=None):
+        self.api_key = api_key
+        self.cache = cache
+        self.limiter = limiter
+        self.retry_attempts = retry_attempts
+        self.retry_base_delay = retry_base_delay
+        self.transport = transport or LIVE
+        self.flights = SingleFlight()
     
     def search_articles(self, query: str, from_date: datetime.date, 
-                       to_date: datetime.date, limit: int = 5) -> List[Dict]:
+                       to_date: datetime.date, limit: int = 5,
+                       language: str = 'en', sort_by: str = 'publishedAt') -> List[Article]:
         """Search articles with specific date range."""
+        with tracer.span('newsapi.search', query=query, from_date=from_date.isoformat(),
+                         to_date=to_date.isoformat(), limit=limit) as span:
+            # Identical searches already in flight share one NewsAPI call
+            key = SearchCache.make_key(query, from_date, to_date, limit, language, sort_by)
+            articles, shared = self.flights.do(
+                key, self._search, query, from_date, to_date, limit, language, sort_by, span
+            )
+            span.set('coalesced', shared)
+            span.set('results', len(articles))
+            return articles
+    
+    def _search(self, query: str, from_date: datetime.date, to_date: datetime.date,
+                limit: int, language: str, sort_by: str, span) -> List[Article]:
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(query, from_date, to_date, limit, language, sort_by)
+            cached = self.cache.get(cache_key)
+            span.set('cache_hit', cached is not None)
+            if cached is not None:
+                print(f"[CACHE] Hit for: '{query}' from {from_date} to {to_date}")
+                return cached
+        
         try:
             print(f"[DEBUG] Searching for: '{query}' from {from_date} to {to_date}")
             
-            response = self.client.get_everything(
-                q=query,
-                from_param=from_date.isoformat(),
-                to=to_date.isoformat(),
-                language='en',
-                sort_by='publishedAt',
-                page_size=limit
+            response = call_upstream(
+                lambda: self.client.get_everything(
+                    q=query,
+                    from_param=from_date.isoformat(),
+                    to=to_date.isoformat(),
+                    language=language,
+                    sort_by=sort_by,
+                    page_size=limit
+                ),
+                self.limiter, self.retry_attempts, self.retry_base_delay
+            )
+            
+            if response['status'] != 'ok':
+                return []
+            
+            articles = [Article.from_newsapi_response(a) for a in (response['articles'] or [])[:limit]]
+            if cache_key is not None:
+                self.cache.set(cache_key, articles, to_date)
+            return articles
+            
+        except Exception as e:
+            return self._degraded(cache_key, e, span)
+    
+    def _degraded(self, cache_key: Optional[str], error: Exception, span) -> List[Article]:
+        """On quota exhaustion or a failed call, serve an expired cache entry if there is one."""
+        if isinstance(error, QuotaExceeded):
+            print(f"[DEGRADED] NewsAPI budget exhausted: {error}")
+        else:
+            print(f"[ERROR] NewsAPI search failed: {error}")
+        span.set('error', str(error))
+        
+        stale = self.cache.get_stale(cache_key) if cache_key is not None else None
+        if stale is not None:
+            print("[DEGRADED] Serving stale cached results")
+            span.set('stale', True)
+            return stale
+        return []
+
+class AsyncNewsAPIClient(NewsAPIClient):
+    """Asyncio wrapper for NewsAPI.org using a pooled HTTP client."""
+    
+    def __init__(self, api_key: str, http_client: 'httpx.AsyncClient', cache=None, limiter=None,
+                 retry_attempts: int = 3, retry_base_delay: float = 0.5, transport=None):
+        super().__init__(api_key, cache, limiter, retry_attempts, retry_base_delay, transport)
+        # Requests go through the pooled client, so that is what gets recorded or replayed
+        self.http_client = self.transport.connect('newsapi', lambda base_url: http_client, is_async=True)
+        self.flights = AsyncSingleFlight()
+    
+    @property
+    def everything_url(self) -> str:
+        base_url = self.transport.base_url('newsapi') or NEWSAPI_BASE_URL
+        return base_url.rstrip('/') + NEWSAPI_EVERYTHING_PATH
+    
+    async def search_articles(self, query: str, from_date: datetime.date,
+                              to_date: datetime.date, limit: int = 5,
+                              language: str = 'en', sort_by: str = 'publishedAt') -> List[Article]:
+        """Search articles with specific date range without blocking the event loop."""
+        with tracer.span('newsapi.search', query=query, from_date=from_date.isoformat(),
+                         to_date=to_date.isoformat(), limit=limit) as span:
+            # Identical searches already in flight share one NewsAPI call
+            key = SearchCache.make_key(query, from_date, to_date, limit, language, sort_by)
+            articles, shared = await self.flights.do(
+                key, self._search, query, from_date, to_date, limit, language, sort_by, span
             )
+            span.set('coalesced', shared)
+            span.set('results', len(articles))
+            return articles
+    
+    async def _search(self, query: str, from_date: datetime.date, to_date: datetime.date,
+                      limit: int, language: str, sort_by: str, span) -> List[Article]:
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(query, from_date, to_date, limit, language, sort_by)
+            cached = self.cache.get(cache_key)
+            span.set('cache_hit', cached is not None)
+            if cached is not None:
+                print(f"[CACHE] Hit for: '{query}' from {from_date} to {to_date}")
+                return cached
+        
+        async def get_everything():
+            response = await self.http_client.get(
+                self.everything_url,
+                params={
+                    'q': query,
+                    'from': from_date.isoformat(),
+                    'to': to_date.isoformat(),
+                    'language': language,
+                    'sortBy': sort_by,
+                    'pageSize': limit
+                },
+                headers={'X-Api-Key': self.api_key}
+            )
+            if response.status_code in RETRY_STATUSES:
+                raise UpstreamError(response.status_code)
+            return response
+        
+        try:
+            print(f"[DEBUG] Searching for: '{query}' from {from_date} to {to_date}")
+            
+            response = await call_upstream_async(get_everything, self.limiter,
+                                                 self.retry_attempts, self.retry_base_delay)
+            data = response.json()
+            
+            if data.get('status') != 'ok':
+                print(f"[ERROR] NewsAPI search failed: {data.get('message', response.status_code)}")
+                span.set('error', data.get('message', response.status_code))
+                return []
             
-            if response['status'] == 'ok' and response['articles']:
-                return response['articles'][:limit]
-            return []
+            articles = [Article.from_newsapi_response(a) for a in (data.get('articles') or [])[:limit]]
+            if cache_key is not None:
+                self.cache.set(cache_key, articles, to_date)
+            return articles
             
         except Exception as e:
-            print(f"[ERROR] NewsAPI search failed: {e}")
-            return []
\ No newline at end of file
+            return self._degraded(cache_key, e, span)
@@ -1,78 +1,394 @@
-from firecrawl import FirecrawlApp
+import asyncio
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures import TimeoutError as FuturesTimeout
 from typing import Optional, Dict
+from urllib.parse import urlsplit
+from telemetry import tracer
+from cache import normalize_url
+from parsers import ContentCleaner
+from utils import (SingleFlight, AsyncSingleFlight, QuotaExceeded,
+                   call_upstream, call_upstream_async)
+from clients.lazy import LazyClient
+from transport import LIVE, to_plain
+
+SCRAPE_FORMATS = [{
+    "type": "markdown",
+    "prompt": "Extract the main article content, excluding navigation, ads, and footers."
+}]
+# Used when no AdaptiveTimeouts is given
+SCRAPE_TIMEOUT_MS = 120000
+# Firecrawl enforces the timeout server-side, so a timed-out scrape can fail just short of it
+TIMEOUT_SLACK = 0.9
+
+def _firecrawl(owner: 'ScraperClient'):
+    def build(base_url):
+        from firecrawl import FirecrawlApp
+        if base_url is None:
+            return FirecrawlApp(api_key=owner.api_key)
+        return FirecrawlApp(api_key=owner.api_key, api_url=base_url)
+    return owner.transport.connect('firecrawl', build)
+
+def _async_firecrawl(owner: 'AsyncScraperClient'):
+    def build(base_url):
+        from firecrawl import AsyncFirecrawl
+        if base_url is None:
+            return AsyncFirecrawl(api_key=owner.api_key)
+        return AsyncFirecrawl(api_key=owner.api_key, api_url=base_url)
+    return owner.transport.connect('firecrawl', build, is_async=True)
+
+def _domain(url: str) -> str:
+    return urlsplit(url).netloc.lower()
 
 class ScraperClient:
-    """Simple wrapper for Firecrawl API."""
+    """Simple wrapper for Firecrawl API.
     
-    def __init__(self, api_key: str):
-        self.client = FirecrawlApp(api_key=api_key)
+    Optional latency controls, all keyed by domain: timeouts (AdaptiveTimeouts)
+    sets each scrape's deadline from the domain's observed latencies, breaker
+    (CircuitBreaker) stops scraping domains that keep failing, and hedger
+    (DirectScraper) is started alongside a Firecrawl scrape that runs past the
+    domain's p95, the first usable result winning.
+    """
     
-    def scrape_url(self, url: str) -> Optional[str]:
+    client = LazyClient(_firecrawl)
+    
+    def __init__(self, api_key: str, cache=None, limiter=None, retry_attempts: int = 3,
+                 retry_base_delay: float = 0.5, cleaner: Optional[ContentCleaner] = None,
+                 timeouts=None, breaker=None, hedger=None, transport=None):
+        self.api_key = api_key
+        self.transport = transport or LIVE
+        self.cache = cache
+        self.limiter = limiter
+        self.retry_attempts = retry_attempts
+        self.retry_base_delay = retry_base_delay
+        self.cleaner = cleaner or ContentCleaner()
+        self.flights = SingleFlight()
+        self.timeouts = timeouts
+        self.breaker = breaker
+        self.hedger = hedger
+        self._hedge_pool = self._hedge_executor() if hedger is not None else None
+    
+    def _hedge_executor(self) -> Optional[ThreadPoolExecutor]:
+        # A scrape outlives its caller when the hedge wins, so it needs its own threads
+        return ThreadPoolExecutor(max_workers=8, thread_name_prefix='scrape-hedge')
+    
+    def scrape_url(self, url: str, published_at: Optional[str] = None) -> Optional[str]:
         """Scrape content from URL and return cleaned text."""
+        with tracer.span('scrape', url=url) as span:
+            cached = self._get_cached(url, published_at)
+            span.set('cache_hit', cached is not None)
+            if cached is not None:
+                return cached
+            
+            # Concurrent scrapes of the same page share one Firecrawl call
+            content, shared = self.flights.do(normalize_url(url), self._fetch, url, published_at, span)
+            span.set('coalesced', shared)
+            return content
+    
+    def _fetch(self, url: str, published_at: Optional[str], span) -> Optional[str]:
+        domain = _domain(url)
+        if not self._allowed(domain, span):
+            return None
+        deadline = self._deadline(domain)
+        span.set('deadline_s', round(deadline, 1))
         try:
             print(f"[Scraping] Fetching content from: {url}")
             
-            result = self.client.scrape(
-                url, 
-                formats=[{
-                    "type": "markdown",
-                    "prompt": "Extract the main article content, excluding navigation, ads, and footers."
-                }],
-                only_main_content=True,
-                timeout=120000
-            )
-            
-            if result and 'markdown' in result:
-                content = result['markdown']
-                return self._clean_content(content)
+            if self._hedge_pool is None:
+                content = self._scrape(url, published_at, domain, deadline)
+            else:
+                content = self._hedged(url, published_at, domain, deadline, span)
+        except QuotaExceeded as e:
+            # Degraded mode: the service falls back to the article summary
+            print(f"[DEGRADED] Firecrawl budget exhausted: {e}")
+            span.set('error', str(e))
+            self._release(domain)
             return None
-            
         except Exception as e:
             print(f"[ERROR] Scraping Error: {e}")
-            return None
-    
-    def _clean_content(self, content: str) -> str:
-        """Clean and process scraped content."""
-        lines = content.split('\n')
-        cleaned_lines = []
-        article_started = False
+            span.set('error', str(e))
+            content = None
         
-        # Patterns to skip (only at start, before article begins)
-        skip_at_start = ['Skip to content', 'Home', 'News', 'Sport', 'Business', 
-                         'Watch Live', 'Newsletters', 'Innovation', 'Culture']
+        self._record_outcome(domain, content)
+        return content
+    
+    def _scrape(self, url: str, published_at: Optional[str], domain: str,
+                deadline: float) -> Optional[str]:
+        """One Firecrawl scrape, cleaned and cached; feeds the domain's latency histogram."""
+        started = time.perf_counter()
+        try:
+            result = call_upstream(
+                lambda: self.client.scrape(
+                    url, 
+                    formats=SCRAPE_FORMATS,
+                    only_main_content=True,
+                    timeout=int(deadline * 1000)
+                ),
+                self.limiter, self.retry_attempts, self.retry_base_delay
+            )
+        except QuotaExceeded:
+            raise
+        except Exception:
+            self._observe_failure(domain, deadline, time.perf_counter() - started)
+            raise
+        return self._scraped(url, published_at, domain, result, time.perf_counter() - started)
+    
+    def _hedged(self, url: str, published_at: Optional[str], domain: str, deadline: float,
+                span) -> Optional[str]:
+        """Scrape with Firecrawl, also fetching directly if it runs past the hedge delay."""
+        started = time.monotonic()
+        primary = self._hedge_pool.submit(contextvars.copy_context().run, self._scrape,
+                                          url, published_at, domain, deadline)
+        try:
+            return primary.result(timeout=self._hedge_delay(domain, deadline))
+        except FuturesTimeout:
+            pass
         
-        # Patterns to stop at (footer content)
-        stop_patterns = ['Related Links', 'More on this story', 'Share', 'Save',
-                        'You can follow', 'BBC', 'Facebook', 'Twitter', 'Instagram']
+        print(f"[HEDGE] Firecrawl is slow for {domain}; also fetching the page directly")
+        span.set('hedged', True)
+        remaining = deadline - (time.monotonic() - started)
+        secondary = self._hedge_pool.submit(contextvars.copy_context().run, self._direct,
+                                            url, published_at, remaining)
+        pending = {primary: 'firecrawl', secondary: 'direct'}
+        error = None
+        while pending:
+            remaining = deadline - (time.monotonic() - started)
+            done, _ = wait(pending, timeout=max(0.0, remaining), return_when=FIRST_COMPLETED)
+            if not done:
+                # Whatever is still running finishes in the background and fills the cache
+                span.set('timed_out', True)
+                return None
+            for future in done:
+                winner = pending.pop(future)
+                try:
+                    content = future.result()
+                except Exception as e:
+                    error = error or e
+                    continue
+                if content:
+                    span.set('winner', winner)
+                    return content
+        if error is not None:
+            raise error
+        return None
+    
+    def _direct(self, url: str, published_at: Optional[str], timeout: float) -> Optional[str]:
+        """The hedge: a plain HTTP fetch with local extraction, cleaned and cached."""
+        with tracer.span('scrape.direct') as span:
+            content = self.hedger.fetch(url, max(1.0, timeout))
+            span.set('chars', len(content) if content else 0)
+        if not content:
+            return None
+        return self._store(url, self._clean(content, url), published_at)
+    
+    def _scraped(self, url: str, published_at: Optional[str], domain: str, result,
+                 elapsed: float) -> Optional[str]:
+        """Clean and cache a Firecrawl result; successful scrapes feed the latency histogram."""
+        # The SDK returns a Document model; replays and stand-ins return plain dicts
+        result = to_plain(result)
+        if result and 'markdown' in result:
+            if self.timeouts is not None:
+                self.timeouts.observe(domain, elapsed)
+            content = result['markdown']
+            return self._store(url, self._clean(content, url), published_at)
+        return None
+    
+    def _observe_failure(self, domain: str, deadline: float, elapsed: float) -> None:
+        """Count a scrape that failed at its deadline as taking the deadline.
         
-        for line in lines:
-            stripped = line.strip()
-            
-            # Once we hit a heading with # or substantial text, article has started
-            if not article_started:
-                if stripped.startswith('#') or len(stripped) > 50:
-                    article_started = True
-            
-            # If article hasn't started, skip navigation
-            if not article_started and any(pattern in stripped for pattern in skip_at_start):
-                continue
-            
-            # Stop if we hit footer/related content
-            if article_started and any(pattern in stripped for pattern in stop_patterns):
-                break
+        The true latency is only known to be longer, but leaving timeouts out
+        would keep a slow domain's p99, and so its deadline, pinned to the
+        scrapes that were fast enough to finish.
+        """
+        if self.timeouts is not None and elapsed >= deadline * TIMEOUT_SLACK:
+            self.timeouts.observe(domain, deadline)
+    
+    def _allowed(self, domain: str, span) -> bool:
+        if self.breaker is None or self.breaker.allow(domain):
+            return True
+        print(f"[CIRCUIT OPEN] Not scraping {domain} after repeated failures")
+        span.set('circuit_open', True)
+        return False
+    
+    def _release(self, domain: str) -> None:
+        # Says nothing about the domain's health, but must not leave a half-open trial held
+        if self.breaker is not None:
+            self.breaker.release(domain)
+    
+    def _deadline(self, domain: str) -> float:
+        if self.timeouts is None:
+            return SCRAPE_TIMEOUT_MS / 1000
+        return self.timeouts.deadline(domain)
+    
+    def _hedge_delay(self, domain: str, deadline: float) -> float:
+        if self.timeouts is None:
+            return deadline / 4
+        return min(self.timeouts.hedge_after(domain), deadline)
+    
+    def _record_outcome(self, domain: str, content: Optional[str]) -> None:
+        if self.breaker is None:
+            return
+        if content:
+            self.breaker.record_success(domain)
+        else:
+            self.breaker.record_failure(domain)
+    
+    def scrape_stats(self) -> Dict:
+        """Adaptive deadline and circuit breaker state, for monitoring."""
+        return {
+            'latency': self.timeouts.stats() if self.timeouts is not None else None,
+            'circuits': self.breaker.stats() if self.breaker is not None else None,
+            'hedging': self.hedger is not None,
+        }
+    
+    def _get_cached(self, url: str, published_at: Optional[str]) -> Optional[str]:
+        """Return a cached scrape for url, if the cache has a fresh one."""
+        if self.cache is None:
+            return None
+        cached = self.cache.get(url, published_at=published_at)
+        if cached is not None:
+            print(f"[CACHE] Using cached content for: {url}")
+        return cached
+    
+    def _store(self, url: str, content: Optional[str], published_at: Optional[str]) -> Optional[str]:
+        """Persist cleaned content to the cache and pass it through."""
+        if self.cache is not None and content:
+            self.cache.set(url, content, published_at=published_at)
+        return content
+    
+    def _clean(self, content: str, url: str) -> Optional[str]:
+        """Run content cleaning inside its own trace span."""
+        with tracer.span('scrape.clean', input_chars=len(content)) as span:
+            cleaned = self.cleaner.clean(content, url)
+            span.set('output_chars', len(cleaned) if cleaned else 0)
+            return cleaned
+
+class AsyncScraperClient(ScraperClient):
+    """Asyncio wrapper for Firecrawl API; shares content cleaning with ScraperClient."""
+    
+    client = LazyClient(_async_firecrawl)
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.flights = AsyncSingleFlight()
+        # Scrapes left running after a hedge wins; held so they are not garbage collected
+        self._background = set()
+    
+    def _hedge_executor(self) -> Optional[ThreadPoolExecutor]:
+        # Hedges run as tasks on the event loop
+        return None
+    
+    async def scrape_url(self, url: str, published_at: Optional[str] = None) -> Optional[str]:
+        """Scrape content from URL without blocking the event loop."""
+        with tracer.span('scrape', url=url) as span:
+            cached = self._get_cached(url, published_at)
+            span.set('cache_hit', cached is not None)
+            if cached is not None:
+                return cached
             
-            # Skip image markdown and links
-            if stripped.startswith('![') or stripped.startswith('[**') or stripped == '* * *':
-                continue
+            # Concurrent scrapes of the same page share one Firecrawl call
+            content, shared = await self.flights.do(normalize_url(url), self._fetch, url, published_at, span)
+            span.set('coalesced', shared)
+            return content
+    
+    async def _fetch(self, url: str, published_at: Optional[str], span) -> Optional[str]:
+        domain = _domain(url)
+        if not self._allowed(domain, span):
+            return None
+        deadline = self._deadline(domain)
+        span.set('deadline_s', round(deadline, 1))
+        try:
+            print(f"[Scraping] Fetching content from: {url}")
             
-            # Keep the line if it has content
-            if stripped:
-                cleaned_lines.append(line)
-        
-        content = '\n'.join(cleaned_lines).strip()
+            if self.hedger is None:
+                content = await self._scrape(url, published_at, domain, deadline)
+            else:
+                content = await self._hedged(url, published_at, domain, deadline, span)
+        except asyncio.CancelledError:
+            self._release(domain)
+            raise
+        except QuotaExceeded as e:
+            # Degraded mode: the service falls back to the article summary
+            print(f"[DEGRADED] Firecrawl budget exhausted: {e}")
+            span.set('error', str(e))
+            self._release(domain)
+            return None
+        except Exception as e:
+            print(f"[ERROR] Scraping Error: {e}")
+            span.set('error', str(e))
+            content = None
         
-        # Limit content to avoid token overflow
-        if len(content) > 2500:
-            content = content[:2500] + "...\n\n[Content truncated for brevity]"
+        self._record_outcome(domain, content)
+        return content
+    
+    async def _scrape(self, url: str, published_at: Optional[str], domain: str,
+                      deadline: float) -> Optional[str]:
+        """One Firecrawl scrape, cleaned and cached; feeds the domain's latency histogram."""
+        started = time.perf_counter()
+        try:
+            result = await call_upstream_async(
+                lambda: self.client.scrape(
+                    url,
+                    formats=SCRAPE_FORMATS,
+                    only_main_content=True,
+                    timeout=int(deadline * 1000)
+                ),
+                self.limiter, self.retry_attempts, self.retry_base_delay
+            )
+        except QuotaExceeded:
+            raise
+        except Exception:
+            self._observe_failure(domain, deadline, time.perf_counter() - started)
+            raise
+        return self._scraped(url, published_at, domain, result, time.perf_counter() - started)
+    
+    async def _hedged(self, url: str, published_at: Optional[str], domain: str, deadline: float,
+                      span) -> Optional[str]:
+        """Scrape with Firecrawl, also fetching directly if it runs past the hedge delay."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        primary = asyncio.ensure_future(self._scrape(url, published_at, domain, deadline))
+        done, _ = await asyncio.wait({primary}, timeout=self._hedge_delay(domain, deadline))
+        if done:
+            return primary.result()
         
-        return content if content else None
\ No newline at end of file
+        print(f"[HEDGE] Firecrawl is slow for {domain}; also fetching the page directly")
+        span.set('hedged', True)
+        remaining = deadline - (loop.time() - started)
+        secondary = asyncio.ensure_future(
+            asyncio.to_thread(self._direct, url, published_at, remaining)
+        )
+        pending = {primary: 'firecrawl', secondary: 'direct'}
+        error = None
+        try:
+            while pending:
+                remaining = deadline - (loop.time() - started)
+                done, _ = await asyncio.wait(pending, timeout=max(0.0, remaining),
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # Whatever is still running finishes in the background and fills the cache
+                    span.set('timed_out', True)
+                    return None
+                for task in done:
+                    winner = pending.pop(task)
+                    try:
+                        content = task.result()
+                    except Exception as e:
+                        error = error or e
+                        continue
+                    if content:
+                        span.set('winner', winner)
+                        return content
+            if error is not None:
+                raise error
+            return None
+        finally:
+            for task in pending:
+                self._background.add(task)
+                task.add_done_callback(self._finished)
+    
+    def _finished(self, task: asyncio.Future) -> None:
+        self._background.discard(task)
+        if not task.cancelled():
+            task.exception()
@@ -1,21 +1,159 @@
 import os
-from dotenv import load_dotenv
-import datetime
 
-load_dotenv()
-today = datetime.datetime.now()
+_settings = None
 
-CEREBRAS_API_KEY = os.getenv("CEREBRAS_API_KEY")
-NEWSAPI_KEY = os.getenv('NEWSAPIORG_KEY')
-FIRECRAWL_API_KEY = os.getenv('FIRECRAWL_API_KEY')
+def load_settings() -> dict:
+    """Read .env, then the settings from the environment, once.
 
-SYSTEM_PROMPT = f'''You are an advanced AI news assistant that serves as an expert interface between users and news-retrieval tools.
+    Runs on first access to a setting rather than at import, so importing
+    config does no I/O and .env is never read by code that needs no setting.
+    Variables already set in the environment take precedence over .env.
+    """
+    global _settings
+    if _settings is None:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _settings = _read_settings()
+        # Later lookups find plain module attributes and skip __getattr__
+        globals().update(_settings)
+    return _settings
+
+def __getattr__(name: str):
+    if name.startswith('__'):
+        raise AttributeError(name)
+    settings = load_settings()
+    if name not in settings:
+        raise AttributeError(f"module 'config' has no attribute {name!r}")
+    return settings[name]
+
+def _read_settings() -> dict:
+    return {
+        'CEREBRAS_API_KEY': os.getenv("CEREBRAS_API_KEY"),
+        'NEWSAPI_KEY': os.getenv('NEWSAPIORG_KEY'),
+        'FIRECRAWL_API_KEY': os.getenv('FIRECRAWL_API_KEY'),
+
+        # News search cache (TTLs in seconds; set NEWS_CACHE_DB to persist across restarts)
+        'NEWS_CACHE_SIZE': int(os.getenv('NEWS_CACHE_SIZE', '256')),
+        'NEWS_CACHE_TTL': int(os.getenv('NEWS_CACHE_TTL', '3600')),
+        'NEWS_CACHE_TODAY_TTL': int(os.getenv('NEWS_CACHE_TODAY_TTL', '300')),
+        'NEWS_CACHE_DB': os.getenv('NEWS_CACHE_DB'),
+        # Expired results are kept this much longer to serve when the NewsAPI budget is spent
+        'NEWS_CACHE_STALE_TTL': int(os.getenv('NEWS_CACHE_STALE_TTL', '86400')),
+
+        # Local index of fetched articles, searched before NewsAPI (size 0 disables)
+        'ARTICLE_STORE_SIZE': int(os.getenv('ARTICLE_STORE_SIZE', '5000')),
+        'ARTICLE_STORE_TTL': int(os.getenv('ARTICLE_STORE_TTL', '3600')),
+
+        # Near-duplicate collapsing of search results: max SimHash distance in bits (-1 disables),
+        # and how many times the limit to request so collapsed copies can be replaced
+        'DEDUP_MAX_DISTANCE': int(os.getenv('DEDUP_MAX_DISTANCE', '10')),
+        'DEDUP_OVERFETCH': float(os.getenv('DEDUP_OVERFETCH', '2')),
+        'DEDUP_CACHE_SIZE': int(os.getenv('DEDUP_CACHE_SIZE', '10000')),
+
+        # News providers searched concurrently (comma-separated: newsapi, rss, archive).
+        # Deadlines are seconds a search waits for each before answering without it
+        'NEWS_PROVIDERS': os.getenv('NEWS_PROVIDERS', 'newsapi').lower(),
+        'NEWSAPI_DEADLINE': float(os.getenv('NEWSAPI_DEADLINE', '5')),
+        'RSS_FEEDS': os.getenv('RSS_FEEDS', ''),
+        'RSS_TTL': int(os.getenv('RSS_TTL', '300')),
+        'RSS_DEADLINE': float(os.getenv('RSS_DEADLINE', '2')),
+        'NEWS_ARCHIVE_DB': os.getenv('NEWS_ARCHIVE_DB', 'news_archive.db'),
+        'ARCHIVE_DEADLINE': float(os.getenv('ARCHIVE_DEADLINE', '0.5')),
+
+        # Fallback ladder strategy: 'serial' saves quota, 'parallel' minimizes latency
+        'SEARCH_STRATEGY': os.getenv('SEARCH_STRATEGY', 'serial').lower(),
+
+        # Client-side upstream budgets: requests per second (0 = unlimited), requests
+        # per day (0 = unlimited) and the share of the daily quota kept for interactive use
+        'NEWSAPI_RATE_LIMIT': float(os.getenv('NEWSAPI_RATE_LIMIT', '5')),
+        'NEWSAPI_DAILY_QUOTA': int(os.getenv('NEWSAPI_DAILY_QUOTA', '0')),
+        'FIRECRAWL_RATE_LIMIT': float(os.getenv('FIRECRAWL_RATE_LIMIT', '2')),
+        'FIRECRAWL_DAILY_QUOTA': int(os.getenv('FIRECRAWL_DAILY_QUOTA', '0')),
+        'QUOTA_INTERACTIVE_RESERVE': float(os.getenv('QUOTA_INTERACTIVE_RESERVE', '0.2')),
+
+        # Retries for 429/5xx responses (exponential backoff with jitter)
+        'RETRY_ATTEMPTS': int(os.getenv('RETRY_ATTEMPTS', '3')),
+        'RETRY_BASE_DELAY': float(os.getenv('RETRY_BASE_DELAY', '0.5')),
+
+        # Batch headline mode (topics per combined OR-query, concurrent searches)
+        'BATCH_GROUP_SIZE': int(os.getenv('BATCH_GROUP_SIZE', '5')),
+        'BATCH_CONCURRENCY': int(os.getenv('BATCH_CONCURRENCY', '4')),
+
+        # Background scraping of top search results
+        'PREFETCH_ENABLED': os.getenv('PREFETCH_ENABLED', 'false').lower() == 'true',
+        'PREFETCH_TOP_K': int(os.getenv('PREFETCH_TOP_K', '3')),
+        'PREFETCH_WORKERS': int(os.getenv('PREFETCH_WORKERS', '4')),
+        'PREFETCH_PER_DOMAIN': int(os.getenv('PREFETCH_PER_DOMAIN', '2')),
+
+        # Persistent scrape cache (set SCRAPE_CACHE_DB to enable)
+        'SCRAPE_CACHE_DB': os.getenv('SCRAPE_CACHE_DB'),
+        'SCRAPE_CACHE_MAX_MB': int(os.getenv('SCRAPE_CACHE_MAX_MB', '200')),
+        'SCRAPE_CACHE_MAX_AGE': int(os.getenv('SCRAPE_CACHE_MAX_AGE', str(7 * 24 * 3600))),
+
+        # Scrape latency control, per domain: deadlines in seconds adapt to observed latency
+        # within [MIN, MAX]; slow Firecrawl scrapes are hedged with a direct fetch; a domain's
+        # circuit opens after BREAKER_FAILURES straight failures for BREAKER_RESET seconds.
+        # The article summary is shown after FALLBACK_AFTER seconds while the scrape finishes
+        'SCRAPE_TIMEOUT': float(os.getenv('SCRAPE_TIMEOUT', '30')),
+        'SCRAPE_TIMEOUT_MIN': float(os.getenv('SCRAPE_TIMEOUT_MIN', '5')),
+        'SCRAPE_TIMEOUT_MAX': float(os.getenv('SCRAPE_TIMEOUT_MAX', '120')),
+        'SCRAPE_HEDGE': os.getenv('SCRAPE_HEDGE', 'true').lower() == 'true',
+        'SCRAPE_BREAKER_FAILURES': int(os.getenv('SCRAPE_BREAKER_FAILURES', '5')),
+        'SCRAPE_BREAKER_RESET': float(os.getenv('SCRAPE_BREAKER_RESET', '300')),
+        'SCRAPE_FALLBACK_AFTER': float(os.getenv('SCRAPE_FALLBACK_AFTER', '1.5')),
+
+        # Scraped content cleaning (JSON file of per-domain profiles, added to the built-in ones)
+        'CLEANER_PROFILES': os.getenv('CLEANER_PROFILES'),
+
+        # Local intent routing for obvious SEARCH/DETAIL turns
+        'INTENT_ROUTER_ENABLED': os.getenv('INTENT_ROUTER_ENABLED', 'true').lower() == 'true',
+        'INTENT_ROUTER_THRESHOLD': float(os.getenv('INTENT_ROUTER_THRESHOLD', '0.7')),
+
+        # Per-stage tracing (TRACE_FORMAT is 'json' or 'otel'; no TRACE_FILE means stderr)
+        'TRACE_ENABLED': os.getenv('TRACE_ENABLED', 'false').lower() == 'true',
+        'TRACE_FILE': os.getenv('TRACE_FILE'),
+        'TRACE_FORMAT': os.getenv('TRACE_FORMAT', 'json').lower(),
+
+        # Conversation history sent to the LLM (token counts are estimates; 0 disables the summary)
+        'HISTORY_MAX_MESSAGES': int(os.getenv('HISTORY_MAX_MESSAGES', '20')),
+        'HISTORY_TOKEN_BUDGET': int(os.getenv('HISTORY_TOKEN_BUDGET', '1000')),
+        'HISTORY_SUMMARY_TOKENS': int(os.getenv('HISTORY_SUMMARY_TOKENS', '150')),
+
+        # Multi-session server mode (src/server.py; idle timeout in seconds)
+        'SERVER_HOST': os.getenv('SERVER_HOST', '127.0.0.1'),
+        'SERVER_PORT': int(os.getenv('SERVER_PORT', '8080')),
+        'SERVER_WORKERS': int(os.getenv('SERVER_WORKERS', '1')),
+        'SESSION_IDLE_TIMEOUT': int(os.getenv('SESSION_IDLE_TIMEOUT', '1800')),
+        'MAX_SESSIONS': int(os.getenv('MAX_SESSIONS', '10000')),
+
+        # Upstream transport: 'live', 'record' (save every call to the cassette) or 'replay'
+        # (answer from the cassette offline, with injected latency in seconds and errors).
+        # Base URLs point the SDKs elsewhere, e.g. at src/stub_server.py
+        'UPSTREAM_MODE': os.getenv('UPSTREAM_MODE', 'live').lower(),
+        'UPSTREAM_CASSETTE': os.getenv('UPSTREAM_CASSETTE', 'upstream_cassette.jsonl'),
+        'UPSTREAM_LATENCY': float(os.getenv('UPSTREAM_LATENCY', '0')),
+        'UPSTREAM_JITTER': float(os.getenv('UPSTREAM_JITTER', '0')),
+        'UPSTREAM_ERROR_RATE': float(os.getenv('UPSTREAM_ERROR_RATE', '0')),
+        'UPSTREAM_SEED': int(os.getenv('UPSTREAM_SEED', '0')),
+        'CEREBRAS_BASE_URL': os.getenv('CEREBRAS_BASE_URL'),
+        'NEWSAPI_BASE_URL': os.getenv('NEWSAPI_BASE_URL'),
+        'FIRECRAWL_API_URL': os.getenv('FIRECRAWL_API_URL'),
+
+        # LLM sampling; command replies are always memoized, text replies only at temperature 0 (LLM_MEMO_SIZE=0 disables)
+        'LLM_TEMPERATURE': float(os.getenv('LLM_TEMPERATURE', '0.2')),
+        'LLM_MEMO_SIZE': int(os.getenv('LLM_MEMO_SIZE', '512')),
+        'LLM_MEMO_TTL': int(os.getenv('LLM_MEMO_TTL', '3600')),
+    }
+
+# Static so the prefix is byte-identical across calls and processes; the date
+# and session hints are sent separately (see agent.llm_service.prompt_context)
+SYSTEM_PROMPT = '''You are an advanced AI news assistant that serves as an expert interface between users and news-retrieval tools.
 
 ROLE:
 - Professional, neutral, and efficient news agent
 - Help users find and understand news articles through a two-step process
 - Maintain conversation context to handle follow-up questions
-- If the user asks for the current date, respond with: {today.replace(microsecond=0)}
+- If the user asks for the current date, respond with the current date given in CURRENT CONTEXT
 - If the user asks for your name, respond
 - If the user greets you, respond with a greeting
 
@@ -26,7 +164,7 @@ SCOPE:
 
 BEHAVIOR:
 - Be factual and neutral - no opinions or bias
-- Prioritize recent information (current date: Wednesday, October 1, 2025)
+- Prioritize recent information (see CURRENT CONTEXT for today's date)
 - If query is ambiguous, ask for clarification (e.g., "What specific topic are you interested in?")
 - Use conversation history to understand references like "tell me more" or "the second one"
 
@@ -0,0 +1,38 @@
+import argparse
+import sys
+from agent.news_service import NewsService
+
+def read_topics(path: str) -> list:
+    """One topic per line; blank lines and # comments are skipped."""
+    with (sys.stdin if path == '-' else open(path, encoding='utf-8')) as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a headline digest for many topics")
+    parser.add_argument('topics', nargs='*', help='topics, e.g. "climate" "AI this week"')
+    parser.add_argument('--file', '-f', help="file with one topic per line ('-' for stdin)")
+    parser.add_argument('--output', '-o', default='digest.md', help="digest file ('-' for stdout)")
+    parser.add_argument('--limit', type=int, default=5, help='headlines per topic')
+    parser.add_argument('--title', default='News Digest')
+    args = parser.parse_args()
+    
+    topics = list(args.topics)
+    if args.file:
+        topics.extend(read_topics(args.file))
+    if not topics:
+        parser.error("no topics given")
+    
+    news = NewsService()
+    headlines = news.fetch_headlines_batch(topics, limit=args.limit)
+    digest = news.formatter.format_digest(headlines, args.title)
+    
+    if args.output == '-':
+        print(digest)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(digest)
+        found = sum(1 for articles in headlines.values() if articles)
+        print(f"Wrote {args.output}: {found}/{len(headlines)} topics with headlines")
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,128 @@ from agent.chat_session import ChatSession
 from agent.llm_service import LLMService
 from agent.news_service import NewsService
 from agent.scraper_service import ScraperService
+from agent.intent_router import IntentRouter
+from config import (INTENT_ROUTER_ENABLED, INTENT_ROUTER_THRESHOLD,
+                    TRACE_ENABLED, TRACE_FILE, TRACE_FORMAT)
+from parsers import CommandStreamParser
+from telemetry import tracer, configure_tracing
+
+def routed_reply(command: str) -> CommandStreamParser:
+    """Wrap a locally routed command in the same shape as a streamed reply."""
+    parser = CommandStreamParser()
+    parser.feed(command)
+    parser.finish()
+    return parser
+
+def stream_reply(llm, session) -> CommandStreamParser:
+    """Stream the LLM reply, printing plain text as it arrives.
+    
+    Stops reading as soon as a complete SEARCH:/DETAIL: command is seen,
+    so the lookup can start before generation finishes.
+    """
+    parser = CommandStreamParser()
+    printing = False
+    
+    def show(text):
+        nonlocal printing
+        if not text:
+            return
+        if not printing:
+            print(" " * 30, end="\r")
+            print("Bot: ", end="")
+            printing = True
+        print(text, end="", flush=True)
+    
+    with tracer.span('llm.stream') as span:
+        stream = llm.stream_response(session.get_messages(), session.prompt_hints())
+        for delta in stream:
+            show(parser.feed(delta))
+            if parser.is_complete:
+                break
+        stream.close()
+        show(parser.finish())
+        span.set('command', parser.command or 'text')
+    
+    if printing:
+        print("\n")
+    return parser
+
+def print_chunks(chunks) -> None:
+    """Print a bot reply as its formatted pieces are produced."""
+    print("Bot: ", end="")
+    for chunk in chunks:
+        print(chunk, end="", flush=True)
+    print("\n")
+
+def run_turn(user_input, session, llm, news, scraper, router):
+    """Handle one user turn: route or ask the LLM, then search, scrape or reply."""
+    session.add_message("user", user_input)
+    
+    # Obvious commands skip the LLM round-trip entirely
+    with tracer.span('route'):
+        command = router.route(user_input) if router else None
+    if command:
+        reply = routed_reply(command)
+    else:
+        print("Bot: Thinking...", end="\r")
+        reply = stream_reply(llm, session)
+    
+    # Handle SEARCH command
+    if reply.command == "SEARCH":
+        query = reply.argument
+        print(" " * 30, end="\r")
+        print(f"Bot: Searching for '{query}'...\n")
+        
+        scraper.cancel_prefetch()
+        articles = news.fetch_headlines(query)
+        session.store_articles(articles)
+        scraper.prefetch(articles)
+        
+        print_chunks(news.iter_articles(articles, query))
+        session.add_headlines(query, articles)
+    
+    # Handle DETAIL command
+    elif reply.command == "DETAIL":
+        try:
+            index = int(reply.argument) - 1
+            article = session.get_article(index)
+            
+            if article:
+                print(" " * 30, end="\r")
+                print("Bot: Fetching full article details...\n")
+                
+                # Scrape the article using Firecrawl; a slow scrape shows the summary first
+                url = article.url
+                for scraped_content, loading in scraper.iter_article(url, fallback_article=article):
+                    if scraped_content is None:
+                        print("Bot: Couldn't load the full article; the summary above is all there is.\n")
+                        continue
+                    print_chunks(news.iter_article_detail(article, scraped_content))
+                    if loading:
+                        print("Bot: Loading the full article...\n")
+                session.add_article_detail(index, article)
+            else:
+                msg = "Sorry, I couldn't find that article. Please specify a valid number."
+                print(" " * 30, end="\r")
+                print(f"Bot: {msg}\n")
+                session.add_message("assistant", msg)
+        except Exception as e:
+            msg = f"Error fetching article details: {str(e)}"
+            print(" " * 30, end="\r")
+            print(f"Bot: {msg}\n")
+            session.add_message("assistant", msg)
+    
+    # Handle normal response (already printed while streaming)
+    else:
+        session.add_message("assistant", reply.text.strip())
 
 def main():
+    configure_tracing(TRACE_ENABLED, TRACE_FILE, TRACE_FORMAT)
     session = ChatSession()
     llm = LLMService()
     news = NewsService()
     scraper = ScraperService()
+    router = IntentRouter(INTENT_ROUTER_THRESHOLD) if INTENT_ROUTER_ENABLED else None
     
     print("=" * 50)
     print("         AI News Agent")
@@ -19,6 +135,10 @@ def main():
     print(f"Bot: {greeting}\n")
     session.add_message("assistant", greeting)
     
+    # The SDK clients are built on first use; the LLM is needed on the first
+    # unrouted turn, so connect while the user is still typing
+    llm.warm_up()
+    
     while True:
         user_input = input("You: ").strip()
         
@@ -29,58 +149,8 @@ def main():
         if not user_input:
             continue
         
-        session.add_message("user", user_input)
-        
-        print("Bot: Thinking...", end="\r")
-        response = llm.get_response(session.get_messages())
-        
-        # Handle SEARCH command
-        if response.startswith("SEARCH:"):
-            query = response.replace("SEARCH:", "").strip()
-            print(" " * 30, end="\r")
-            print(f"Bot: Searching for '{query}'...\n")
-            
-            articles = news.fetch_headlines(query)
-            session.store_articles(articles)
-            
-            display = news.format_articles(articles, query)
-            print(f"Bot: {display}\n")
-            session.add_message("assistant", display)
-        
-        # Handle DETAIL command
-        elif response.startswith("DETAIL:"):
-            try:
-                index = int(response.replace("DETAIL:", "").strip()) - 1
-                article = session.get_article(index)
-                
-                if article:
-                    print(" " * 30, end="\r")
-                    print("Bot: Fetching full article details...\n")
-                    
-                    # Scrape the article using Firecrawl with fallback
-                    url = article.get('url')
-                    scraped_content = scraper.scrape_article(url, fallback_article=article)
-                    
-                    # Format with scraped content
-                    detail = news.format_article_detail(article, scraped_content)
-                    print(f"Bot: {detail}\n")
-                    session.add_message("assistant", detail)
-                else:
-                    msg = "Sorry, I couldn't find that article. Please specify a valid number."
-                    print(" " * 30, end="\r")
-                    print(f"Bot: {msg}\n")
-                    session.add_message("assistant", msg)
-            except Exception as e:
-                msg = f"Error fetching article details: {str(e)}"
-                print(" " * 30, end="\r")
-                print(f"Bot: {msg}\n")
-                session.add_message("assistant", msg)
-        
-        # Handle normal response
-        else:
-            print(" " * 30, end="\r")
-            print(f"Bot: {response}\n")
-            session.add_message("assistant", response)
+        with tracer.span('turn', input_chars=len(user_input)):
+            run_turn(user_input, session, llm, news, scraper, router)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,26 +1,71 @@
+import dataclasses
+import datetime
+import sys
 from dataclasses import dataclass
 from typing import Optional
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Article:
-    """Simple article data structure."""
+    """Immutable news article, parsed once when it enters the pipeline."""
     title: str
     description: str
     url: str
     source: str
     author: Optional[str]
-    published_at: str
+    published_at: Optional[datetime.datetime]
     content: Optional[str] = None
     
     @classmethod
     def from_newsapi_response(cls, article_data: dict) -> 'Article':
         """Create Article from NewsAPI response data."""
         return cls(
-            title=article_data.get('title', 'No title'),
-            description=article_data.get('description', 'No description'),
-            url=article_data.get('url', ''),
-            source=article_data.get('source', {}).get('name', 'Unknown'),
+            title=article_data.get('title') or 'No title',
+            description=article_data.get('description') or '',
+            url=article_data.get('url') or '',
+            # Few distinct sources across many articles, so share the strings
+            source=sys.intern((article_data.get('source') or {}).get('name') or 'Unknown'),
             author=article_data.get('author'),
-            published_at=article_data.get('publishedAt', 'Unknown'),
+            published_at=parse_published(article_data.get('publishedAt')),
             content=article_data.get('content')
-        )
\ No newline at end of file
+        )
+    
+    @property
+    def published_date(self) -> Optional[datetime.date]:
+        return self.published_at.date() if self.published_at else None
+    
+    @property
+    def published_iso(self) -> Optional[str]:
+        """Publication time in NewsAPI's format, e.g. 2025-10-01T08:15:00Z."""
+        return self.published_at.strftime('%Y-%m-%dT%H:%M:%SZ') if self.published_at else None
+    
+    @property
+    def published_ts(self) -> float:
+        """Sort key: POSIX publication time, 0 when unknown."""
+        return self.published_at.timestamp() if self.published_at else 0.0
+    
+    def with_content(self, content: Optional[str]) -> 'Article':
+        return dataclasses.replace(self, content=content)
+    
+    def to_newsapi_dict(self) -> dict:
+        """Article in the NewsAPI response shape, for JSON persistence."""
+        return {
+            'title': self.title,
+            'description': self.description,
+            'url': self.url,
+            'source': {'name': self.source},
+            'author': self.author,
+            'publishedAt': self.published_iso,
+            'content': self.content
+        }
+
+def parse_published(value: Optional[str]) -> Optional[datetime.datetime]:
+    """Parse a NewsAPI publishedAt timestamp to an aware UTC datetime; None if missing or invalid."""
+    if not value:
+        return None
+    try:
+        published = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if published.tzinfo is None:
+        return published.replace(tzinfo=datetime.timezone.utc)
+    return published.astimezone(datetime.timezone.utc)
@@ -1,4 +1,8 @@
 from .date_parser import DateParser
 from .query_cleaner import QueryCleaner
+from .command_parser import CommandStreamParser
+from .content_cleaner import ContentCleaner, CleaningProfile
+from .html_extractor import extract_article
 
-__all__ = ['DateParser', 'QueryCleaner']
\ No newline at end of file
+__all__ = ['DateParser', 'QueryCleaner', 'CommandStreamParser', 'ContentCleaner', 'CleaningProfile',
+           'extract_article']
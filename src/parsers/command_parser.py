@@ -0,0 +1,81 @@
+from typing import Optional
+
+COMMAND_PREFIXES = {'SEARCH:': 'SEARCH', 'DETAIL:': 'DETAIL'}
+
+class CommandStreamParser:
+    """Detects SEARCH:/DETAIL: commands from the first tokens of a streamed LLM reply."""
+    
+    def __init__(self):
+        self.command: Optional[str] = None
+        self.is_text = False
+        self.is_complete = False
+        self._buffer = ''
+    
+    @property
+    def text(self) -> str:
+        """Everything received so far, without leading whitespace."""
+        return self._buffer.lstrip()
+    
+    @property
+    def argument(self) -> str:
+        """The command argument (search query or article number)."""
+        if self.command is None:
+            return ''
+        stripped = self.text
+        argument = stripped[stripped.index(':') + 1:]
+        if self.command == 'SEARCH':
+            argument = argument.split('\n', 1)[0]
+        else:
+            argument = argument.lstrip()
+            digits = len(argument) - len(argument.lstrip('0123456789'))
+            argument = argument[:digits] or argument
+        return argument.strip()
+    
+    def feed(self, delta: str) -> str:
+        """Consume a streamed delta and return any text that should be shown now."""
+        self._buffer += delta
+        if self.is_text:
+            return delta
+        
+        if self.command is None and not self._decide():
+            return ''
+        if self.is_text:
+            # Release everything buffered while we were undecided
+            return self.text
+        
+        self._check_complete()
+        return ''
+    
+    def finish(self) -> str:
+        """Mark the stream as finished and return any text still held back."""
+        pending = ''
+        if self.command is None and not self.is_text:
+            if not self._decide(final=True) or self.is_text:
+                self.is_text = True
+                pending = self.text
+        self.is_complete = True
+        return pending
+    
+    def _decide(self, final: bool = False) -> bool:
+        """Classify the reply as text or a command once the prefix is unambiguous."""
+        stripped = self.text
+        for prefix, command in COMMAND_PREFIXES.items():
+            if stripped.startswith(prefix):
+                self.command = command
+                return True
+        
+        could_be_command = any(prefix.startswith(stripped) for prefix in COMMAND_PREFIXES)
+        if could_be_command and not final:
+            return False
+        self.is_text = True
+        return True
+    
+    def _check_complete(self) -> None:
+        """A command is complete once its argument is terminated."""
+        argument = self.text[self.text.index(':') + 1:]
+        if self.command == 'SEARCH':
+            self.is_complete = '\n' in argument.lstrip()
+        elif self.command == 'DETAIL':
+            stripped = argument.lstrip()
+            digits = len(stripped) - len(stripped.lstrip('0123456789'))
+            self.is_complete = 0 < digits < len(stripped)
@@ -0,0 +1,146 @@
+import json
+import re
+from typing import Dict, Iterable, Optional, Union
+from urllib.parse import urlsplit
+
+TRUNCATION_NOTE = "...\n\n[Content truncated for brevity]"
+
+class CleaningProfile:
+    """Line patterns for cleaning one site's scraped markdown.
+
+    skip_at_start lines are dropped before the article starts, the first
+    stop_patterns line after it starts ends the article, and lines starting
+    with a skip_prefixes entry or equal to a skip_lines entry are dropped
+    anywhere. With anchored=True patterns must begin the line (after any
+    bullet or link punctuation) and end on a word boundary; otherwise they
+    match anywhere in the line.
+    """
+    
+    def __init__(self, skip_at_start=(), stop_patterns=(), skip_prefixes=('![', '[**'),
+                 skip_lines=('* * *',), anchored=False, max_chars=2500):
+        self.skip_at_start = _matcher(skip_at_start, anchored)
+        self.stop = _matcher(stop_patterns, anchored)
+        self.skip_prefixes = tuple(skip_prefixes)
+        self.skip_lines = frozenset(skip_lines)
+        self.max_chars = max_chars
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CleaningProfile':
+        return cls(**data)
+
+def _matcher(patterns, anchored: bool):
+    """One precompiled alternation for a pattern list, longest first."""
+    if not patterns:
+        return None
+    alternation = '|'.join(re.escape(p) for p in sorted(patterns, key=len, reverse=True))
+    if anchored:
+        return re.compile(rf'[^\w]*(?:{alternation})\b').match
+    return re.compile(alternation).search
+
+NAVIGATION = ['Skip to content', 'Home', 'News', 'Sport', 'Business',
+              'Watch Live', 'Newsletters', 'Innovation', 'Culture']
+
+DEFAULT_PROFILE = CleaningProfile(
+    skip_at_start=NAVIGATION,
+    stop_patterns=['Related Links', 'Related articles', 'Related stories', 'More on this story',
+                   'Share', 'Save', 'You can follow', 'Follow us', 'Facebook', 'Twitter',
+                   'Instagram'],
+    anchored=True
+)
+
+# BBC footers are reliable enough to stop at any mention
+BBC_PROFILE = CleaningProfile(
+    skip_at_start=NAVIGATION,
+    stop_patterns=['Related Links', 'More on this story', 'Share', 'Save',
+                   'You can follow', 'BBC', 'Facebook', 'Twitter', 'Instagram']
+)
+
+def iter_lines(text: str):
+    """Yield text's lines one slice at a time instead of splitting it all up front."""
+    start = 0
+    find = text.find
+    while True:
+        end = find('\n', start)
+        if end < 0:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+class ContentCleaner:
+    """Streams scraped markdown through a per-domain profile, stopping at the output budget."""
+    
+    def __init__(self, profiles: Optional[Dict[str, CleaningProfile]] = None,
+                 default: CleaningProfile = DEFAULT_PROFILE):
+        self.default = default
+        self.profiles = {'bbc.co.uk': BBC_PROFILE, 'bbc.com': BBC_PROFILE}
+        self.profiles.update(profiles or {})
+    
+    def register(self, domain: str, profile: CleaningProfile) -> None:
+        """Use profile for domain and its subdomains."""
+        self.profiles[domain.lower()] = profile
+    
+    def load_profiles(self, path: str) -> None:
+        """Add profiles from a JSON file mapping domains to CleaningProfile arguments."""
+        with open(path, encoding='utf-8') as f:
+            for domain, data in json.load(f).items():
+                self.register(domain, CleaningProfile.from_dict(data))
+    
+    def profile_for(self, url: Optional[str]) -> CleaningProfile:
+        """The profile for url's host or its closest registered parent domain."""
+        host = urlsplit(url).hostname if url else None
+        while host:
+            profile = self.profiles.get(host)
+            if profile is not None:
+                return profile
+            _, _, host = host.partition('.')
+        return self.default
+    
+    def clean(self, content: Union[str, Iterable[str]], url: Optional[str] = None) -> Optional[str]:
+        """Clean markdown (a string or an iterable of lines) for url; None if nothing is left."""
+        profile = self.profile_for(url)
+        lines = iter_lines(content) if isinstance(content, str) else content
+        skip_at_start, stop = profile.skip_at_start, profile.stop
+        skip_prefixes, skip_lines = profile.skip_prefixes, profile.skip_lines
+        budget = profile.max_chars
+        
+        kept = []
+        length = 0      # len('\n'.join(kept))
+        leading = 0     # whitespace .strip() will remove from the first kept line
+        article_started = False
+        
+        for line in lines:
+            if line.endswith('\n'):
+                line = line[:-1]
+            stripped = line.strip()
+            if not stripped:
+                continue
+            
+            # Once we hit a heading with # or substantial text, article has started
+            if not article_started:
+                if stripped[0] == '#' or len(stripped) > 50:
+                    article_started = True
+                elif skip_at_start is not None and skip_at_start(stripped):
+                    continue
+            elif stop is not None and stop(stripped):
+                break
+            
+            if stripped in skip_lines or stripped.startswith(skip_prefixes):
+                continue
+            
+            if kept:
+                length += 1
+            else:
+                leading = len(line) - len(line.lstrip())
+            kept.append(line)
+            length += len(line)
+            
+            # Stop reading once the stripped output is certain to exceed the budget
+            trailing = len(line) - len(line.rstrip())
+            if length - leading - trailing > budget:
+                break
+        
+        content = '\n'.join(kept).strip()
+        if len(content) > budget:
+            content = content[:budget] + TRUNCATION_NOTE
+        return content if content else None
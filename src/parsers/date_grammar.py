@@ -0,0 +1,204 @@
+import calendar
+import datetime
+import re
+from typing import Optional, Tuple
+
+DateRange = Tuple[datetime.date, datetime.date]
+
+MONTHS = {
+    'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6,
+    'july': 7, 'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12,
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'jun': 6, 'jul': 7, 'aug': 8,
+    'sep': 9, 'sept': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+WEEKDAYS = {
+    'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3,
+    'friday': 4, 'saturday': 5, 'sunday': 6,
+}
+UNIT_DAYS = {'day': 1, 'week': 7, 'month': 30, 'year': 365}
+
+_MONTH = r'(?:' + '|'.join(sorted(MONTHS, key=len, reverse=True)) + r')\.?'
+_WEEKDAY = r'(?:' + '|'.join(WEEKDAYS) + r')'
+_DAY = r'\d{1,2}(?:st|nd|rd|th)?'
+_YEAR = r'\d{4}'
+
+# A single calendar day in any supported notation (used for range endpoints)
+_POINT = (
+    r'\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{4}|\d{1,2}-\d{1,2}-\d{4}'
+    rf'|{_MONTH}\s+{_DAY}(?:,?\s+{_YEAR})?|{_DAY}\s+(?:of\s+)?{_MONTH}(?:,?\s+{_YEAR})?'
+)
+
+# One alternation covering every date expression plus the filler words the
+# cleaner strips, matched against the lowercased query. Alternatives are
+# ordered longest-first so that, at any position, the most specific form wins;
+# each is wrapped in a named group so match.lastgroup identifies which rule
+# fired, and guarded by a first-character lookahead so most positions are
+# rejected without trying every branch.
+_M = '[jfmasond]'
+DATE_PATTERN = re.compile(
+    r'\b(?:'
+    rf'(?=[fb])(?P<range>(?:from|between)\s+(?P<range_start>{_POINT})\s+(?:to|until|and|-)\s+(?P<range_end>{_POINT}))\b'
+    r'|(?=\d)(?P<ago>(?P<ago_n>\d+)\s+(?P<ago_unit>day|week|month)s?\s+ago)\b'
+    r'|(?=[pl])(?P<past>(?:past|last)\s+(?P<past_n>\d+)\s+(?P<past_unit>hour|day|week|month)s?)\b'
+    rf'|(?={_M})(?P<month_day>(?:(?P<md_prep>on|from)\s+)?(?P<md_month>{_MONTH})\s+(?P<md_day>{_DAY})'
+    rf'(?:,?\s+(?P<md_year>{_YEAR}))?)\b'
+    rf'|(?=[\dof])(?P<day_month>(?:(?P<dm_prep>on|from)\s+)?(?P<dm_day>{_DAY})\s+(?:of\s+)?(?P<dm_month>{_MONTH})'
+    rf'(?:,?\s+(?P<dm_year>{_YEAR}))?)\b'
+    rf'|(?=[id]|{_M})(?P<month>(?:(?:in|during)\s+)?(?P<m_month>{_MONTH})\s+(?P<m_year>{_YEAR})'
+    rf'|(?:in|during)\s+(?P<m_month_only>{_MONTH}))\b'
+    r'|(?=\d)(?P<iso>\d{4}-\d{2}-\d{2})\b'
+    r'|(?=\d)(?P<us>\d{1,2}[/-]\d{1,2}[/-]\d{4})\b'
+    r"|(?=[tylp])(?P<keyword>today(?:'?s)?|yesterday(?:'?s)?|(?:this|last|past)\s+(?:week|month|year)(?:'?s)?)\b"
+    rf'|(?=[lto])(?P<weekday>(?P<wd_mod>last|this|on)\s+(?P<wd_day>{_WEEKDAY})(?:\'?s)?)\b'
+    r'|(?=[ofidna])(?P<filler>(?:on|from|in|during)\s+|(?:news|articles?)\s+(?:from|on|in)$)'
+    r')'
+)
+POINT_PATTERN = re.compile(
+    rf'(?P<iso>\d{{4}}-\d{{2}}-\d{{2}})|(?P<us>\d{{1,2}}[/-]\d{{1,2}}[/-]\d{{4}})'
+    rf'|(?P<md_month>{_MONTH})\s+(?P<md_day>{_DAY})(?:,?\s+(?P<md_year>{_YEAR}))?'
+    rf'|(?P<dm_day>{_DAY})\s+(?:of\s+)?(?P<dm_month>{_MONTH})(?:,?\s+(?P<dm_year>{_YEAR}))?'
+)
+# Bare days and weekdays are often part of a name ("jan 6 hearing", "super bowl
+# sunday"): weekdays need a modifier, and a day without a year counts only after
+# on/from or at the end of the query
+DAY_KINDS = ('month_day', 'day_month')
+TRAILING = re.compile(r'[\s?.!]*$')
+LEADING_VERB = re.compile(r'^(?:what|show|get|find|search)\s+', re.IGNORECASE)
+
+def scan(query: str, today: datetime.date) -> Tuple[Optional[DateRange], str]:
+    """Scan query once, returning the first date range found and the cleaned query."""
+    date_range = None
+    pieces = []
+    last_end = 0
+
+    # Match on the lowercased text but cut pieces from the original so the
+    # cleaned query keeps its casing (unless lowering changed the length)
+    lowered = query.lower()
+    if len(lowered) != len(query):
+        query = lowered
+
+    for match in DATE_PATTERN.finditer(lowered):
+        kind = match.lastgroup
+        if kind in DAY_KINDS and not _is_dated(match, lowered):
+            continue
+        pieces.append(query[last_end:match.start()])
+        last_end = match.end()
+
+        if date_range is None and kind != 'filler':
+            date_range = _resolve(kind, match, today)
+    pieces.append(query[last_end:])
+
+    clean_query = ' '.join(''.join(pieces).split())
+    clean_query = LEADING_VERB.sub('', clean_query)
+    return date_range, clean_query
+
+def _is_dated(match: re.Match, lowered: str) -> bool:
+    """Whether a month/day match reads as a date rather than part of a name."""
+    prefix = 'md' if match.lastgroup == 'month_day' else 'dm'
+    if match.group(f'{prefix}_prep') or match.group(f'{prefix}_year'):
+        return True
+    return TRAILING.match(lowered, match.end()) is not None
+
+def _resolve(kind: str, match: re.Match, today: datetime.date) -> Optional[DateRange]:
+    """Turn one matched date expression into a (from, to) range."""
+    try:
+        if kind == 'keyword':
+            return _keyword_range(match.group('keyword').rstrip("'s"), today)
+        if kind == 'ago':
+            day = today - datetime.timedelta(days=int(match.group('ago_n')) * UNIT_DAYS[match.group('ago_unit')])
+            return day, day
+        if kind == 'past':
+            amount, unit = int(match.group('past_n')), match.group('past_unit')
+            if unit == 'hour':
+                start = (datetime.datetime.now() - datetime.timedelta(hours=amount)).date()
+            else:
+                start = today - datetime.timedelta(days=amount * UNIT_DAYS[unit])
+            return start, today
+        if kind in ('iso', 'us', 'month_day', 'day_month'):
+            day = _point(match, today)
+            return day, day
+        if kind == 'month':
+            return _month_range(match, today)
+        if kind == 'weekday':
+            return _weekday_range(match, today)
+        if kind == 'range':
+            start = _parse_point(match.group('range_start'), today)
+            end = _parse_point(match.group('range_end'), today)
+            if start and end:
+                return min(start, end), max(start, end)
+    except ValueError:
+        # Impossible dates such as 2025-02-30 are treated as no date
+        pass
+    return None
+
+def _keyword_range(keyword: str, today: datetime.date) -> DateRange:
+    if keyword.startswith('today'):
+        return today, today
+    if keyword.startswith('yesterday'):
+        day = today - datetime.timedelta(days=1)
+        return day, day
+
+    modifier, unit = keyword.split()
+    unit = unit.rstrip("'s")
+    if modifier == 'past':
+        return today - datetime.timedelta(days=UNIT_DAYS[unit]), today
+    if unit == 'week':
+        monday = today - datetime.timedelta(days=today.weekday())
+        if modifier == 'this':
+            return monday, today
+        last_monday = monday - datetime.timedelta(days=7)
+        return last_monday, last_monday + datetime.timedelta(days=6)
+    if unit == 'month':
+        first_this_month = today.replace(day=1)
+        if modifier == 'this':
+            return first_this_month, today
+        last_day_prev_month = first_this_month - datetime.timedelta(days=1)
+        return last_day_prev_month.replace(day=1), last_day_prev_month
+    # year
+    if modifier == 'this':
+        return today.replace(month=1, day=1), today
+    return datetime.date(today.year - 1, 1, 1), datetime.date(today.year - 1, 12, 31)
+
+def _point(match: re.Match, today: datetime.date) -> datetime.date:
+    """Parse a single-day match produced by DATE_PATTERN or POINT_PATTERN."""
+    if match.group('iso'):
+        return datetime.date.fromisoformat(match.group('iso'))
+    if match.group('us'):
+        month, day, year = re.split(r'[/-]', match.group('us'))
+        return datetime.date(int(year), int(month), int(day))
+    if match.group('md_month'):
+        month, day, year = match.group('md_month'), match.group('md_day'), match.group('md_year')
+    else:
+        month, day, year = match.group('dm_month'), match.group('dm_day'), match.group('dm_year')
+
+    month = MONTHS[month.rstrip('.')]
+    day = int(day.rstrip('stndrh'))
+    if year:
+        return datetime.date(int(year), month, day)
+    # Without a year, a future month/day refers to last year
+    candidate = datetime.date(today.year, month, day)
+    return candidate if candidate <= today else candidate.replace(year=today.year - 1)
+
+def _parse_point(text: str, today: datetime.date) -> Optional[datetime.date]:
+    match = POINT_PATTERN.fullmatch(text)
+    return _point(match, today) if match else None
+
+def _month_range(match: re.Match, today: datetime.date) -> DateRange:
+    name = match.group('m_month') or match.group('m_month_only')
+    month = MONTHS[name.rstrip('.')]
+    if match.group('m_year'):
+        year = int(match.group('m_year'))
+    else:
+        year = today.year if month <= today.month else today.year - 1
+
+    start = datetime.date(year, month, 1)
+    end = datetime.date(year, month, calendar.monthrange(year, month)[1])
+    return start, min(end, today)
+
+def _weekday_range(match: re.Match, today: datetime.date) -> DateRange:
+    target = WEEKDAYS[match.group('wd_day')]
+    days_back = (today.weekday() - target) % 7
+    if match.group('wd_mod') == 'last' and days_back == 0:
+        days_back = 7
+    day = today - datetime.timedelta(days=days_back)
+    return day, day
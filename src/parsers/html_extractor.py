@@ -0,0 +1,139 @@
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+SKIPPED_TAGS = frozenset({'script', 'style', 'nav', 'header', 'footer', 'aside', 'form',
+                          'noscript', 'svg', 'iframe', 'button', 'figure', 'template'})
+CONTAINER_TAGS = frozenset({'body', 'div', 'article', 'main', 'section', 'td'})
+BLOCK_TAGS = frozenset({'p', 'li', 'blockquote', 'pre', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'})
+# Containers named like these get extra credit, ones named like boilerplate get less
+POSITIVE = re.compile(r'article|body|content|entry|main|post|story|text', re.I)
+NEGATIVE = re.compile(r'comment|footer|menu|related|share|sidebar|social|sponsor|promo|ad-', re.I)
+MIN_BLOCK_CHARS = 25
+
+class _Container:
+    __slots__ = ('tag', 'score', 'weight')
+    
+    def __init__(self, tag: str, attrs: Dict[str, str]):
+        self.tag = tag
+        self.score = 0.0
+        hint = f"{attrs.get('id') or ''} {attrs.get('class') or ''}"
+        self.weight = 1.0
+        if tag in ('article', 'main') or POSITIVE.search(hint):
+            self.weight = 1.5
+        if NEGATIVE.search(hint):
+            self.weight = 0.3
+
+class _ReadabilityParser(HTMLParser):
+    """Collects text blocks and credits their length to the enclosing containers."""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack: List[_Container] = [_Container('root', {})]
+        self.skip_depth = 0
+        self.block: Optional[Tuple[str, List[str], List[str]]] = None
+        # (tag, text, the chain of containers it sits in)
+        self.blocks: List[Tuple[str, str, List[_Container]]] = []
+        self.link_depth = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self.skip_depth += 1
+        elif self.skip_depth:
+            return
+        elif tag in CONTAINER_TAGS:
+            self._end_block()
+            self.stack.append(_Container(tag, dict(attrs)))
+        elif tag in BLOCK_TAGS:
+            self._end_block()
+            self.block = (tag, [], [])
+        elif tag == 'a':
+            self.link_depth += 1
+        elif tag == 'br' and self.block is not None:
+            self.block[1].append(' ')
+    
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif self.skip_depth:
+            return
+        elif tag in CONTAINER_TAGS:
+            self._end_block()
+            # Close up to the matching container; unmatched end tags are ignored
+            for depth in range(len(self.stack) - 1, 0, -1):
+                if self.stack[depth].tag == tag:
+                    del self.stack[depth:]
+                    break
+        elif tag in BLOCK_TAGS:
+            self._end_block()
+        elif tag == 'a':
+            self.link_depth = max(0, self.link_depth - 1)
+    
+    def handle_data(self, data):
+        if self.skip_depth or self.block is None:
+            return
+        self.block[1].append(data)
+        if self.link_depth:
+            self.block[2].append(data)
+    
+    def _end_block(self):
+        if self.block is None:
+            return
+        tag, parts, link_parts = self.block
+        self.block = None
+        text = ' '.join(''.join(parts).split())
+        if not text:
+            return
+        chain = self.stack[1:]
+        self.blocks.append((tag, text, chain))
+        if tag[0] == 'h' or len(text) < MIN_BLOCK_CHARS:
+            return
+        # Text that is mostly links is navigation, not prose
+        link_chars = len(''.join(link_parts))
+        credit = (len(text) - link_chars) + text.count(',') * 10
+        if credit <= 0 or not chain:
+            return
+        chain[-1].score += credit
+        if len(chain) > 1:
+            chain[-2].score += credit / 2
+    
+    def close(self):
+        super().close()
+        self._end_block()
+
+def extract_article(html_text: str) -> str:
+    """Main article text of an HTML page as simple markdown.
+    
+    A small readability heuristic: paragraph text is credited to its
+    enclosing container (half to the one around that), containers named or
+    tagged like article bodies count more, and the blocks inside the best
+    container are kept. Returns '' when nothing looks like an article.
+    """
+    parser = _ReadabilityParser()
+    try:
+        parser.feed(html_text)
+        parser.close()
+    except Exception:
+        # HTMLParser is lenient; anything it still rejects yields what was read so far
+        pass
+    
+    containers = {id(container): container for _, _, chain in parser.blocks for container in chain}
+    if not containers:
+        return ''
+    best = max(containers.values(), key=lambda container: container.score * container.weight)
+    if best.score <= 0:
+        return ''
+    
+    lines = []
+    for tag, text, chain in parser.blocks:
+        if best not in chain:
+            continue
+        if tag[0] == 'h':
+            lines.append(f"{'#' * int(tag[1])} {text}")
+        elif tag == 'li':
+            lines.append(f"- {text}")
+        elif tag == 'blockquote':
+            lines.append(f"> {text}")
+        else:
+            lines.append(text)
+    return '\n\n'.join(lines)
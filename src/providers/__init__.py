@@ -0,0 +1,6 @@
+from .base import NewsProvider, FanOut
+from .newsapi_provider import NewsAPIProvider
+from .rss_provider import RSSProvider
+from .archive_provider import ArchiveProvider
+
+__all__ = ['NewsProvider', 'FanOut', 'NewsAPIProvider', 'RSSProvider', 'ArchiveProvider']
@@ -0,0 +1,96 @@
+import datetime
+import json
+import sqlite3
+import threading
+from typing import Iterable, List
+from models import Article
+from models.article import parse_published
+from cache.article_store import tokenize
+from .base import NewsProvider, matches
+
+class ArchiveProvider(NewsProvider):
+    """Searches a local archive of articles kept in SQLite.
+
+    NewsService saves what the other providers return into it, so the archive
+    grows into an offline copy of everything searched. A path ending in .json
+    is instead loaded into memory, read from a NewsAPI response dump or a list
+    of articles in the same shape.
+    """
+    
+    name = 'archive'
+    
+    def __init__(self, path: str, deadline: float = 0.5):
+        super().__init__(deadline)
+        self._db_lock = threading.Lock()
+        self._db = sqlite3.connect(':memory:' if path.endswith('.json') else path,
+                                   check_same_thread=False)
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            " url TEXT PRIMARY KEY, title TEXT NOT NULL, description TEXT NOT NULL,"
+            " source TEXT NOT NULL, author TEXT, published_at TEXT, published_ts REAL NOT NULL,"
+            " content TEXT);"
+            "CREATE INDEX IF NOT EXISTS articles_published ON articles (published_ts);"
+        )
+        if path.endswith('.json'):
+            self.load_file(path)
+    
+    def search(self, query: str, from_date: datetime.date, to_date: datetime.date,
+               limit: int) -> List[Article]:
+        start = datetime.datetime.combine(from_date, datetime.time.min, datetime.timezone.utc)
+        end = datetime.datetime.combine(to_date + datetime.timedelta(days=1), datetime.time.min,
+                                        datetime.timezone.utc)
+        sql = ("SELECT title, description, url, source, author, published_at, content FROM articles"
+               " WHERE published_ts >= ? AND published_ts < ?")
+        params = [start.timestamp(), end.timestamp()]
+        # Every term must appear; LIKE is case-insensitive for ASCII
+        for term in ([] if query == 'general news' else tokenize(query)):
+            sql += " AND (title LIKE ? OR description LIKE ?)"
+            params += [f'%{term}%'] * 2
+        # LIKE also matches inside longer words, so fetch extra and keep whole-word matches
+        sql += " ORDER BY published_ts DESC LIMIT ?"
+        params.append(limit * 4)
+        
+        with self._db_lock:
+            rows = self._db.execute(sql, params).fetchall()
+        articles = (
+            Article(title=title, description=description, url=url, source=source, author=author,
+                    published_at=parse_published(published_at), content=content)
+            for title, description, url, source, author, published_at, content in rows
+        )
+        return [article for article in articles if matches(query, article)][:limit]
+    
+    def save(self, articles: Iterable[Article]) -> None:
+        """Insert or refresh articles, keeping content already archived for a page."""
+        rows = [
+            (article.url, article.title, article.description, article.source, article.author,
+             article.published_iso, article.published_ts, article.content)
+            for article in articles if article.url and article.published_at
+        ]
+        if not rows:
+            return
+        with self._db_lock:
+            self._db.executemany(
+                "INSERT INTO articles VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(url) DO UPDATE SET title = excluded.title,"
+                " description = excluded.description, source = excluded.source,"
+                " author = excluded.author, published_at = excluded.published_at,"
+                " published_ts = excluded.published_ts,"
+                " content = COALESCE(excluded.content, articles.content)",
+                rows
+            )
+            self._db.commit()
+    
+    def load_file(self, path: str) -> None:
+        """Archive the articles in a JSON file of NewsAPI-shaped articles."""
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[ARCHIVE] Could not load {path}: {e}")
+            return
+        records = (data.get('articles') or []) if isinstance(data, dict) else data
+        self.save(Article.from_newsapi_response(record) for record in records)
+    
+    def count(self) -> int:
+        with self._db_lock:
+            return self._db.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
@@ -0,0 +1,138 @@
+import asyncio
+import datetime
+import threading
+import time
+from typing import Dict, List, Optional
+from cache import normalize_url
+from cache.article_store import tokenize
+from models import Article
+
+class NewsProvider:
+    """A source of articles that NewsService can search alongside others.
+
+    Subclasses implement search(); search_async() runs it on a worker thread
+    unless the provider has a native asyncio client. deadline is how long a
+    fan-out waits for this provider before answering without it.
+    """
+    
+    name = 'provider'
+    
+    def __init__(self, deadline: float = 5.0):
+        self.deadline = deadline
+        self._lock = threading.Lock()
+        
+        # Counters for monitoring
+        self.calls = 0
+        self.results = 0
+        self.errors = 0
+        self.deadline_misses = 0
+        self.total_seconds = 0.0
+    
+    def search(self, query: str, from_date: datetime.date, to_date: datetime.date,
+               limit: int) -> List[Article]:
+        """Newest matching articles published within the date range, at most limit."""
+        raise NotImplementedError
+    
+    async def search_async(self, query: str, from_date: datetime.date, to_date: datetime.date,
+                           limit: int) -> List[Article]:
+        return await asyncio.to_thread(self.search, query, from_date, to_date, limit)
+    
+    def record(self, seconds: float, articles: Optional[List[Article]] = None,
+               error: bool = False, missed: bool = False) -> None:
+        with self._lock:
+            self.calls += 1
+            self.total_seconds += seconds
+            self.results += len(articles or ())
+            self.errors += error
+            self.deadline_misses += missed
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'results': self.results,
+                'errors': self.errors,
+                'deadline_misses': self.deadline_misses,
+                'mean_ms': self.total_seconds / self.calls * 1000 if self.calls else 0.0,
+                'deadline_s': self.deadline,
+            }
+
+def matches(query: str, article: Article) -> bool:
+    """Whether every query term appears in the title or description; the catch-all matches all."""
+    terms = tokenize(query)
+    if query == 'general news' or not terms:
+        return True
+    text = set(tokenize(f"{article.title} {article.description}"))
+    return all(term in text for term in terms)
+
+def in_range(article: Article, from_date: datetime.date, to_date: datetime.date) -> bool:
+    published = article.published_date
+    return published is not None and from_date <= published <= to_date
+
+class FanOut:
+    """Bookkeeping for one search sent to several providers at once.
+
+    The caller starts every provider, then alternates waiting up to timeout()
+    with collect()/fail()/expire() until done. done is reached when every
+    provider has answered or missed its deadline, or early once the answers
+    hold wanted distinct articles.
+    """
+    
+    def __init__(self, providers: List[NewsProvider], wanted: int):
+        self.providers = providers
+        self.wanted = wanted
+        self.started = time.monotonic()
+        self.results: Dict[NewsProvider, List[Article]] = {}
+        self.missed: List[NewsProvider] = []
+        self.failed: List[NewsProvider] = []
+        self._urls = set()
+    
+    def collect(self, provider: NewsProvider, articles: List[Article]) -> None:
+        provider.record(time.monotonic() - self.started, articles)
+        self.results[provider] = articles
+        self._urls.update(normalize_url(article.url) for article in articles if article.url)
+    
+    def fail(self, provider: NewsProvider, error: BaseException) -> None:
+        print(f"[PROVIDER] {provider.name} search failed: {error}")
+        provider.record(time.monotonic() - self.started, error=True)
+        self.failed.append(provider)
+    
+    def expire(self, pending: List[NewsProvider]) -> List[NewsProvider]:
+        """Give up on pending providers past their deadline; returns those still waited for."""
+        elapsed = time.monotonic() - self.started
+        waiting = []
+        for provider in pending:
+            if elapsed >= provider.deadline:
+                print(f"[PROVIDER] {provider.name} missed its {provider.deadline:g}s deadline")
+                provider.record(elapsed, missed=True)
+                self.missed.append(provider)
+            else:
+                waiting.append(provider)
+        return waiting
+    
+    def timeout(self, pending: List[NewsProvider]) -> float:
+        """Seconds until the nearest deadline among pending providers."""
+        elapsed = time.monotonic() - self.started
+        return max(0.0, min(provider.deadline for provider in pending) - elapsed)
+    
+    def late(self, provider: NewsProvider, articles: List[Article]) -> None:
+        """An answer that came after the fan-out returned; misses were already counted."""
+        if provider not in self.missed:
+            provider.record(time.monotonic() - self.started, articles)
+    
+    def unanswered(self, provider: NewsProvider) -> bool:
+        """Still running: missed its deadline, or not needed once enough had arrived."""
+        return provider not in self.results and provider not in self.failed
+    
+    def done(self, pending: List[NewsProvider]) -> bool:
+        return not pending or len(self._urls) >= self.wanted
+    
+    @property
+    def complete(self) -> bool:
+        """Every provider answered without error, so the results are all there is to find."""
+        return len(self.results) == len(self.providers)
+    
+    def articles(self) -> List[Article]:
+        """Answers in provider order, so the first provider's copy of a page wins the merge."""
+        return [article for provider in self.providers
+                for article in self.results.get(provider, ())]
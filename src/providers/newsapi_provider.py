@@ -0,0 +1,24 @@
+import datetime
+from typing import List
+from models import Article
+from .base import NewsProvider
+
+class NewsAPIProvider(NewsProvider):
+    """NewsAPI.org through a NewsAPIClient, or an AsyncNewsAPIClient for search_async.
+
+    The client keeps its own search cache, request coalescing and rate limits.
+    """
+    
+    name = 'newsapi'
+    
+    def __init__(self, client, deadline: float = 5.0):
+        super().__init__(deadline)
+        self.client = client
+    
+    def search(self, query: str, from_date: datetime.date, to_date: datetime.date,
+               limit: int) -> List[Article]:
+        return self.client.search_articles(query, from_date, to_date, limit)
+    
+    async def search_async(self, query: str, from_date: datetime.date, to_date: datetime.date,
+                           limit: int) -> List[Article]:
+        return await self.client.search_articles(query, from_date, to_date, limit)
@@ -0,0 +1,129 @@
+import datetime
+import html
+import re
+import sys
+import threading
+import time
+import urllib.request
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from models import Article
+from models.article import parse_published
+from .base import NewsProvider, matches, in_range
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+DC_CREATOR = '{http://purl.org/dc/elements/1.1/}creator'
+HTML_TAG = re.compile(r'<[^>]+>')
+USER_AGENT = 'ai-news-agent/1.0 (+feed reader)'
+
+def _text(html_text: Optional[str]) -> str:
+    """Plain text of an HTML snippet, whitespace collapsed."""
+    if not html_text:
+        return ''
+    return ' '.join(html.unescape(HTML_TAG.sub(' ', html_text)).split())
+
+def _rss_date(value: Optional[str]) -> Optional[datetime.datetime]:
+    """RFC 822 pubDate as an aware UTC datetime; None if missing or invalid."""
+    if not value:
+        return None
+    try:
+        published = parsedate_to_datetime(value.strip())
+    except (TypeError, ValueError):
+        return None
+    if published.tzinfo is None:
+        return published.replace(tzinfo=datetime.timezone.utc)
+    return published.astimezone(datetime.timezone.utc)
+
+def parse_feed(data: bytes, feed_url: str = '') -> List[Article]:
+    """Articles from an RSS 2.0 or Atom document."""
+    root = ElementTree.fromstring(data)
+    if root.tag == f'{ATOM}feed':
+        source = sys.intern(_text(root.findtext(f'{ATOM}title')) or urlsplit(feed_url).netloc or 'Feed')
+        return [_atom_entry(entry, source) for entry in root.iter(f'{ATOM}entry')]
+    
+    channel = root.find('channel')
+    if channel is None:
+        raise ValueError(f"not an RSS or Atom feed: <{root.tag}>")
+    source = sys.intern(_text(channel.findtext('title')) or urlsplit(feed_url).netloc or 'Feed')
+    return [
+        Article(
+            title=_text(item.findtext('title')) or 'No title',
+            description=_text(item.findtext('description')),
+            url=(item.findtext('link') or '').strip(),
+            source=source,
+            author=item.findtext('author') or item.findtext(DC_CREATOR),
+            published_at=_rss_date(item.findtext('pubDate'))
+        )
+        for item in channel.iter('item')
+    ]
+
+def _atom_entry(entry: ElementTree.Element, source: str) -> Article:
+    links = entry.findall(f'{ATOM}link')
+    link = next((candidate for candidate in links if candidate.get('rel', 'alternate') == 'alternate'),
+                links[0] if links else None)
+    return Article(
+        title=_text(entry.findtext(f'{ATOM}title')) or 'No title',
+        description=_text(entry.findtext(f'{ATOM}summary') or entry.findtext(f'{ATOM}content')),
+        url=(link.get('href') or '').strip() if link is not None else '',
+        source=source,
+        author=entry.findtext(f'{ATOM}author/{ATOM}name'),
+        published_at=parse_published(entry.findtext(f'{ATOM}published') or entry.findtext(f'{ATOM}updated'))
+    )
+
+class RSSProvider(NewsProvider):
+    """Searches a fixed list of RSS/Atom feeds, given as http(s) URLs or local file paths.
+
+    Each feed is fetched at most once per ttl seconds and its entries kept in
+    memory; searches filter those by date range and query terms. A feed that
+    fails to refresh keeps serving its previous entries until the next try.
+    """
+    
+    name = 'rss'
+    
+    def __init__(self, feeds: List[str], deadline: float = 2.0, ttl: int = 300):
+        super().__init__(deadline)
+        self.feeds = feeds
+        self.ttl = ttl
+        self._feeds: Dict[str, Tuple[float, List[Article]]] = {}
+        self._refresh_lock = threading.Lock()
+    
+    def search(self, query: str, from_date: datetime.date, to_date: datetime.date,
+               limit: int) -> List[Article]:
+        found = [article for article in self._entries()
+                 if in_range(article, from_date, to_date) and matches(query, article)]
+        found.sort(key=lambda article: article.published_ts, reverse=True)
+        return found[:limit]
+    
+    def _entries(self) -> List[Article]:
+        """Entries of every feed, refreshing the stale ones concurrently first."""
+        # One refresh at a time; concurrent searches wait and then share it
+        with self._refresh_lock:
+            now = time.time()
+            stale = [feed for feed in self.feeds
+                     if feed not in self._feeds or now - self._feeds[feed][0] > self.ttl]
+            if stale:
+                with ThreadPoolExecutor(max_workers=min(8, len(stale)),
+                                        thread_name_prefix='rss-fetch') as pool:
+                    for feed, articles in zip(stale, pool.map(self._fetch, stale)):
+                        if articles is None:
+                            # Retry after ttl rather than on every search
+                            articles = self._feeds.get(feed, (now, []))[1]
+                        self._feeds[feed] = (now, articles)
+            return [article for _, articles in self._feeds.values() for article in articles]
+    
+    def _fetch(self, feed: str) -> Optional[List[Article]]:
+        try:
+            if urlsplit(feed).scheme in ('http', 'https'):
+                request = urllib.request.Request(feed, headers={'User-Agent': USER_AGENT})
+                with urllib.request.urlopen(request, timeout=self.deadline) as response:
+                    data = response.read()
+            else:
+                with open(feed, 'rb') as f:
+                    data = f.read()
+            return parse_feed(data, feed)
+        except Exception as e:
+            print(f"[RSS] Could not read feed {feed}: {e}")
+            return None
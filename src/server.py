@@ -0,0 +1,294 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import shutil
+import signal
+import sys
+import tempfile
+from typing import Dict, Optional
+from aiohttp import web, WSMsgType, ClientConnectionError, ClientSession, UnixConnector, WSServerHandshakeError
+from agent.async_turn import AsyncTurnHandler
+from agent.session_manager import SessionManager
+from agent.llm_service import AsyncLLMService
+from agent.news_service import AsyncNewsService
+from agent.scraper_service import AsyncScraperService
+from agent.intent_router import IntentRouter
+from clients import close_async_http_client
+from config import (INTENT_ROUTER_ENABLED, INTENT_ROUTER_THRESHOLD,
+                    TRACE_ENABLED, TRACE_FILE, TRACE_FORMAT,
+                    SERVER_HOST, SERVER_PORT, SERVER_WORKERS,
+                    SESSION_IDLE_TIMEOUT, MAX_SESSIONS)
+from telemetry import configure_tracing
+
+GREETING = "I am your AI News Agent. What are you looking for today?"
+SESSION_EXPIRED = "Unknown or expired session; start a new one with POST /sessions."
+EVICT_INTERVAL = 60
+
+HANDLER_KEY = web.AppKey('handler', AsyncTurnHandler)
+SESSIONS_KEY = web.AppKey('sessions', SessionManager)
+# Worker id -> unix socket of each other worker, and the clients used to reach them
+PEERS_KEY = web.AppKey('peers', dict)
+PROXIES_KEY = web.AppKey('proxies', dict)
+# Only the path and query are used on a unix socket
+PEER_URL = 'http://worker'
+RELAYED_HEADERS = ('Content-Type', 'Cache-Control')
+
+def build_handler() -> AsyncTurnHandler:
+    """Create the async services shared by every session in this process."""
+    router = IntentRouter(INTENT_ROUTER_THRESHOLD) if INTENT_ROUTER_ENABLED else None
+    return AsyncTurnHandler(AsyncLLMService(), AsyncNewsService(), AsyncScraperService(), router)
+
+def create_app(handler: AsyncTurnHandler = None, sessions: SessionManager = None,
+               worker: Optional[str] = None, peers: Optional[Dict[str, str]] = None) -> web.Application:
+    """Build the aiohttp application; pass handler to swap in other services.
+    
+    In a multi-worker server, worker is this worker's id and peers maps the
+    other workers' ids to their unix sockets.
+    """
+    app = web.Application()
+    id_prefix = f"{worker}-" if worker is not None else ''
+    app[SESSIONS_KEY] = sessions or SessionManager(SESSION_IDLE_TIMEOUT, MAX_SESSIONS, id_prefix)
+    app[PEERS_KEY] = peers or {}
+
+    async def services(app):
+        # Services own the pooled HTTP client, so they are created on the running loop
+        app[HANDLER_KEY] = handler or build_handler()
+        app[PROXIES_KEY] = {owner: ClientSession(connector=UnixConnector(path=path))
+                            for owner, path in app[PEERS_KEY].items()}
+        evictor = asyncio.create_task(_evict_idle(app[SESSIONS_KEY]))
+        yield
+        evictor.cancel()
+        for proxy in app[PROXIES_KEY].values():
+            await proxy.close()
+        await close_async_http_client()
+
+    app.cleanup_ctx.append(services)
+    app.router.add_get('/health', health)
+    app.router.add_get('/stats', stats)
+    app.router.add_post('/sessions', create_session)
+    app.router.add_delete('/sessions/{session_id}', delete_session)
+    app.router.add_post('/sessions/{session_id}/messages', post_message)
+    app.router.add_get('/sessions/{session_id}/ws', websocket)
+    return app
+
+async def health(request: web.Request) -> web.Response:
+    return web.json_response({'status': 'ok'})
+
+async def stats(request: web.Request) -> web.Response:
+    handler = request.app[HANDLER_KEY]
+    data = {'sessions': request.app[SESSIONS_KEY].stats(), 'llm': handler.llm.stats()}
+    if handler.router:
+        data['intent_router'] = handler.router.stats()
+    if hasattr(handler.news, 'cache_stats'):
+        data['search_cache'] = handler.news.cache_stats()
+    if handler.news.store is not None:
+        data['article_index'] = handler.news.index_stats()
+    if handler.news.dedup is not None:
+        data['dedup'] = handler.news.dedup_stats()
+    data['providers'] = handler.news.provider_stats()
+    data['scrape'] = handler.scraper.scrape_stats()
+    data['upstream'] = handler.scraper.scraper_client.transport.stats()
+    data['quota'] = {
+        'newsapi': handler.news.quota_stats(),
+        'firecrawl': _limiter_stats(handler.scraper.scraper_client.limiter),
+    }
+    data['single_flight'] = {
+        'newsapi': handler.news.news_client.flights.stats(),
+        'scrape': handler.scraper.scraper_client.flights.stats(),
+    }
+    return web.json_response(data)
+
+async def create_session(request: web.Request) -> web.Response:
+    sessions = request.app[SESSIONS_KEY]
+    session_id = sessions.create()
+    _greet(sessions, session_id)
+    return web.json_response({'session_id': session_id, 'greeting': GREETING}, status=201)
+
+async def delete_session(request: web.Request) -> web.StreamResponse:
+    peer = _peer(request)
+    if peer is not None:
+        return await _relay(request, peer)
+    removed = request.app[SESSIONS_KEY].remove(request.match_info['session_id'])
+    return web.json_response({'removed': removed is not None})
+
+async def post_message(request: web.Request) -> web.StreamResponse:
+    """Run one turn and stream its events back as Server-Sent Events."""
+    peer = _peer(request)
+    if peer is not None:
+        return await _relay(request, peer)
+    try:
+        body = await request.json()
+        message = str(body.get('message', '')).strip()
+    except (ValueError, AttributeError):
+        message = ''
+    if not message:
+        return web.json_response({'error': "Expected JSON body with a 'message'"}, status=400)
+
+    entry = request.app[SESSIONS_KEY].get(request.match_info['session_id'])
+    if entry is None:
+        return _unknown_session()
+    session, lock = entry
+    response = web.StreamResponse(headers={
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+    })
+    await response.prepare(request)
+
+    async with lock:
+        async for event in request.app[HANDLER_KEY].handle(session, message):
+            await response.write(f"data: {json.dumps(event)}\n\n".encode('utf-8'))
+
+    await response.write_eof()
+    return response
+
+async def websocket(request: web.Request) -> web.WebSocketResponse:
+    """Conversation over a WebSocket: each text frame is a user message."""
+    peer = _peer(request)
+    if peer is not None:
+        return await _relay_websocket(request, peer)
+    sessions = request.app[SESSIONS_KEY]
+    session_id = request.match_info['session_id']
+    if sessions.get(session_id) is None:
+        return _unknown_session()
+    ws = web.WebSocketResponse(heartbeat=30)
+    await ws.prepare(request)
+
+    async for msg in ws:
+        if msg.type != WSMsgType.TEXT:
+            break
+        message = msg.data.strip()
+        if message.lower() in ("exit", "quit"):
+            sessions.remove(session_id)
+            await ws.send_json({'type': 'message', 'text': "Goodbye!"})
+            break
+        if not message:
+            continue
+
+        # Re-fetch so the session's idle clock restarts on every message
+        entry = sessions.get(session_id)
+        if entry is None:
+            # Evicted while the socket sat idle; the client has to start over
+            await ws.send_json({'type': 'expired', 'text': SESSION_EXPIRED})
+            break
+        session, lock = entry
+        async with lock:
+            async for event in request.app[HANDLER_KEY].handle(session, message):
+                await ws.send_json(event)
+
+    await ws.close()
+    return ws
+
+def _limiter_stats(limiter):
+    return limiter.stats() if limiter is not None else None
+
+def _greet(sessions: SessionManager, session_id: str) -> None:
+    session, _ = sessions.get(session_id)
+    session.add_message("assistant", GREETING)
+
+def _unknown_session() -> web.Response:
+    return web.json_response({'error': SESSION_EXPIRED}, status=404)
+
+def _peer(request: web.Request) -> Optional[ClientSession]:
+    """The client for the worker holding the requested session, if that is another worker."""
+    owner = request.match_info['session_id'].partition('-')[0]
+    return request.app[PROXIES_KEY].get(owner)
+
+async def _relay(request: web.Request, peer: ClientSession) -> web.StreamResponse:
+    """Pass a request on to the worker holding its session and stream the reply back."""
+    try:
+        upstream = await peer.request(request.method, PEER_URL + str(request.rel_url),
+                                      data=await request.read(),
+                                      headers={'Content-Type': request.content_type})
+    except ClientConnectionError:
+        # That worker is gone, and its sessions with it
+        return _unknown_session()
+
+    async with upstream:
+        response = web.StreamResponse(status=upstream.status, headers={
+            name: upstream.headers[name] for name in RELAYED_HEADERS if name in upstream.headers
+        })
+        await response.prepare(request)
+        async for chunk in upstream.content.iter_any():
+            await response.write(chunk)
+        await response.write_eof()
+        return response
+
+async def _relay_websocket(request: web.Request, peer: ClientSession) -> web.StreamResponse:
+    """Bridge a WebSocket to the worker holding its session, frame by frame."""
+    try:
+        upstream = await peer.ws_connect(PEER_URL + str(request.rel_url))
+    except (ClientConnectionError, WSServerHandshakeError):
+        return _unknown_session()
+    ws = web.WebSocketResponse(heartbeat=30)
+    await ws.prepare(request)
+
+    async def client_to_worker():
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                break
+            await upstream.send_str(msg.data)
+        await upstream.close()
+
+    forward = asyncio.create_task(client_to_worker())
+    async for msg in upstream:
+        if msg.type != WSMsgType.TEXT:
+            break
+        await ws.send_str(msg.data)
+    forward.cancel()
+    await upstream.close()
+    await ws.close()
+    return ws
+
+async def _evict_idle(sessions: SessionManager) -> None:
+    while True:
+        await asyncio.sleep(EVICT_INTERVAL)
+        evicted = sessions.evict_idle()
+        if evicted:
+            print(f"[SESSIONS] Evicted {evicted} idle sessions")
+
+def run_worker(host: str, port: int, reuse_port: bool, worker: Optional[str] = None,
+               sockets: Optional[Dict[str, str]] = None) -> None:
+    configure_tracing(TRACE_ENABLED, TRACE_FILE, TRACE_FORMAT)
+    sockets = sockets or {}
+    peers = {owner: path for owner, path in sockets.items() if owner != worker}
+    web.run_app(create_app(worker=worker, peers=peers), host=host, port=port,
+                path=sockets.get(worker), reuse_port=reuse_port)
+
+def main():
+    parser = argparse.ArgumentParser(description="AI News Agent HTTP/WebSocket server")
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--workers', type=int, default=SERVER_WORKERS,
+                        help='worker processes sharing the port (SO_REUSEPORT)')
+    args = parser.parse_args()
+
+    if args.workers <= 1:
+        run_worker(args.host, args.port, reuse_port=False)
+        return
+
+    # Sessions live in the worker that created them and their ids start with
+    # its id. The kernel spreads connections over the workers, so each one also
+    # listens on a unix socket where the others relay requests for its sessions
+    socket_dir = tempfile.mkdtemp(prefix='news-agent-')
+    sockets = {str(i): os.path.join(socket_dir, f'worker-{i}.sock') for i in range(args.workers)}
+    workers = [
+        multiprocessing.Process(target=run_worker, args=(args.host, args.port, True, worker, sockets))
+        for worker in sockets
+    ]
+    for worker in workers:
+        worker.start()
+    # Stop the workers and remove their sockets on SIGTERM as on Ctrl+C
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        for worker in workers:
+            worker.join()
+    except (KeyboardInterrupt, SystemExit):
+        for worker in workers:
+            worker.terminate()
+    finally:
+        shutil.rmtree(socket_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
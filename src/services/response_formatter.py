@@ -1,126 +1,172 @@
-from typing import List, Dict, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
 import datetime
+import io
+import itertools
+from models import Article
+
+ARTICLE_RULE = "-" * 50 + "\n\n"
+OLDER_RESULTS_NOTE = "💡 Note: No very recent articles found. Showing results from the past week/month.\n\n"
 
 class ResponseFormatter:
     """Handles all response formatting for display."""
     
-    def format_articles(self, articles: List[Dict], query: str = "") -> str:
+    def format_articles(self, articles: List[Article], query: str = "") -> str:
         """Format articles for display in a clean, readable way."""
-        if not articles:
-            return "❌ No articles found for this query. Try a different search term or broader date range."
+        return ''.join(self.iter_articles(articles, query))
+    
+    def iter_articles(self, articles: Iterable[Article], query: str = "") -> Iterator[str]:
+        """Yield format_articles output piece by piece: header, one chunk per article, footer.
+        
+        articles may be a lazy iterable, in which case each article is rendered
+        as it arrives. The note about older results then comes right before the
+        first older article instead of under the header.
+        """
+        articles_iter = iter(articles)
+        first = next(articles_iter, None)
+        if first is None:
+            yield "❌ No articles found for this query. Try a different search term or broader date range."
+            return
         
         # Check if articles are older than expected (fallback was used)
         today = datetime.date.today()
         recent_threshold = today - datetime.timedelta(days=2)
-        older_articles = any(
-            datetime.datetime.fromisoformat(article.get('publishedAt', '').replace('Z', '+00:00')).date() < recent_threshold 
-            for article in articles if article.get('publishedAt')
-        )
-        
-        result = "🔍 Here are the latest headlines:\n"
-        result += "=" * 50 + "\n\n"
-        
-        # Add fallback notice if needed
-        if older_articles and any(word in query.lower() for word in ['today', 'latest', 'recent', 'current']):
-            result += "💡 Note: No very recent articles found. Showing results from the past week/month.\n\n"
-        
-        for i, article in enumerate(articles, 1):
-            title = article.get('title', 'No title')
-            description = article.get('description', 'No description available')
-            source = article.get('source', {}).get('name', 'Unknown')
-            published = article.get('publishedAt', 'Unknown')
-            
-            # Clean up the published date
-            if published != 'Unknown':
-                published = published.replace('T', ' at ').replace('Z', ' UTC')
-            
-            result += f"📰 {i}. {title}\n"
-            result += f"   🔗 Source: {source} | 📅 {published}\n"
-            result += f"   📋 {description}\n"
-            result += "-" * 50 + "\n\n"
-        
-        result += "💡 Type 'details [number]' to read the full article content.\n"
-        result += "   Example: 'details 1' for the first article"
-        
-        return result
+        wants_recent = any(word in query.lower() for word in ['today', 'latest', 'recent', 'current'])
+        
+        yield "🔍 Here are the latest headlines:\n" + "=" * 50 + "\n\n"
+        
+        # Add fallback notice if needed; a list can be checked up front
+        note_pending = wants_recent
+        if wants_recent and isinstance(articles, Sequence):
+            note_pending = False
+            if any(_is_older(article, recent_threshold) for article in articles):
+                yield OLDER_RESULTS_NOTE
+        
+        for i, article in enumerate(itertools.chain((first,), articles_iter), 1):
+            if note_pending and _is_older(article, recent_threshold):
+                note_pending = False
+                yield OLDER_RESULTS_NOTE
+            description = article.description or 'No description available'
+            yield (f"📰 {i}. {article.title}\n"
+                   f"   🔗 Source: {article.source} | 📅 {_published_label(article)}\n"
+                   f"   📋 {description}\n"
+                   f"{ARTICLE_RULE}")
+        
+        yield ("💡 Type 'details [number]' to read the full article content.\n"
+               "   Example: 'details 1' for the first article")
     
-    def format_article_detail(self, article: Dict, scraped_content: Optional[str] = None) -> str:
+    def format_article_detail(self, article: Article, scraped_content: Optional[str] = None) -> str:
         """Format single article with full details in a readable way."""
-        title = article.get('title', 'No title')
-        source = article.get('source', {}).get('name', 'Unknown')
-        author = article.get('author', 'Unknown')
-        published = article.get('publishedAt', 'Unknown')
-        
-        # Clean up the published date
-        if published != 'Unknown':
-            published = published.replace('T', ' at ').replace('Z', ' UTC')
+        return ''.join(self.iter_article_detail(article, scraped_content))
+    
+    def iter_article_detail(self, article: Article,
+                            scraped_content: Union[str, Iterable[str], None] = None) -> Iterator[str]:
+        """Yield format_article_detail output piece by piece.
         
-        url = article.get('url', '')
-        description = article.get('description', '')
+        The header and summary come first; scraped_content may be an iterable
+        of text chunks, each passed through as it is produced.
+        """
+        author = article.author
+        description = article.description
         
         # Create a clean, readable format
-        result = "=" * 60 + "\n"
-        result += f"📰 {title}\n"
-        result += "=" * 60 + "\n\n"
+        buffer = io.StringIO()
+        buffer.write("=" * 60 + "\n")
+        buffer.write(f"📰 {article.title}\n")
+        buffer.write("=" * 60 + "\n\n")
         
-        result += f"🔗 Source: {source}\n"
+        buffer.write(f"🔗 Source: {article.source}\n")
         if author and author != 'Unknown':
-            result += f"✍️  Author: {author}\n"
-        result += f"📅 Published: {published}\n"
-        result += f"🌐 URL: {url}\n\n"
+            buffer.write(f"✍️  Author: {author}\n")
+        buffer.write(f"📅 Published: {_published_label(article)}\n")
+        buffer.write(f"🌐 URL: {article.url}\n\n")
         
         # Add description if available
         if description:
-            result += "📋 Summary:\n"
-            result += f"{description}\n\n"
-        
-        # Handle content - prioritize scraped content
-        if scraped_content and scraped_content.strip() and not scraped_content.startswith("Could not extract"):
-            result += "📖 Full Article Content:\n"
-            result += "-" * 40 + "\n"
-            result += scraped_content + "\n"
+            buffer.write("📋 Summary:\n")
+            buffer.write(f"{description}\n\n")
+        yield buffer.getvalue()
+        
+        # Handle content - prioritize scraped content; a stream is judged by its first chunk
+        chunks = iter((scraped_content,) if isinstance(scraped_content, str) or scraped_content is None
+                      else scraped_content)
+        first = next((chunk for chunk in chunks if chunk and chunk.strip()), None)
+        if first is not None and not first.startswith("Could not extract"):
+            yield "📖 Full Article Content:\n" + "-" * 40 + "\n"
+            yield first
+            yield from chunks
+            yield "\n"
         else:
             # Use fallback content with better formatting
-            result += "📝 Available Article Details:\n"
-            result += "-" * 40 + "\n"
+            buffer = io.StringIO()
+            buffer.write("📝 Available Article Details:\n")
+            buffer.write("-" * 40 + "\n")
             
             if description:
-                result += description + "\n\n"
+                buffer.write(description + "\n\n")
             
             # Add any additional content from the API
-            api_content = article.get('content', '')
+            api_content = article.content
             if api_content and api_content != description:
-                result += api_content + "\n\n"
+                buffer.write(api_content + "\n\n")
             
-            result += "💡 Note: Full article content extraction was unsuccessful.\n"
-            result += "   Please visit the URL above to read the complete article.\n"
+            buffer.write("💡 Note: Full article content extraction was unsuccessful.\n")
+            buffer.write("   Please visit the URL above to read the complete article.\n")
+            yield buffer.getvalue()
         
-        result += "\n" + "=" * 60
-        return result
+        yield "\n" + "=" * 60
     
-    def get_fallback_content(self, article: Dict) -> str:
+    def get_fallback_content(self, article: Optional[Article]) -> str:
         """Return well-formatted article details when scraping fails."""
         if not article:
             return "❌ No article data available for fallback content."
         
         # Extract available information from the article
-        description = article.get('description', '').strip()
-        content = article.get('content', '').strip()
+        description = (article.description or '').strip()
+        content = (article.content or '').strip()
         
-        fallback_text = ""
+        parts = []
         
         if description:
-            fallback_text += f"{description}\n\n"
+            parts.append(f"{description}\n\n")
         
         if content and content != description and len(content) > len(description):
             # Sometimes content has more info than description
-            fallback_text += f"Additional Details:\n{content}\n\n"
+            parts.append(f"Additional Details:\n{content}\n\n")
+        
+        if not parts:
+            parts.append("📄 Limited article information available from the news source.\n\n")
         
-        if not fallback_text:
-            fallback_text = "📄 Limited article information available from the news source.\n\n"
+        parts.append("⚠️  Note: Unable to extract full article content.\n")
+        parts.append("   This may be due to website restrictions or paywall.\n")
+        parts.append("   Visit the URL above to read the complete article.")
         
-        fallback_text += "⚠️  Note: Unable to extract full article content.\n"
-        fallback_text += "   This may be due to website restrictions or paywall.\n"
-        fallback_text += "   Visit the URL above to read the complete article."
+        return ''.join(parts)
+    
+    def format_digest(self, headlines: Dict[str, List[Article]], title: str = "News Digest") -> str:
+        """Format per-topic headlines as a Markdown digest document."""
+        parts = [f"# {title} — {datetime.date.today():%A, %B %d, %Y}\n\n"]
+        
+        for topic, articles in headlines.items():
+            parts.append(f"## {topic}\n\n")
+            if not articles:
+                parts.append("_No articles found._\n\n")
+                continue
+            
+            for article in articles:
+                parts.append(f"- [{article.title}]({article.url}) — {article.source}")
+                parts.append(f", {article.published_date}\n" if article.published_at else "\n")
+            parts.append("\n")
         
-        return fallback_text
\ No newline at end of file
+        return ''.join(parts)
+
+def _is_older(article: Article, threshold: datetime.date) -> bool:
+    return article.published_at is not None and article.published_date < threshold
+
+def _published_label(article: Article) -> str:
+    """Publication time as shown to the user, e.g. '2025-10-01 at 08:15:00 UTC'."""
+    published = article.published_at
+    if published is None:
+        return 'Unknown'
+    # %-formatting the fields is several times cheaper than strftime
+    return '%04d-%02d-%02d at %02d:%02d:%02d UTC' % (published.year, published.month, published.day,
+                                                     published.hour, published.minute, published.second)
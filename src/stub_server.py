@@ -0,0 +1,32 @@
+import argparse
+import os
+from aiohttp import web
+from config import (UPSTREAM_CASSETTE, UPSTREAM_LATENCY, UPSTREAM_JITTER,
+                    UPSTREAM_ERROR_RATE, UPSTREAM_SEED)
+from transport import Cassette, FaultInjector
+from transport.stub_server import create_stub_app
+from transport.wire import SERVICES
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded Cerebras, NewsAPI and Firecrawl responses over HTTP")
+    parser.add_argument('--cassette', default=UPSTREAM_CASSETTE)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency', type=float, default=UPSTREAM_LATENCY, help='seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=UPSTREAM_JITTER, help='max extra random latency (seconds)')
+    parser.add_argument('--error-rate', type=float, default=UPSTREAM_ERROR_RATE,
+                        help='share of requests answered with HTTP 503')
+    parser.add_argument('--seed', type=int, default=UPSTREAM_SEED)
+    args = parser.parse_args()
+    
+    if not os.path.exists(args.cassette):
+        parser.error(f"cassette {args.cassette} not found (record one with UPSTREAM_MODE=record)")
+    faults = {service: FaultInjector(args.latency, args.jitter, args.error_rate, seed=args.seed + i)
+              for i, service in enumerate(SERVICES)}
+    base_url = f"http://{args.host}:{args.port}"
+    print(f"Point the clients here with CEREBRAS_BASE_URL={base_url} NEWSAPI_BASE_URL={base_url} "
+          f"FIRECRAWL_API_URL={base_url}")
+    web.run_app(create_stub_app(Cassette(args.cassette), faults), host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
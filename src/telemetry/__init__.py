@@ -0,0 +1,4 @@
+from .tracer import tracer, Tracer, Span, JsonLinesExporter, InMemoryExporter, configure_tracing
+
+__all__ = ['tracer', 'Tracer', 'Span', 'JsonLinesExporter', 'InMemoryExporter',
+           'configure_tracing']
@@ -0,0 +1,165 @@
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+class Span:
+    """One timed operation with attributes, nested under the span active when it started."""
+    
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent_id', 'attributes',
+                 'start_ns', 'end_ns', 'error', '_tracer', '_token', '_perf_start')
+    
+    def __init__(self, tracer: 'Tracer', name: str, attributes: Dict):
+        parent = _current_span.get()
+        self.name = name
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes
+        self.start_ns = 0
+        self.end_ns = 0
+        self.error = None
+        self._tracer = tracer
+        self._token = None
+        self._perf_start = 0
+    
+    def set(self, key: str, value) -> None:
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+    
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+    
+    def __enter__(self) -> 'Span':
+        self.start_ns = time.time_ns()
+        self._perf_start = time.perf_counter_ns()
+        self._token = _current_span.set(self)
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # Wall-clock start plus a monotonic duration keeps spans consistent
+        self.end_ns = self.start_ns + (time.perf_counter_ns() - self._perf_start)
+        if exc is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self._token)
+        self._tracer._finish(self)
+    
+    def to_record(self) -> Dict:
+        """Flat JSON record."""
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start_ns': self.start_ns,
+            'duration_ms': round(self.duration_ms, 3),
+            'attributes': self.attributes,
+            'error': self.error,
+        }
+    
+    def to_otel(self) -> Dict:
+        """Record in the OpenTelemetry OTLP/JSON span shape."""
+        record = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': 1,
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns),
+            'attributes': [{'key': key, 'value': _otel_value(value)}
+                           for key, value in self.attributes.items()],
+            'status': {'code': 2, 'message': self.error} if self.error else {'code': 1},
+        }
+        if self.parent_id:
+            record['parentSpanId'] = self.parent_id
+        return record
+
+class _NoopSpan:
+    """Shared do-nothing span returned while tracing is disabled."""
+    
+    __slots__ = ()
+    
+    def set(self, key: str, value) -> None:
+        pass
+    
+    def __enter__(self) -> '_NoopSpan':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+NOOP_SPAN = _NoopSpan()
+
+class JsonLinesExporter:
+    """Writes one JSON object per finished span to a file or stream."""
+    
+    def __init__(self, path: Optional[str] = None, otel: bool = False):
+        self.otel = otel
+        self._lock = threading.Lock()
+        self._stream = open(path, 'a', encoding='utf-8') if path else sys.stderr
+    
+    def export(self, span: Span) -> None:
+        record = span.to_otel() if self.otel else span.to_record()
+        line = json.dumps(record, default=str)
+        with self._lock:
+            self._stream.write(line + '\n')
+            self._stream.flush()
+
+class InMemoryExporter:
+    """Keeps finished spans in a list, e.g. for benchmarks."""
+    
+    def __init__(self):
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+    
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+class Tracer:
+    """Creates spans and hands finished ones to the configured exporters."""
+    
+    def __init__(self):
+        self.enabled = False
+        self.exporters = []
+    
+    def configure(self, enabled: bool, exporters: Optional[List] = None) -> None:
+        """Turn tracing on or off and replace the exporters."""
+        self.exporters = list(exporters or [])
+        self.enabled = enabled and bool(self.exporters)
+    
+    def span(self, name: str, **attributes):
+        """Start a span; use as a context manager. Near free when disabled."""
+        if not self.enabled:
+            return NOOP_SPAN
+        return Span(self, name, attributes)
+    
+    def _finish(self, span: Span) -> None:
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                print(f"[ERROR] Trace export failed: {e}")
+
+def _otel_value(value) -> Dict:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+# Process-wide tracer used by all services
+tracer = Tracer()
+
+def configure_tracing(enabled: bool, path: Optional[str] = None, fmt: str = 'json') -> None:
+    """Enable the global tracer with a JSON-lines exporter ('json' or 'otel' records)."""
+    exporters = [JsonLinesExporter(path, otel=(fmt == 'otel'))] if enabled else []
+    tracer.configure(enabled, exporters)
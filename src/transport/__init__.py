@@ -0,0 +1,7 @@
+from .cassette import Cassette, CassetteMiss, fingerprint
+from .faults import FaultInjector
+from .transport import Transport, LIVE, get_transport
+from .wire import to_plain
+
+__all__ = ['Cassette', 'CassetteMiss', 'fingerprint', 'FaultInjector', 'Transport', 'LIVE', 'get_transport',
+           'to_plain']
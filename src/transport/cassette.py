@@ -0,0 +1,131 @@
+import asyncio
+import atexit
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+from utils import upstream_status
+from .wire import loose_key
+
+# Recorded lines are appended to the file in batches of this many
+FLUSH_EVERY = 32
+
+class CassetteMiss(LookupError):
+    """No recorded interaction answers a replayed request."""
+
+def fingerprint(service: str, request: Dict) -> str:
+    """Stable hash of a canonical request."""
+    blob = json.dumps([service, request], sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()[:32]
+
+class Cassette:
+    """Recorded upstream interactions, kept in a JSON Lines file.
+    
+    New interactions are queued and appended to the file FLUSH_EVERY at a
+    time, on flush() and at exit, so recording costs the same per call however
+    long the cassette grows.
+    
+    Each interaction is a service name, its canonical request, and either the
+    response or the error it produced. Lookups try the exact request
+    fingerprint first, then a looser key (the last user message, the search
+    query, the page URL), so a cassette recorded on one day still answers
+    requests whose dates and prompt context have moved on. Requests matching
+    several interactions get them in turn, wrapping around.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.interactions: List[Dict] = []
+        self._exact: Dict[str, List[Dict]] = {}
+        self._loose: Dict[str, List[Dict]] = {}
+        self._turns: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # Held across taking and writing a batch, so lines land in record order
+        self._write_lock = threading.Lock()
+        self._pending: List[str] = []
+        
+        # Counters for monitoring
+        self.exact_hits = 0
+        self.loose_hits = 0
+        self.misses = 0
+        self.recorded = 0
+        
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        self._index(json.loads(line))
+                    except ValueError:
+                        # A run killed mid-write leaves a torn last line
+                        continue
+        atexit.register(self.flush)
+    
+    def _index(self, interaction: Dict) -> None:
+        service, request = interaction['service'], interaction['request']
+        self.interactions.append(interaction)
+        self._exact.setdefault(fingerprint(service, request), []).append(interaction)
+        self._loose.setdefault(f"{service}|{loose_key(service, request)}", []).append(interaction)
+    
+    def match(self, service: str, request: Dict) -> Dict:
+        """The interaction that answers request; raises CassetteMiss if none does."""
+        exact = fingerprint(service, request)
+        loose = f"{service}|{loose_key(service, request)}"
+        with self._lock:
+            for key, index in ((exact, self._exact), (loose, self._loose)):
+                candidates = index.get(key)
+                if candidates:
+                    turn = self._turns.get(key, 0)
+                    self._turns[key] = turn + 1
+                    if index is self._exact:
+                        self.exact_hits += 1
+                    else:
+                        self.loose_hits += 1
+                    return candidates[turn % len(candidates)]
+            self.misses += 1
+        raise CassetteMiss(f"no recorded {service} interaction for {loose_key(service, request)!r}")
+    
+    def record(self, service: str, request: Dict, response=None,
+               error: Optional[Exception] = None) -> None:
+        """Add an interaction; it is written with its batch."""
+        if self._add(service, request, response, error):
+            self.flush()
+    
+    async def record_async(self, service: str, request: Dict, response=None,
+                           error: Optional[Exception] = None) -> None:
+        """record() for the event loop; batches are written from a worker thread."""
+        if self._add(service, request, response, error):
+            await asyncio.to_thread(self.flush)
+    
+    def flush(self) -> None:
+        """Append the queued interactions to the file."""
+        with self._write_lock:
+            with self._lock:
+                lines, self._pending = self._pending, []
+            if lines:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.writelines(lines)
+    
+    def _add(self, service: str, request: Dict, response, error: Optional[Exception]) -> bool:
+        """Index an interaction and queue its line; True when a batch is ready to write."""
+        interaction = {'service': service, 'request': request}
+        if error is not None:
+            interaction['error'] = {'status': upstream_status(error), 'message': str(error)}
+        else:
+            interaction['response'] = response
+        line = json.dumps(interaction, ensure_ascii=False, default=str) + '\n'
+        with self._lock:
+            self._index(interaction)
+            self.recorded += 1
+            self._pending.append(line)
+            return len(self._pending) >= FLUSH_EVERY
+    
+    def stats(self) -> Dict:
+        return {
+            'path': self.path,
+            'interactions': len(self.interactions),
+            'exact_hits': self.exact_hits,
+            'loose_hits': self.loose_hits,
+            'misses': self.misses,
+            'recorded': self.recorded,
+        }
@@ -0,0 +1,53 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Optional, Tuple
+from utils import UpstreamError
+
+class FaultInjector:
+    """Latency and error injection for replayed upstream calls.
+    
+    Every call waits latency seconds plus uniform jitter, then fails with
+    UpstreamError(error_status) with probability error_rate, so the clients'
+    retry and fallback paths run as they would against a struggling upstream.
+    Draws come from a seeded generator: the same calls in the same order get
+    the same delays and failures.
+    """
+    
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = 503, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        
+        # Counters for monitoring
+        self.calls = 0
+        self.injected_errors = 0
+    
+    def draw(self) -> Tuple[float, Optional[int]]:
+        """Delay in seconds and error status (None for success) for the next call."""
+        with self._lock:
+            self.calls += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.injected_errors += 1
+                return delay, self.error_status
+            return delay, None
+    
+    def before_call(self) -> None:
+        delay, status = self.draw()
+        if delay > 0:
+            time.sleep(delay)
+        if status is not None:
+            raise UpstreamError(status, 'injected fault')
+    
+    async def before_call_async(self) -> None:
+        delay, status = self.draw()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if status is not None:
+            raise UpstreamError(status, 'injected fault')
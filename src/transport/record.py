@@ -0,0 +1,170 @@
+from types import SimpleNamespace
+from typing import Awaitable, Callable, Dict, List, Optional
+from utils import UpstreamError
+from .cassette import Cassette
+from .wire import cerebras_request, newsapi_request, newsapi_sdk_request, firecrawl_request, to_plain
+
+class _Recorder:
+    """Passes one service's calls to the real client and records each to a cassette."""
+    
+    service = ''
+    
+    def __init__(self, client, cassette: Cassette):
+        self._client = client
+        self.cassette = cassette
+    
+    def _call(self, request: Dict, call: Callable, keep: Callable = to_plain):
+        try:
+            response = call()
+        except Exception as e:
+            self.cassette.record(self.service, request, error=e)
+            raise
+        self.cassette.record(self.service, request, keep(response))
+        return response
+    
+    async def _call_async(self, request: Dict, call: Callable, keep: Callable = to_plain):
+        try:
+            response = await call()
+        except Exception as e:
+            await self.cassette.record_async(self.service, request, error=e)
+            raise
+        await self.cassette.record_async(self.service, request, keep(response))
+        return response
+    
+    def __getattr__(self, name):
+        # Anything not recorded goes straight to the real client
+        return getattr(self._client, name)
+
+def _content(response) -> Dict:
+    return {'content': response.choices[0].message.content}
+
+class _RecordingStream:
+    """Passes a completion stream through, recording its text when it ends or is closed.
+    
+    A caller that stops reading early records only what it read, which is all
+    a replay of the same conversation will read too.
+    """
+    
+    def __init__(self, stream, save: Callable[[str], None]):
+        self._stream = stream
+        self._save = save
+        self._parts: List[str] = []
+        self._saved = False
+    
+    def _collect(self, chunk):
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if delta:
+            self._parts.append(delta)
+        return chunk
+    
+    def _finish(self):
+        if not self._saved:
+            self._saved = True
+            self._save(''.join(self._parts))
+    
+    def __iter__(self):
+        for chunk in self._stream:
+            yield self._collect(chunk)
+        self._finish()
+    
+    def close(self):
+        self._finish()
+        self._stream.close()
+
+class _AsyncRecordingStream(_RecordingStream):
+    """_RecordingStream for async streams; save is a coroutine function."""
+    
+    async def _finish_async(self):
+        if not self._saved:
+            self._saved = True
+            await self._save(''.join(self._parts))
+    
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield self._collect(chunk)
+        await self._finish_async()
+    
+    async def close(self):
+        await self._finish_async()
+        await self._stream.close()
+
+class RecordingCerebras(_Recorder):
+    """Cerebras SDK client that records chat completions."""
+    
+    service = 'cerebras'
+    
+    def __init__(self, client, cassette: Cassette):
+        super().__init__(client, cassette)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+    
+    def create(self, **kwargs):
+        request = cerebras_request(kwargs)
+        if not kwargs.get('stream'):
+            return self._call(request, lambda: self._client.chat.completions.create(**kwargs), _content)
+        try:
+            stream = self._client.chat.completions.create(**kwargs)
+        except Exception as e:
+            self.cassette.record(self.service, request, error=e)
+            raise
+        return _RecordingStream(stream, self._saver(request))
+    
+    def _saver(self, request: Dict) -> Callable[[str], None]:
+        return lambda content: self.cassette.record(self.service, request, {'content': content})
+
+class AsyncRecordingCerebras(RecordingCerebras):
+    """AsyncCerebras counterpart of RecordingCerebras."""
+    
+    async def create(self, **kwargs):
+        request = cerebras_request(kwargs)
+        if not kwargs.get('stream'):
+            return await self._call_async(request, lambda: self._client.chat.completions.create(**kwargs),
+                                          _content)
+        try:
+            stream = await self._client.chat.completions.create(**kwargs)
+        except Exception as e:
+            await self.cassette.record_async(self.service, request, error=e)
+            raise
+        return _AsyncRecordingStream(stream, self._async_saver(request))
+    
+    def _async_saver(self, request: Dict) -> Callable[[str], Awaitable[None]]:
+        return lambda content: self.cassette.record_async(self.service, request, {'content': content})
+
+class RecordingNewsApi(_Recorder):
+    """NewsApiClient that records get_everything calls."""
+    
+    service = 'newsapi'
+    
+    def get_everything(self, **kwargs) -> Dict:
+        return self._call(newsapi_sdk_request(kwargs), lambda: self._client.get_everything(**kwargs))
+
+class AsyncRecordingNewsApi(_Recorder):
+    """Pooled HTTP client that records AsyncNewsAPIClient's /everything requests."""
+    
+    service = 'newsapi'
+    
+    async def get(self, url: str, params: Optional[Dict] = None, **kwargs):
+        request = newsapi_request(params or {})
+        response = await self._client.get(url, params=params, **kwargs)
+        # NewsAPI reports errors in the body as well as the status
+        if response.status_code == 200:
+            await self.cassette.record_async(self.service, request, response.json())
+        else:
+            await self.cassette.record_async(self.service, request,
+                                             error=UpstreamError(response.status_code, response.text[:200]))
+        return response
+
+class RecordingFirecrawl(_Recorder):
+    """Firecrawl SDK client that records scrapes."""
+    
+    service = 'firecrawl'
+    
+    def scrape(self, url: str, **kwargs):
+        request = firecrawl_request(url, kwargs.get('formats'), kwargs.get('only_main_content'))
+        return self._call(request, lambda: self._client.scrape(url, **kwargs))
+
+class AsyncRecordingFirecrawl(RecordingFirecrawl):
+    """AsyncFirecrawl counterpart of RecordingFirecrawl."""
+    
+    async def scrape(self, url: str, **kwargs):
+        request = firecrawl_request(url, kwargs.get('formats'), kwargs.get('only_main_content'))
+        return await self._call_async(request, lambda: self._client.scrape(url, **kwargs))
@@ -0,0 +1,121 @@
+from types import SimpleNamespace
+from typing import Dict, Optional
+from utils import UpstreamError
+from .cassette import Cassette
+from .faults import FaultInjector
+from .wire import cerebras_request, newsapi_request, newsapi_sdk_request, firecrawl_request
+
+# Replayed completions stream in pieces about the size of real token deltas
+STREAM_CHUNK_CHARS = 8
+
+class _Replayer:
+    """Answers one service's calls from a cassette, after injected faults."""
+    
+    service = ''
+    
+    def __init__(self, cassette: Cassette, faults: Optional[FaultInjector] = None):
+        self.cassette = cassette
+        self.faults = faults or FaultInjector()
+    
+    def _answer(self, request: Dict):
+        interaction = self.cassette.match(self.service, request)
+        error = interaction.get('error')
+        if error is not None:
+            raise UpstreamError(error.get('status') or 500, error.get('message', ''))
+        return interaction.get('response')
+    
+    def _respond(self, request: Dict):
+        self.faults.before_call()
+        return self._answer(request)
+    
+    async def _respond_async(self, request: Dict):
+        await self.faults.before_call_async()
+        return self._answer(request)
+
+def _completion(content: str) -> SimpleNamespace:
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+def _deltas(content: str):
+    for i in range(0, len(content), STREAM_CHUNK_CHARS):
+        delta = SimpleNamespace(content=content[i:i + STREAM_CHUNK_CHARS])
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+class _ReplayStream:
+
+    def __init__(self, content: str):
+        self._chunks = _deltas(content)
+    
+    def __iter__(self):
+        return self._chunks
+    
+    def close(self):
+        self._chunks.close()
+
+class _AsyncReplayStream(_ReplayStream):
+
+    async def __aiter__(self):
+        for chunk in self._chunks:
+            yield chunk
+    
+    async def close(self):
+        self._chunks.close()
+
+class ReplayCerebras(_Replayer):
+    """Cerebras SDK client answering chat completions from a cassette."""
+    
+    service = 'cerebras'
+    
+    def __init__(self, cassette: Cassette, faults: Optional[FaultInjector] = None):
+        super().__init__(cassette, faults)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+    
+    def create(self, stream: bool = False, **kwargs):
+        content = self._respond(cerebras_request(kwargs))['content']
+        return _ReplayStream(content) if stream else _completion(content)
+
+class AsyncReplayCerebras(ReplayCerebras):
+    """AsyncCerebras counterpart of ReplayCerebras."""
+    
+    async def create(self, stream: bool = False, **kwargs):
+        content = (await self._respond_async(cerebras_request(kwargs)))['content']
+        return _AsyncReplayStream(content) if stream else _completion(content)
+
+class ReplayNewsApi(_Replayer):
+    """NewsApiClient answering get_everything from a cassette."""
+    
+    service = 'newsapi'
+    
+    def get_everything(self, **kwargs) -> Dict:
+        return self._respond(newsapi_sdk_request(kwargs))
+
+class _Response:
+    """The parts of an httpx response AsyncNewsAPIClient reads."""
+    
+    def __init__(self, status_code: int, data: Dict):
+        self.status_code = status_code
+        self._data = data
+    
+    def json(self) -> Dict:
+        return self._data
+
+class AsyncReplayNewsApi(_Replayer):
+    """Pooled HTTP client answering AsyncNewsAPIClient's /everything requests from a cassette."""
+    
+    service = 'newsapi'
+    
+    async def get(self, url: str, params: Optional[Dict] = None, **kwargs) -> _Response:
+        return _Response(200, await self._respond_async(newsapi_request(params or {})))
+
+class ReplayFirecrawl(_Replayer):
+    """Firecrawl SDK client answering scrapes from a cassette."""
+    
+    service = 'firecrawl'
+    
+    def scrape(self, url: str, formats=None, only_main_content: Optional[bool] = None, **kwargs):
+        return self._respond(firecrawl_request(url, formats, only_main_content))
+
+class AsyncReplayFirecrawl(ReplayFirecrawl):
+    """AsyncFirecrawl counterpart of ReplayFirecrawl."""
+    
+    async def scrape(self, url: str, formats=None, only_main_content: Optional[bool] = None, **kwargs):
+        return await self._respond_async(firecrawl_request(url, formats, only_main_content))
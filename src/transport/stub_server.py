@@ -0,0 +1,101 @@
+import json
+import time
+from typing import Dict, Optional
+from aiohttp import web
+from utils import UpstreamError
+from .cassette import Cassette, CassetteMiss
+from .faults import FaultInjector
+from .replay import STREAM_CHUNK_CHARS
+from .wire import cerebras_request, newsapi_request, firecrawl_request
+
+CASSETTE_KEY = web.AppKey('cassette', Cassette)
+FAULTS_KEY = web.AppKey('faults', dict)
+
+def create_stub_app(cassette: Cassette, faults: Optional[Dict[str, FaultInjector]] = None) -> web.Application:
+    """An HTTP server speaking the Cerebras, NewsAPI and Firecrawl wire formats from a cassette.
+    
+    Point the real SDKs at it (CEREBRAS_BASE_URL, NEWSAPI_BASE_URL,
+    FIRECRAWL_API_URL) to exercise their HTTP stacks without the network.
+    Injected faults come back as HTTP error statuses.
+    """
+    app = web.Application()
+    app[CASSETTE_KEY] = cassette
+    app[FAULTS_KEY] = faults or {}
+    app.router.add_get('/v1/tcp_warming', _tcp_warming)
+    app.router.add_post('/v1/chat/completions', _chat_completions)
+    app.router.add_get('/v2/everything', _everything)
+    app.router.add_post('/v2/scrape', _scrape)
+    app.router.add_get('/stats', _stats)
+    return app
+
+async def _answer(request: web.Request, service: str, canonical: Dict):
+    """The recorded response for a request, or an error response to send instead."""
+    faults = request.app[FAULTS_KEY].get(service)
+    try:
+        if faults is not None:
+            await faults.before_call_async()
+        interaction = request.app[CASSETTE_KEY].match(service, canonical)
+    except UpstreamError as e:
+        return None, web.json_response({'error': str(e)}, status=e.status_code)
+    except CassetteMiss as e:
+        return None, web.json_response({'error': str(e)}, status=404)
+    error = interaction.get('error')
+    if error is not None:
+        return None, web.json_response({'error': error.get('message', '')}, status=error.get('status') or 500)
+    return interaction.get('response'), None
+
+async def _tcp_warming(request: web.Request) -> web.Response:
+    return web.Response(text='')
+
+async def _chat_completions(request: web.Request) -> web.StreamResponse:
+    body = await request.json()
+    response, failure = await _answer(request, 'cerebras', cerebras_request(body))
+    if failure is not None:
+        return failure
+    content = response['content']
+    created = int(time.time())
+    if not body.get('stream'):
+        return web.json_response({
+            'id': 'stub-completion', 'object': 'chat.completion', 'created': created,
+            'model': body.get('model'), 'system_fingerprint': 'stub',
+            'choices': [{'index': 0, 'finish_reason': 'stop',
+                         'message': {'role': 'assistant', 'content': content}}],
+            'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0},
+            'time_info': {},
+        })
+    
+    stream = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+    await stream.prepare(request)
+    pieces = [content[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(content), STREAM_CHUNK_CHARS)]
+    for piece in pieces + ['']:
+        chunk = {
+            'id': 'stub-completion', 'object': 'chat.completion.chunk', 'created': created,
+            'model': body.get('model'), 'system_fingerprint': 'stub',
+            'choices': [{'index': 0, 'delta': {'content': piece} if piece else {},
+                         'finish_reason': None if piece else 'stop'}],
+        }
+        await stream.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+    await stream.write(b"data: [DONE]\n\n")
+    await stream.write_eof()
+    return stream
+
+async def _everything(request: web.Request) -> web.Response:
+    response, failure = await _answer(request, 'newsapi', newsapi_request(dict(request.query)))
+    if failure is not None:
+        return failure
+    return web.json_response(response)
+
+async def _scrape(request: web.Request) -> web.Response:
+    body = await request.json()
+    canonical = firecrawl_request(body.get('url'), body.get('formats'), body.get('onlyMainContent'))
+    response, failure = await _answer(request, 'firecrawl', canonical)
+    if failure is not None:
+        return failure
+    if response is None:
+        return web.json_response({'success': False, 'error': 'No content was recorded for this page'})
+    return web.json_response({'success': True, 'data': response})
+
+async def _stats(request: web.Request) -> web.Response:
+    faults = {service: {'calls': injector.calls, 'injected_errors': injector.injected_errors}
+              for service, injector in request.app[FAULTS_KEY].items()}
+    return web.json_response({'cassette': request.app[CASSETTE_KEY].stats(), 'faults': faults})
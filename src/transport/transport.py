@@ -0,0 +1,97 @@
+import threading
+from typing import Any, Callable, Dict, Optional, Union
+from .cassette import Cassette
+from .faults import FaultInjector
+from .wire import SERVICES
+from .record import (RecordingCerebras, AsyncRecordingCerebras, RecordingNewsApi,
+                     AsyncRecordingNewsApi, RecordingFirecrawl, AsyncRecordingFirecrawl)
+from .replay import (ReplayCerebras, AsyncReplayCerebras, ReplayNewsApi, AsyncReplayNewsApi,
+                     ReplayFirecrawl, AsyncReplayFirecrawl)
+
+MODES = ('live', 'record', 'replay')
+
+# (service, async) -> wrapper; the async NewsAPI client talks to the pooled HTTP client
+RECORDERS = {
+    ('cerebras', False): RecordingCerebras, ('cerebras', True): AsyncRecordingCerebras,
+    ('newsapi', False): RecordingNewsApi, ('newsapi', True): AsyncRecordingNewsApi,
+    ('firecrawl', False): RecordingFirecrawl, ('firecrawl', True): AsyncRecordingFirecrawl,
+}
+REPLAYERS = {
+    ('cerebras', False): ReplayCerebras, ('cerebras', True): AsyncReplayCerebras,
+    ('newsapi', False): ReplayNewsApi, ('newsapi', True): AsyncReplayNewsApi,
+    ('firecrawl', False): ReplayFirecrawl, ('firecrawl', True): AsyncReplayFirecrawl,
+}
+
+class Transport:
+    """How the upstream clients reach Cerebras, NewsAPI and Firecrawl.
+    
+    In 'live' mode clients get the real SDK objects; 'record' wraps them so
+    every call is also saved to the cassette; 'replay' answers every call from
+    the cassette, through fault injection, without building an SDK or touching
+    the network. faults is one FaultInjector for all services or a dict of them
+    by service name. base_urls points the live SDKs at other hosts, e.g. the
+    stub server.
+    """
+    
+    def __init__(self, mode: str = 'live', cassette: Optional[Cassette] = None,
+                 faults: Union[FaultInjector, Dict[str, FaultInjector], None] = None,
+                 base_urls: Optional[Dict[str, str]] = None):
+        if mode not in MODES:
+            raise ValueError(f"unknown transport mode '{mode}' (expected one of {', '.join(MODES)})")
+        if mode != 'live' and cassette is None:
+            raise ValueError(f"transport mode '{mode}' needs a cassette")
+        self.mode = mode
+        self.cassette = cassette
+        self.faults = faults
+        self.base_urls = base_urls or {}
+    
+    def connect(self, service: str, build: Callable[[Optional[str]], Any], is_async: bool = False):
+        """The client object for service; build(base_url) makes the real SDK client."""
+        if self.mode == 'replay':
+            return REPLAYERS[(service, is_async)](self.cassette, self.faults_for(service))
+        client = build(self.base_url(service))
+        if self.mode == 'record':
+            return RECORDERS[(service, is_async)](client, self.cassette)
+        return client
+    
+    def base_url(self, service: str) -> Optional[str]:
+        return self.base_urls.get(service) or None
+    
+    def faults_for(self, service: str) -> Optional[FaultInjector]:
+        if isinstance(self.faults, dict):
+            return self.faults.get(service)
+        return self.faults
+    
+    def stats(self) -> Dict:
+        faults = {}
+        if self.mode == 'replay':
+            for service in SERVICES:
+                injector = self.faults_for(service)
+                if injector is not None:
+                    faults[service] = {'calls': injector.calls, 'injected_errors': injector.injected_errors}
+        return {
+            'mode': self.mode,
+            'cassette': self.cassette.stats() if self.cassette is not None else None,
+            'faults': faults,
+        }
+
+# What clients use when they are not given a transport
+LIVE = Transport()
+
+_shared: Optional[Transport] = None
+_shared_lock = threading.Lock()
+
+def get_transport(mode: str = 'live', cassette_path: Optional[str] = None,
+                  faults: Union[FaultInjector, Dict[str, FaultInjector], None] = None,
+                  base_urls: Optional[Dict[str, str]] = None) -> Transport:
+    """Return the process-wide transport, creating it on first use.
+    
+    Every client shares it, so all services record into, and replay from,
+    one cassette instead of overwriting each other's files.
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            cassette = Cassette(cassette_path) if mode != 'live' and cassette_path else None
+            _shared = Transport(mode, cassette, faults, base_urls)
+        return _shared
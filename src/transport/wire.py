@@ -0,0 +1,61 @@
+from typing import Any, Dict, Optional
+from cache import normalize_url
+
+# Recording, replay and the stub server all describe a call by the same
+# canonical request, so a cassette recorded through the SDKs answers the
+# async HTTP path and the stub server too
+SERVICES = ('cerebras', 'newsapi', 'firecrawl')
+NEWSAPI_PARAMS = ('q', 'from', 'to', 'language', 'sortBy', 'pageSize')
+
+def cerebras_request(params: Dict) -> Dict:
+    """A chat completion request; streaming or not answers the same."""
+    return {
+        'model': params.get('model'),
+        'messages': [{'role': m.get('role'), 'content': m.get('content')}
+                     for m in params.get('messages') or []],
+        'temperature': params.get('temperature'),
+        'max_tokens': params.get('max_tokens'),
+    }
+
+def newsapi_request(params: Dict) -> Dict:
+    """An /everything request from its query parameters."""
+    request = {key: params.get(key) for key in NEWSAPI_PARAMS}
+    if request['pageSize'] is not None:
+        request['pageSize'] = int(request['pageSize'])
+    return request
+
+def newsapi_sdk_request(kwargs: Dict) -> Dict:
+    """An /everything request from NewsApiClient.get_everything keyword arguments."""
+    return newsapi_request({
+        'q': kwargs.get('q'),
+        'from': kwargs.get('from_param'),
+        'to': kwargs.get('to'),
+        'language': kwargs.get('language'),
+        'sortBy': kwargs.get('sort_by'),
+        'pageSize': kwargs.get('page_size'),
+    })
+
+def firecrawl_request(url: str, formats: Any = None, only_main_content: Optional[bool] = None) -> Dict:
+    # The timeout is left out: it adapts to observed latency, so it differs between runs
+    return {'url': url, 'formats': to_plain(formats), 'onlyMainContent': only_main_content}
+
+def loose_key(service: str, request: Dict) -> str:
+    """What a request is about, ignoring dates and prompt context that change between runs."""
+    if service == 'cerebras':
+        users = [m['content'] for m in request.get('messages') or [] if m.get('role') == 'user']
+        return ' '.join(users[-1].lower().split()) if users else ''
+    if service == 'newsapi':
+        return f"{(request.get('q') or '').lower()}|{request.get('pageSize')}"
+    return normalize_url(request.get('url') or '')
+
+def to_plain(value: Any) -> Any:
+    """SDK response objects (pydantic models, namespaces) as JSON-compatible data."""
+    if hasattr(value, 'model_dump'):
+        return value.model_dump(mode='json', exclude_none=True)
+    if isinstance(value, dict):
+        return {key: to_plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_plain(item) for item in value]
+    if hasattr(value, '__dict__'):
+        return to_plain(vars(value))
+    return value
@@ -0,0 +1,11 @@
+from .single_flight import SingleFlight, AsyncSingleFlight
+from .rate_limiter import (RateLimiter, QuotaExceeded, get_limiter, request_priority,
+                           current_priority, INTERACTIVE, BACKGROUND)
+from .retry import UpstreamError, call_upstream, call_upstream_async, upstream_status, backoff_delay
+from .latency import LatencyHistogram, AdaptiveTimeouts
+from .circuit_breaker import CircuitBreaker
+
+__all__ = ['SingleFlight', 'AsyncSingleFlight', 'RateLimiter', 'QuotaExceeded', 'get_limiter',
+           'request_priority', 'current_priority', 'INTERACTIVE', 'BACKGROUND',
+           'UpstreamError', 'call_upstream', 'call_upstream_async', 'upstream_status',
+           'backoff_delay', 'LatencyHistogram', 'AdaptiveTimeouts', 'CircuitBreaker']
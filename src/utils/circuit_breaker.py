@@ -0,0 +1,76 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List
+
+class CircuitBreaker:
+    """Per-key circuit breakers, e.g. one per scraped domain.
+    
+    A key's circuit opens after failure_threshold consecutive failures and
+    then refuses calls for reset_timeout seconds. After that one trial call is
+    let through (half-open): success closes the circuit, failure reopens it.
+    """
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 300.0,
+                 max_keys: int = 1000):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_keys = max_keys
+        # key -> [consecutive failures, opened at (0 when closed), trial in flight]
+        self._circuits: 'OrderedDict[str, List]' = OrderedDict()
+        self._lock = threading.Lock()
+        
+        # Counters for monitoring
+        self.rejected = 0
+        self.opened = 0
+    
+    def allow(self, key: str) -> bool:
+        """Whether a call for key may go ahead now."""
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None or not circuit[1]:
+                return True
+            if time.monotonic() - circuit[1] >= self.reset_timeout and not circuit[2]:
+                circuit[2] = True
+                return True
+            self.rejected += 1
+            return False
+    
+    def record_success(self, key: str) -> None:
+        with self._lock:
+            self._circuits.pop(key, None)
+    
+    def record_failure(self, key: str) -> None:
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None:
+                circuit = self._circuits[key] = [0, 0.0, False]
+                while len(self._circuits) > self.max_keys:
+                    self._circuits.popitem(last=False)
+            circuit[0] += 1
+            if circuit[2] or (not circuit[1] and circuit[0] >= self.failure_threshold):
+                # A failed trial reopens for another full reset_timeout
+                if not circuit[1]:
+                    self.opened += 1
+                circuit[1] = time.monotonic()
+                circuit[2] = False
+    
+    def release(self, key: str) -> None:
+        """End a half-open trial that finished with no outcome, so another may run."""
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is not None:
+                circuit[2] = False
+    
+    def is_open(self, key: str) -> bool:
+        with self._lock:
+            circuit = self._circuits.get(key)
+            return bool(circuit and circuit[1])
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'open': sorted(key for key, circuit in self._circuits.items() if circuit[1]),
+                'opened': self.opened,
+                'rejected': self.rejected,
+            }
@@ -0,0 +1,107 @@
+import math
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+# Bucket upper bounds grow by 25% from 50 ms to ~10 min; quantiles are read
+# off these bounds, so they are at most 25% high
+FIRST_BOUND = 0.05
+GROWTH = 1.25
+BOUNDS = [FIRST_BOUND * GROWTH ** i for i in range(43)]
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram that forgets old samples.
+    
+    Counts are halved once they total max_samples, so the quantiles follow a
+    site that gets faster or slower instead of averaging over all time.
+    """
+    
+    def __init__(self, max_samples: int = 200):
+        self.max_samples = max_samples
+        self.counts: List[float] = [0.0] * (len(BOUNDS) + 1)
+        self.total = 0.0
+    
+    def observe(self, seconds: float) -> None:
+        if seconds <= FIRST_BOUND:
+            bucket = 0
+        else:
+            bucket = min(len(BOUNDS), math.ceil(math.log(seconds / FIRST_BOUND, GROWTH)))
+        self.counts[bucket] += 1
+        self.total += 1
+        if self.total >= self.max_samples:
+            self.counts = [count / 2 for count in self.counts]
+            self.total /= 2
+    
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile (0 when empty)."""
+        wanted = q * self.total
+        seen = 0.0
+        for bound, count in zip(BOUNDS, self.counts):
+            seen += count
+            if seen >= wanted and seen > 0:
+                return bound
+        return BOUNDS[-1]
+
+class AdaptiveTimeouts:
+    """Per-domain deadlines and hedge delays from observed scrape latencies.
+    
+    A domain's deadline is its p99 times multiplier, kept within [minimum,
+    maximum]; hedge_after is its p95. Until a domain has min_samples, the
+    figures for all domains together are used, and default before that.
+    """
+    
+    def __init__(self, default: float = 30.0, minimum: float = 5.0, maximum: float = 120.0,
+                 multiplier: float = 2.0, min_samples: int = 5, max_domains: int = 1000):
+        self.default = default
+        self.minimum = minimum
+        self.maximum = maximum
+        self.multiplier = multiplier
+        self.min_samples = min_samples
+        self.max_domains = max_domains
+        self._overall = LatencyHistogram(max_samples=2000)
+        self._domains: 'OrderedDict[str, LatencyHistogram]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def observe(self, domain: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._domains.get(domain)
+            if histogram is None:
+                histogram = self._domains[domain] = LatencyHistogram()
+                while len(self._domains) > self.max_domains:
+                    self._domains.popitem(last=False)
+            self._domains.move_to_end(domain)
+            histogram.observe(seconds)
+            self._overall.observe(seconds)
+    
+    def quantile(self, domain: str, q: float) -> Optional[float]:
+        """The domain's q-th quantile, falling back to all domains; None without data."""
+        with self._lock:
+            for histogram in (self._domains.get(domain), self._overall):
+                if histogram is not None and histogram.total >= self.min_samples:
+                    return histogram.quantile(q)
+        return None
+    
+    def deadline(self, domain: str) -> float:
+        p99 = self.quantile(domain, 0.99)
+        if p99 is None:
+            return self.default
+        return min(self.maximum, max(self.minimum, p99 * self.multiplier))
+    
+    def hedge_after(self, domain: str) -> float:
+        """When to start a second fetch: past the domain's p95, or at a quarter of the default."""
+        p95 = self.quantile(domain, 0.95)
+        return p95 if p95 is not None else self.default / 4
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            domains = list(self._domains.items())[-20:]
+            return {
+                'domains_tracked': len(self._domains),
+                'overall_p50_s': self._overall.quantile(0.5),
+                'overall_p95_s': self._overall.quantile(0.95),
+                'recent_domains': {
+                    domain: {'p50_s': histogram.quantile(0.5), 'p95_s': histogram.quantile(0.95),
+                             'samples': round(histogram.total)}
+                    for domain, histogram in domains
+                },
+            }
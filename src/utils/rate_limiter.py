@@ -0,0 +1,171 @@
+import asyncio
+import contextlib
+import contextvars
+import datetime
+import threading
+import time
+from typing import Dict, Optional
+
+# Priority classes: people waiting on a reply come before prefetch/batch work
+INTERACTIVE = 0
+BACKGROUND = 1
+
+_priority = contextvars.ContextVar('request_priority', default=INTERACTIVE)
+
+@contextlib.contextmanager
+def request_priority(priority: int):
+    """Run the enclosed upstream calls (and tasks/threads started with a copied context) at priority."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+def current_priority() -> int:
+    return _priority.get()
+
+class QuotaExceeded(Exception):
+    """The upstream's daily request budget is used up for this priority class."""
+
+class RateLimiter:
+    """Thread-safe token bucket with a daily quota and two priority classes.
+    
+    Background requests never take a token while an interactive request is
+    waiting, and may only use the share of the daily quota not reserved for
+    interactive traffic. penalize() pauses everyone after a 429/5xx.
+    """
+    
+    def __init__(self, rate: float, burst: int = 1, daily_quota: int = 0,
+                 interactive_reserve: float = 0.0):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.daily_quota = daily_quota
+        self.interactive_reserve = interactive_reserve
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._waiting_interactive = 0
+        self._day = datetime.date.today()
+        self._lock = threading.Lock()
+        
+        # Counters for monitoring
+        self.used_today = 0
+        self.waited = 0.0
+        self.rejected = 0
+    
+    def acquire(self, priority: Optional[int] = None) -> float:
+        """Block until a request may be sent; returns the seconds waited.
+        
+        Raises QuotaExceeded if the daily budget for the priority is spent.
+        """
+        priority = current_priority() if priority is None else priority
+        waited = 0.0
+        self._enter(priority)
+        try:
+            while True:
+                delay = self._try_take(priority)
+                if delay == 0:
+                    return waited
+                time.sleep(delay)
+                waited += delay
+        finally:
+            self._leave(priority, waited)
+    
+    async def acquire_async(self, priority: Optional[int] = None) -> float:
+        """Event-loop version of acquire()."""
+        priority = current_priority() if priority is None else priority
+        waited = 0.0
+        self._enter(priority)
+        try:
+            while True:
+                delay = self._try_take(priority)
+                if delay == 0:
+                    return waited
+                await asyncio.sleep(delay)
+                waited += delay
+        finally:
+            self._leave(priority, waited)
+    
+    def penalize(self, delay: float) -> None:
+        """Hold all requests for delay seconds, e.g. after a 429 or a 5xx."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+    
+    def remaining_today(self) -> Optional[int]:
+        if not self.daily_quota:
+            return None
+        with self._lock:
+            self._roll_day()
+            return max(0, self.daily_quota - self.used_today)
+    
+    def stats(self) -> Dict:
+        return {
+            'rate': self.rate,
+            'used_today': self.used_today,
+            'daily_quota': self.daily_quota or None,
+            'remaining_today': self.remaining_today(),
+            'waited_s': round(self.waited, 3),
+            'rejected': self.rejected,
+        }
+    
+    def _try_take(self, priority: int) -> float:
+        """Take a token if allowed now; otherwise return how long to wait."""
+        with self._lock:
+            self._roll_day()
+            if self.daily_quota and self.used_today >= self._budget(priority):
+                self.rejected += 1
+                raise QuotaExceeded(f"daily quota of {self.daily_quota} requests used up")
+            
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if now < self._paused_until:
+                return self._paused_until - now
+            if priority != INTERACTIVE and self._waiting_interactive:
+                return max(0.01, 1 / self.rate)
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self.used_today += 1
+                return 0
+            return (1 - self._tokens) / self.rate
+    
+    def _budget(self, priority: int) -> float:
+        if priority == INTERACTIVE:
+            return self.daily_quota
+        return self.daily_quota * (1 - self.interactive_reserve)
+    
+    def _roll_day(self) -> None:
+        today = datetime.date.today()
+        if today != self._day:
+            self._day = today
+            self.used_today = 0
+    
+    def _enter(self, priority: int) -> None:
+        if priority == INTERACTIVE:
+            with self._lock:
+                self._waiting_interactive += 1
+    
+    def _leave(self, priority: int, waited: float) -> None:
+        with self._lock:
+            if priority == INTERACTIVE:
+                self._waiting_interactive -= 1
+            self.waited += waited
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def get_limiter(name: str, rate: float, burst: int = 1, daily_quota: int = 0,
+                interactive_reserve: float = 0.0) -> Optional[RateLimiter]:
+    """Return the process-wide limiter for an upstream, creating it on first use.
+    
+    Every client of the same upstream shares it, so the budget is per API key
+    rather than per service instance. A rate of 0 means unlimited.
+    """
+    if rate <= 0 and not daily_quota:
+        return None
+    with _limiters_lock:
+        if name not in _limiters:
+            # A quota without a rate limit still needs a (huge) refill rate
+            _limiters[name] = RateLimiter(rate if rate > 0 else 1e6, burst,
+                                          daily_quota, interactive_reserve)
+        return _limiters[name]
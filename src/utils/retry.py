@@ -0,0 +1,73 @@
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar('T')
+
+# Worth retrying: throttling and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# NewsAPI's SDK raises NewsAPIException carrying an error code, not a status
+_NEWSAPI_CODES = {'rateLimited': 429, 'unexpectedError': 500}
+
+class UpstreamError(Exception):
+    """An upstream answered with an HTTP error status."""
+    
+    def __init__(self, status_code: int, message: str = ''):
+        super().__init__(f"HTTP {status_code}: {message}" if message else f"HTTP {status_code}")
+        self.status_code = status_code
+
+def upstream_status(error: Exception) -> Optional[int]:
+    """Best-effort HTTP status behind an SDK exception."""
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status is None and callable(getattr(error, 'get_code', None)):
+        status = _NEWSAPI_CODES.get(error.get_code())
+    return status if isinstance(status, int) else None
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 8.0) -> float:
+    """Exponential backoff with full jitter so retries from many callers spread out."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+def call_upstream(fn: Callable[[], T], limiter=None, attempts: int = 3,
+                  base_delay: float = 0.5) -> T:
+    """Call fn under limiter, retrying 429/5xx failures with jittered backoff.
+    
+    Raises QuotaExceeded (from the limiter) when the budget is spent, and the
+    last error when retries run out.
+    """
+    for attempt in range(attempts):
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            return fn()
+        except Exception as e:
+            if upstream_status(e) not in RETRY_STATUSES or attempt == attempts - 1:
+                raise
+            delay = backoff_delay(attempt, base_delay)
+            print(f"[RETRY] {e}; retrying in {delay:.2f}s")
+            if limiter is not None:
+                # Everyone sharing the limiter backs off, not just this caller
+                limiter.penalize(delay)
+            else:
+                time.sleep(delay)
+
+async def call_upstream_async(fn: Callable[[], Awaitable[T]], limiter=None, attempts: int = 3,
+                              base_delay: float = 0.5) -> T:
+    """Event-loop version of call_upstream."""
+    for attempt in range(attempts):
+        if limiter is not None:
+            await limiter.acquire_async()
+        try:
+            return await fn()
+        except Exception as e:
+            if upstream_status(e) not in RETRY_STATUSES or attempt == attempts - 1:
+                raise
+            delay = backoff_delay(attempt, base_delay)
+            print(f"[RETRY] {e}; retrying in {delay:.2f}s")
+            if limiter is not None:
+                limiter.penalize(delay)
+            else:
+                await asyncio.sleep(delay)
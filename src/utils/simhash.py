@@ -0,0 +1,63 @@
+import hashlib
+import re
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+
+BITS = 64
+# Per-bit counters are packed side by side into one big integer, FIELD bits each
+FIELD = 16
+FIELD_MASK = (1 << FIELD) - 1
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+def _spread_byte(value: int) -> int:
+    return sum(1 << (FIELD * bit) for bit in range(8) if value >> bit & 1)
+
+_SPREAD_BYTE = [_spread_byte(value) for value in range(256)]
+
+@lru_cache(maxsize=65536)
+def _spread_feature(feature: str) -> int:
+    """The feature's 64-bit hash with every bit moved into its own counter field."""
+    digest = hashlib.blake2b(feature.encode('utf-8'), digest_size=BITS // 8).digest()
+    return sum(_SPREAD_BYTE[byte] << (FIELD * 8 * i) for i, byte in enumerate(digest))
+
+def features(text: str) -> List[str]:
+    """Lowercase words and adjacent word pairs, so word order counts a little."""
+    words = TOKEN_PATTERN.findall(text.lower())
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+def simhash(weighted_texts: Iterable[Tuple[str, int]]) -> int:
+    """64-bit SimHash of (text, weight) pairs; similar texts differ in few bits."""
+    counters = 0
+    total = 0
+    for text, weight in weighted_texts:
+        for feature in features(text):
+            # Stop before a counter field could overflow into its neighbour
+            if total + weight >= 1 << FIELD:
+                break
+            counters += weight * _spread_feature(feature)
+            total += weight
+
+    # A bit is set when more than half of the feature weight had it set
+    signature = 0
+    for bit in range(BITS):
+        if 2 * ((counters >> (FIELD * bit)) & FIELD_MASK) > total:
+            signature |= 1 << bit
+    return signature
+
+def hamming_distance(first: int, second: int) -> int:
+    return (first ^ second).bit_count()
+
+def bands(signature: int, count: int) -> List[Tuple[int, int]]:
+    """Split a signature into count disjoint (band, value) pieces.
+
+    Two signatures within count - 1 bits of each other share at least one
+    piece, so an index on pieces finds every near match without a full scan.
+    """
+    width, extra = divmod(BITS, count)
+    pieces, shift = [], 0
+    for band in range(count):
+        size = width + (1 if band < extra else 0)
+        pieces.append((band, (signature >> shift) & ((1 << size) - 1)))
+        shift += size
+    return pieces
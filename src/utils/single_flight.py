@@ -0,0 +1,81 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+class SingleFlight:
+    """Coalesces concurrent identical calls from threads into one upstream call.
+    
+    The first caller for a key runs the function; callers arriving while it is
+    in flight wait for it and receive the same result or exception. Nothing is
+    remembered once the call finishes -- that is the cache's job.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+    
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Tuple[Any, bool]:
+        """Run fn(*args, **kwargs) once per in-flight key; returns (result, shared)."""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.calls += 1
+            else:
+                self.coalesced += 1
+        
+        if not leader:
+            return future.result(), True
+        
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._calls[key]
+    
+    def stats(self) -> Dict:
+        return {'calls': self.calls, 'coalesced': self.coalesced, 'in_flight': len(self._calls)}
+
+class AsyncSingleFlight:
+    """Event-loop counterpart of SingleFlight for coroutine functions."""
+    
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+    
+    async def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Tuple[Any, bool]:
+        """Await fn(*args, **kwargs) once per in-flight key; returns (result, shared)."""
+        task = self._calls.get(key)
+        shared = task is not None
+        if shared:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._calls[key] = task
+            self.calls += 1
+            task.add_done_callback(lambda done: self._forget(key, done))
+        
+        # A cancelled waiter must not cancel the call the others share
+        return await asyncio.shield(task), shared
+    
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Retrieve the exception so an abandoned failed call is not reported as unhandled
+            task.exception()
+    
+    def stats(self) -> Dict:
+        return {'calls': self.calls, 'coalesced': self.coalesced, 'in_flight': len(self._calls)}